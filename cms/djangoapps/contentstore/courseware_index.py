@@ -1,10 +1,12 @@
 """ Code to allow module store to interface with courseware index """
 from __future__ import absolute_import
 from abc import ABCMeta, abstractmethod
+from collections import namedtuple
 from datetime import timedelta
 import logging
 import re
 from six import add_metaclass
+from bson.objectid import ObjectId
 
 from django.conf import settings
 from django.utils.translation import ugettext as _
@@ -12,11 +14,13 @@ from django.core.urlresolvers import resolve
 
 from contentstore.utils import course_image_url
 from contentstore.course_group_config import GroupConfiguration
+from contentstore.models import CoursewareIndexVersion
 from course_modes.models import CourseMode
 from eventtracking import tracker
 from search.search_engine_base import SearchEngine
 from xmodule.annotator_mixin import html_to_text
 from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.split_mongo import BlockKey
 from xmodule.library_tools import normalize_key_for_search
 
 # REINDEX_AGE is the default amount of time that we look back for changes
@@ -26,6 +30,9 @@ from xmodule.library_tools import normalize_key_for_search
 # how far back from the trigger point to look back in order to index
 REINDEX_AGE = timedelta(0, 60)  # 60 seconds
 
+# Maximum number of documents sent to the search engine in a single bulk request
+INDEX_BATCH_SIZE = 500
+
 log = logging.getLogger('edx.modulestore')
 
 
@@ -41,6 +48,91 @@ def strip_html_content_to_text(html_content):
     return text_content
 
 
+def _batches(items, batch_size=INDEX_BATCH_SIZE):
+    """ Splits the given list into consecutive lists of at most batch_size items """
+    for start in xrange(0, len(items), batch_size):
+        yield items[start:start + batch_size]
+
+
+# to_index - block keys whose index documents need to be (re)built
+# to_visit - block keys which must be walked to reach the blocks in to_index (to_index and all their ancestors)
+# removed - block keys present in the previously indexed structure that are no longer published
+# version - the id of the structure the changes lead up to
+StructureChanges = namedtuple('StructureChanges', 'to_index to_visit removed version')
+
+
+def _settings_and_content(block):
+    """ The parts of a split block which affect its own and its descendants' index documents """
+    return (
+        block.definition,
+        block.defaults,
+        {name: value for name, value in block.fields.iteritems() if name != 'children'},
+    )
+
+
+def _parents(blocks):
+    """ Maps the key of each block of a split structure to the key of its parent """
+    parents = {}
+    for block_key, block in blocks.iteritems():
+        for child_key in block.fields.get('children', []):
+            parents[BlockKey(*child_key)] = block_key
+    return parents
+
+
+def diff_structures(old_structure, new_structure):
+    """
+    Compare two split structures of the same course and return the StructureChanges needed to bring an index
+    built from old_structure up to date with new_structure, or None if the whole course needs reindexing.
+
+    Blocks whose content or settings changed are reindexed together with their whole subtree, as descendants
+    inherit start dates, location path names and content groups from them, and so are blocks which were moved
+    to another parent. Blocks for which only the list of children changed are reindexed on their own. A
+    change to the root block's content or settings (e.g. course name or group configurations) affects every
+    document, so requires a full reindex.
+    """
+    old_blocks = old_structure['blocks']
+    new_blocks = new_structure['blocks']
+    root = new_structure['root']
+    if old_structure['root'] != root or root not in old_blocks:
+        return None
+    if _settings_and_content(old_blocks[root]) != _settings_and_content(new_blocks[root]):
+        return None
+
+    old_parents = _parents(old_blocks)
+    parents = _parents(new_blocks)
+
+    changed = set()
+    to_index = set()
+    for block_key, block in new_blocks.iteritems():
+        old_block = old_blocks.get(block_key)
+        if old_block is None or _settings_and_content(old_block) != _settings_and_content(block):
+            changed.add(block_key)
+        elif old_parents.get(block_key) != parents.get(block_key):
+            # moved blocks get new location path names and inherited settings, as do their descendants
+            changed.add(block_key)
+        elif old_block.fields.get('children') != block.fields.get('children'):
+            to_index.add(block_key)
+
+    expanded = set()
+    pending = list(changed)
+    while pending:
+        block_key = pending.pop()
+        if block_key in expanded or block_key not in new_blocks:
+            continue
+        expanded.add(block_key)
+        to_index.add(block_key)
+        pending.extend(new_blocks[block_key].fields.get('children', []))
+
+    to_visit = set()
+    for block_key in to_index:
+        while block_key is not None and block_key not in to_visit:
+            to_visit.add(block_key)
+            block_key = parents.get(block_key)
+
+    removed = set(old_blocks) - set(new_blocks)
+    return StructureChanges(to_index, to_visit, removed, new_structure['_id'])
+
+
 def indexing_is_enabled():
     """
     Checks to see if the indexing feature is enabled
@@ -66,6 +158,8 @@ class SearchIndexerBase(object):
     INDEX_NAME = None
     DOCUMENT_TYPE = None
     ENABLE_INDEXING_KEY = None
+    # whether the structure version last indexed is recorded, allowing incremental index updates
+    TRACK_INDEXED_VERSION = False
 
     INDEX_EVENT = {
         'name': None,
@@ -114,7 +208,7 @@ class SearchIndexerBase(object):
         searcher.remove(cls.DOCUMENT_TYPE, result_ids)
 
     @classmethod
-    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE):
+    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE, structure_changes=None):
         """
         Process course for indexing
 
@@ -130,6 +224,11 @@ class SearchIndexerBase(object):
             which items may need to be removed from the index
             If None, then a full reindex takes place
 
+        structure_changes (StructureChanges) - if provided, only the blocks listed in
+            structure_changes.to_index are (re)indexed, only the blocks needed to reach
+            them are walked, and structure_changes.removed are the only blocks removed
+            from the index
+
         Returns:
         Number of items that have been added to the index
         """
@@ -140,6 +239,11 @@ class SearchIndexerBase(object):
 
         structure_key = cls.normalize_structure_key(structure_key)
         location_info = cls._get_location_info(structure_key)
+        if structure_changes is not None:
+            indexed_version = structure_changes.version
+        else:
+            # read before loading the content, so that a concurrent publish gets picked up by the next update
+            __, indexed_version = cls._get_published_version(modulestore, structure_key)
 
         # Wrap counter in dictionary - otherwise we seem to lose scope inside the embedded function `prepare_item_index`
         indexed_count = {
@@ -163,6 +267,12 @@ class SearchIndexerBase(object):
             """
             return item.location.version_agnostic().replace(branch=None)
 
+        def should_visit(item):
+            """
+            Whether the walk needs to descend into item
+            """
+            return structure_changes is None or BlockKey.from_usage_key(item.location) in structure_changes.to_visit
+
         def prepare_item_index(item, skip_index=False, groups_usage_info=None):
             """
             Add this item to the items_index and indexed_items list
@@ -178,8 +288,14 @@ class SearchIndexerBase(object):
             Returns:
             item_content_groups - content groups assigned to indexed item
             """
+            # blocks which are only walked to reach changed descendants keep their documents, but must not
+            # pass the skip on to their children
+            skip_own_index = skip_index or (
+                structure_changes is not None and
+                BlockKey.from_usage_key(item.location) not in structure_changes.to_index
+            )
             is_indexable = hasattr(item, "index_dictionary")
-            item_index_dictionary = item.index_dictionary() if is_indexable else None
+            item_index_dictionary = item.index_dictionary() if is_indexable and not skip_own_index else None
             # if it's not indexable and it does not have children, then ignore
             if not item_index_dictionary and not item.has_children:
                 return
@@ -214,6 +330,8 @@ class SearchIndexerBase(object):
                     (triggered_at is not None and (triggered_at - item.subtree_edited_on) > reindex_age)
                 children_groups_usage = []
                 for child_item in item.get_children():
+                    if not should_visit(child_item):
+                        continue
                     if modulestore.has_published_version(child_item):
                         children_groups_usage.append(
                             prepare_item_index(
@@ -225,7 +343,7 @@ class SearchIndexerBase(object):
                 if None in children_groups_usage:
                     item_content_groups = None
 
-            if skip_index or not item_index_dictionary:
+            if skip_own_index or not item_index_dictionary:
                 return
 
             item_index = {}
@@ -255,10 +373,26 @@ class SearchIndexerBase(object):
                 cls.supplemental_index_information(modulestore, structure)
 
                 # Now index the content
-                for item in structure.get_children():
-                    prepare_item_index(item, groups_usage_info=groups_usage_info)
-                searcher.index(cls.DOCUMENT_TYPE, items_index)
-                cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                top_level_items = structure.get_children()
+                for item in top_level_items:
+                    if should_visit(item):
+                        prepare_item_index(item, groups_usage_info=groups_usage_info)
+                for items_batch in _batches(items_index):
+                    searcher.index(cls.DOCUMENT_TYPE, items_batch)
+                if structure_changes is None:
+                    cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                elif structure_changes.removed:
+                    # build the ids the same way as for the indexed items
+                    if top_level_items:
+                        id_course_key = top_level_items[0].scope_ids.usage_id.course_key
+                    else:
+                        id_course_key = structure_key
+                    removed_ids = [
+                        unicode(cls._id_modifier(id_course_key.make_usage_key(block_key.type, block_key.id)))
+                        for block_key in structure_changes.removed
+                    ]
+                    for ids_batch in _batches(removed_ids):
+                        searcher.remove(cls.DOCUMENT_TYPE, ids_batch)
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
             log.exception(
@@ -271,8 +405,80 @@ class SearchIndexerBase(object):
         if error_list:
             raise SearchIndexingError('Error(s) present during indexing', error_list)
 
+        if indexed_version is not None:
+            cls._set_indexed_version(structure_key, indexed_version)
+
         return indexed_count["count"]
 
+    @classmethod
+    def index_changes(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE):
+        """
+        Update the index following a publish
+
+        If the structure is stored in split and the structure version it was last indexed at is
+        known, the published structure is diffed against that version and only the added and
+        changed blocks are reindexed, and the removed ones dropped. Otherwise this falls back to
+        `index` with the given triggered_at and reindex_age.
+
+        Returns:
+        Number of items that have been added to the index
+        """
+        structure_key = cls.normalize_structure_key(structure_key)
+        structure_changes = None
+        indexed_version = cls._get_indexed_version(structure_key)
+        if indexed_version is not None:
+            split_store, published_version = cls._get_published_version(modulestore, structure_key)
+            if published_version is not None:
+                if unicode(published_version) == indexed_version:
+                    return 0
+                try:
+                    structure_changes = diff_structures(
+                        split_store.get_structure(structure_key, ObjectId(indexed_version)),
+                        split_store.get_structure(structure_key, published_version),
+                    )
+                except Exception:  # pylint: disable=broad-except
+                    # e.g. the old structure has been pruned; fall back to a regular index
+                    log.warning(
+                        "Could not compare structure versions %s and %s of %s",
+                        indexed_version, published_version, structure_key, exc_info=True
+                    )
+
+        if structure_changes is None:
+            return cls.index(modulestore, structure_key, triggered_at=triggered_at, reindex_age=reindex_age)
+        return cls.index(modulestore, structure_key, structure_changes=structure_changes)
+
+    @classmethod
+    def _get_published_version(cls, modulestore, structure_key):
+        """
+        Returns the split modulestore holding structure_key and the id of its published structure,
+        or (None, None) if the structure is not stored in split or versions are not tracked for this index
+        """
+        if not cls.TRACK_INDEXED_VERSION:
+            return None, None
+        if modulestore.get_modulestore_type(structure_key) != ModuleStoreEnum.Type.split:
+            return None, None
+        if hasattr(modulestore, '_get_modulestore_for_courselike'):
+            modulestore = modulestore._get_modulestore_for_courselike(structure_key)  # pylint: disable=protected-access
+        course_index = modulestore.get_course_index(structure_key)
+        if course_index is None:
+            return None, None
+        return modulestore, course_index['versions'].get(ModuleStoreEnum.BranchName.published)
+
+    @classmethod
+    def _get_indexed_version(cls, structure_key):  # pylint: disable=unused-argument
+        """
+        Returns the structure version last indexed for structure_key, or None if unknown.
+        Base implementation does not track versions.
+        """
+        return None
+
+    @classmethod
+    def _set_indexed_version(cls, structure_key, version):  # pylint: disable=unused-argument
+        """
+        Records the structure version last indexed for structure_key. Base implementation does not track versions.
+        """
+        pass
+
     @classmethod
     def _do_reindex(cls, modulestore, structure_key):
         """
@@ -344,6 +550,7 @@ class CoursewareSearchIndexer(SearchIndexerBase):
     INDEX_NAME = "courseware_index"
     DOCUMENT_TYPE = "courseware_content"
     ENABLE_INDEXING_KEY = 'ENABLE_COURSEWARE_INDEX'
+    TRACK_INDEXED_VERSION = True
 
     INDEX_EVENT = {
         'name': 'edx.course.index.reindexed',
@@ -374,6 +581,16 @@ class CoursewareSearchIndexer(SearchIndexerBase):
         """
         return cls._do_reindex(modulestore, course_key)
 
+    @classmethod
+    def _get_indexed_version(cls, structure_key):
+        """ Returns the structure version last indexed for the course """
+        return CoursewareIndexVersion.get_version(structure_key)
+
+    @classmethod
+    def _set_indexed_version(cls, structure_key, version):
+        """ Records the structure version last indexed for the course """
+        CoursewareIndexVersion.set_version(structure_key, unicode(version))
+
     @classmethod
     def fetch_group_usage(cls, modulestore, structure):
         groups_usage_dict = {}
@@ -3,9 +3,11 @@ Models for contentstore
 """
 # pylint: disable=no-member
 
+from django.db import models
 from django.db.models.fields import TextField
 
 from config_models.models import ConfigurationModel
+from xmodule_django.models import CourseKeyField
 
 
 class VideoUploadConfig(ConfigurationModel):
@@ -23,3 +25,31 @@ class VideoUploadConfig(ConfigurationModel):
 
 class PushNotificationConfig(ConfigurationModel):
     """Configuration for mobile push notifications."""
+
+
+class CoursewareIndexVersion(models.Model):
+    """
+    The published structure version of a course that was last written to the courseware search index.
+    Lets publishes reindex only the blocks that changed since then.
+    """
+    course_id = CourseKeyField(max_length=255, unique=True)
+    structure_version = models.CharField(max_length=255)
+    indexed_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def get_version(cls, course_key):
+        """ Returns the structure version last indexed for course_key, or None """
+        try:
+            return cls.objects.get(course_id=course_key).structure_version
+        except cls.DoesNotExist:
+            return None
+
+    @classmethod
+    def set_version(cls, course_key, structure_version):
+        """ Records structure_version as the version last indexed for course_key """
+        index_version, __ = cls.objects.get_or_create(
+            course_id=course_key, defaults={'structure_version': structure_version}
+        )
+        if index_version.structure_version != structure_version:
+            index_version.structure_version = structure_version
+            index_version.save()
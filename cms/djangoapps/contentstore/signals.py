@@ -1,10 +1,12 @@
-""" receivers of course_published and library_updated events in order to trigger indexing task """
+""" receivers of course_published and library_updated events in order to trigger indexing task
+and invalidate the cached fragments of the course """
 from datetime import datetime
 from pytz import UTC
 
 from django.dispatch import receiver
 
 from xmodule.modulestore.django import SignalHandler
+from xblock_django.fragment_cache import invalidate_course_fragments
 from contentstore.courseware_index import CoursewareSearchIndexer, LibrarySearchIndexer
 
 
@@ -19,6 +21,14 @@ def listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=
         update_search_index.delay(unicode(course_key), datetime.now(UTC).isoformat())
 
 
+@receiver(SignalHandler.course_published)
+def listen_for_course_publish_fragments(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Receives signal and invalidates the fragments of the course that the LMS cached
+    """
+    invalidate_course_fragments(course_key)
+
+
 @receiver(SignalHandler.library_updated)
 def listen_for_library_update(sender, library_key, **kwargs):  # pylint: disable=unused-argument
     """
@@ -10,7 +10,10 @@ import ddt
 
 from django.test import RequestFactory
 
-from contentstore.views.course import _accessible_courses_list, _accessible_courses_list_from_groups, AccessListFallback
+from contentstore.views.course import (
+    _accessible_courses_list, _accessible_courses_list_from_groups, _accessible_courses_summary_list,
+    AccessListFallback, get_courses_accessible_to_user,
+)
 from contentstore.utils import delete_course_and_groups
 from contentstore.tests.utils import AjaxEnabledTestClient
 from student.tests.factories import UserFactory
@@ -21,6 +24,7 @@ from xmodule.modulestore import ModuleStoreEnum
 from opaque_keys.edx.locations import CourseLocator
 from xmodule.modulestore.django import modulestore
 from xmodule.error_module import ErrorDescriptor
+from xmodule.course_module import CourseSummary
 from course_action_state.models import CourseRerunState
 
 TOTAL_COURSES_COUNT = 500
@@ -256,6 +260,36 @@ class TestCourseListing(ModuleStoreTestCase):
         courses_list, __ = _accessible_courses_list(self.request)
         self.assertEqual(len(courses_list), 2)
 
+        # org-level roles are served from course summaries limited to the role's org
+        CourseFactory.create(org='OtherOrg', number='Course3', run='Run')
+        courses_summary_list, __ = get_courses_accessible_to_user(self.request)
+        self.assertEqual(
+            set(summary.id for summary in courses_summary_list),
+            set([org_course_one, org_course_two])
+        )
+        self.assertTrue(all(isinstance(summary, CourseSummary) for summary in courses_summary_list))
+
+    def test_get_course_summary_list_global_staff(self):
+        """
+        Test that global staff get the course list from course summaries, matching the full course list
+        """
+        GlobalStaff().add_users(self.user)
+        course_location = self.store.make_course_key('Org1', 'Course1', 'Run1')
+        course = self._create_course_with_access_groups(course_location)
+
+        courses_summary_list, __ = _accessible_courses_summary_list(self.request)
+        courses_list, __ = _accessible_courses_list(self.request)
+        self.assertEqual(len(courses_summary_list), 1)
+        self.assertEqual(
+            [summary.id for summary in courses_summary_list],
+            [course.id for course in courses_list]
+        )
+        summary = courses_summary_list[0]
+        self.assertEqual(summary.display_name, course.display_name)
+        self.assertEqual(summary.display_org_with_default, course.display_org_with_default)
+        self.assertEqual(summary.display_number_with_default, course.display_number_with_default)
+        self.assertEqual(summary.location, course.location)
+
     def test_course_listing_with_actions_in_progress(self):
         sourse_course_key = CourseLocator('source-Org', 'source-Course', 'source-Run')
 
@@ -10,13 +10,14 @@ from dateutil.tz import tzutc
 from mock import patch, call
 from pytz import UTC
 from uuid import uuid4
-from unittest import skip
+from unittest import skip, TestCase
 
 from django.conf import settings
 
 from course_modes.models import CourseMode
 from xmodule.library_tools import normalize_key_for_search
-from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore import ModuleStoreEnum, BlockData
+from xmodule.modulestore.split_mongo import BlockKey
 from xmodule.modulestore.django import SignalHandler
 from xmodule.modulestore.edit_info import EditInfoMixin
 from xmodule.modulestore.exceptions import ItemNotFoundError
@@ -42,6 +43,7 @@ from contentstore.courseware_index import (
     LibrarySearchIndexer,
     SearchIndexingError,
     CourseAboutSearchIndexer,
+    diff_structures,
 )
 from contentstore.signals import listen_for_course_publish, listen_for_library_update
 from contentstore.utils import reverse_course_url, reverse_usage_url
@@ -450,6 +452,38 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         indexed_count = self.reindex_course(store)
         self.assertEqual(indexed_count, 7)
 
+    def _test_incremental_index(self, store):
+        """ Make sure that index_changes only reindexes what was published since the last index """
+        self.publish_item(store, self.vertical.location)
+        indexed_count = self.reindex_course(store)
+        self.assertEqual(indexed_count, 4)
+
+        # nothing published since the last index
+        self.assertEqual(CoursewareSearchIndexer.index_changes(store, self.course.id), 0)
+
+        # only the changed html unit gets reindexed
+        with store.branch_setting(ModuleStoreEnum.Branch.draft_preferred):
+            html_unit = store.get_item(self.html_unit.location)
+        html_unit.display_name = "Updated Html Content"
+        self.update_item(store, html_unit)
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(CoursewareSearchIndexer.index_changes(store, self.course.id), 1)
+        response = self.search()
+        self.assertEqual(response["total"], 4)
+        html_results = [
+            result["data"] for result in response["results"]
+            if result["data"]["id"] == unicode(self.html_unit.location)
+        ]
+        self.assertEqual(len(html_results), 1)
+        self.assertEqual(html_results[0]["content"]["display_name"], "Updated Html Content")
+
+        # deleting the html unit reindexes its parent and removes it from the index
+        self.delete_item(store, self.html_unit.location)
+        self.publish_item(store, self.vertical.location)
+        self.assertEqual(CoursewareSearchIndexer.index_changes(store, self.course.id), 1)
+        response = self.search()
+        self.assertEqual(response["total"], 3)
+
     def _test_course_about_property_index(self, store):
         """ Test that informational properties in the course object end up in the course_info index """
         display_name = "Help, I need somebody!"
@@ -582,6 +616,9 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
     def test_exception(self, store_type):
         self._perform_test_using_store(store_type, self._test_exception)
 
+    def test_incremental_index(self):
+        self._perform_test_using_store(ModuleStoreEnum.Type.split, self._test_incremental_index)
+
     @ddt.data(*WORKS_WITH_STORES)
     def test_course_about_property_index(self, store_type):
         self._perform_test_using_store(store_type, self._test_course_about_property_index)
@@ -683,6 +720,91 @@ class TestLargeCourseDeletions(MixedWithOptionsTestCase):
         self._perform_test_using_store(store_type, self._test_large_course_deletion)
 
 
+class TestDiffStructures(TestCase):
+    """ Tests the structure comparison used for incremental indexing """
+
+    def _structure(self, version, blocks):
+        """ Builds a minimal split structure from a dict of block_id -> (children ids, fields) """
+        return {
+            '_id': version,
+            'root': BlockKey('course', 'course'),
+            'blocks': {
+                BlockKey(block_type, block_id): BlockData(
+                    block_type=block_type,
+                    definition=fields.pop('definition', None),
+                    fields=dict(fields, children=[BlockKey(*child) for child in children]),
+                )
+                for (block_type, block_id), (children, fields) in blocks.iteritems()
+            },
+        }
+
+    def _course(self, version, html_name="html", extra_html=False, chapter_name="Week 1"):
+        """ Builds a course structure: course > chapter > sequential > html(s) """
+        html_children = [('html', 'html1')] + ([('html', 'html2')] if extra_html else [])
+        blocks = {
+            ('course', 'course'): ([('chapter', 'chapter1')], {'display_name': 'Course'}),
+            ('chapter', 'chapter1'): ([('sequential', 'seq1')], {'display_name': chapter_name}),
+            ('sequential', 'seq1'): (html_children, {'display_name': 'Lesson'}),
+            ('html', 'html1'): ([], {'display_name': html_name, 'definition': 'def1'}),
+        }
+        if extra_html:
+            blocks[('html', 'html2')] = ([], {'display_name': 'other', 'definition': 'def2'})
+        return self._structure(version, blocks)
+
+    def test_changed_leaf(self):
+        changes = diff_structures(self._course('v1'), self._course('v2', html_name='changed'))
+        self.assertEqual(changes.to_index, set([BlockKey('html', 'html1')]))
+        self.assertEqual(
+            changes.to_visit,
+            set([BlockKey('course', 'course'), BlockKey('chapter', 'chapter1'),
+                 BlockKey('sequential', 'seq1'), BlockKey('html', 'html1')])
+        )
+        self.assertEqual(changes.removed, set())
+        self.assertEqual(changes.version, 'v2')
+
+    def test_changed_container_reindexes_subtree(self):
+        changes = diff_structures(self._course('v1'), self._course('v2', chapter_name='Week One'))
+        self.assertEqual(
+            changes.to_index,
+            set([BlockKey('chapter', 'chapter1'), BlockKey('sequential', 'seq1'), BlockKey('html', 'html1')])
+        )
+
+    def test_added_and_removed_children(self):
+        changes = diff_structures(self._course('v1'), self._course('v2', extra_html=True))
+        self.assertEqual(changes.to_index, set([BlockKey('sequential', 'seq1'), BlockKey('html', 'html2')]))
+        self.assertEqual(changes.removed, set())
+
+        changes = diff_structures(self._course('v2', extra_html=True), self._course('v3'))
+        self.assertEqual(changes.to_index, set([BlockKey('sequential', 'seq1')]))
+        self.assertEqual(changes.removed, set([BlockKey('html', 'html2')]))
+
+    def test_moved_block_reindexes_subtree(self):
+        blocks = {
+            ('course', 'course'): ([('chapter', 'chapter1')], {'display_name': 'Course'}),
+            ('chapter', 'chapter1'): ([('sequential', 'seq1'), ('sequential', 'seq2')], {'display_name': 'Week 1'}),
+            ('sequential', 'seq1'): ([('vertical', 'vertical1')], {'display_name': 'Lesson 1'}),
+            ('sequential', 'seq2'): ([], {'display_name': 'Lesson 2'}),
+            ('vertical', 'vertical1'): ([('html', 'html1')], {'display_name': 'Unit'}),
+            ('html', 'html1'): ([], {'display_name': 'html'}),
+        }
+        old_structure = self._structure('v1', dict(blocks))
+        blocks[('sequential', 'seq1')] = ([], {'display_name': 'Lesson 1'})
+        blocks[('sequential', 'seq2')] = ([('vertical', 'vertical1')], {'display_name': 'Lesson 2'})
+        changes = diff_structures(old_structure, self._structure('v2', blocks))
+        self.assertEqual(
+            changes.to_index,
+            set([BlockKey('sequential', 'seq1'), BlockKey('sequential', 'seq2'),
+                 BlockKey('vertical', 'vertical1'), BlockKey('html', 'html1')])
+        )
+        self.assertIn(BlockKey('chapter', 'chapter1'), changes.to_visit)
+
+    def test_changed_root_needs_full_reindex(self):
+        old_structure = self._course('v1')
+        new_structure = self._course('v2')
+        new_structure['blocks'][BlockKey('course', 'course')].fields['display_name'] = 'Renamed'
+        self.assertIsNone(diff_structures(old_structure, new_structure))
+
+
 class TestTaskExecution(ModuleStoreTestCase):
     """
     Set of tests to ensure that the task code will do the right thing when
@@ -364,6 +364,46 @@ def _accessible_courses_list(request):
     return courses, in_process_course_actions
 
 
+def _accessible_courses_summary_list(request):
+    """
+    List all courses available to the logged in user by reading course summaries rather than
+    course descriptors. Global staff get the summaries of every course; other users only get the
+    summaries of the orgs in which they hold a (course or org-level) role.
+    """
+    user = request.user
+
+    def course_filter(course_summary):
+        """
+        Filter out unusable and inaccessible courses
+        """
+        # pylint: disable=fixme
+        # TODO remove this condition when templates purged from db
+        if course_summary.location.course == 'templates':
+            return False
+
+        return has_studio_read_access(user, course_summary.id)
+
+    if GlobalStaff().has_user(user):
+        courses_summary = modulestore().get_course_summaries()
+    else:
+        instructor_courses = UserBasedRole(user, CourseInstructorRole.ROLE).courses_with_role()
+        staff_courses = UserBasedRole(user, CourseStaffRole.ROLE).courses_with_role()
+        orgs = set(course_access.org for course_access in instructor_courses | staff_courses if course_access.org)
+        courses_summary = []
+        for org in orgs:
+            courses_summary.extend(modulestore().get_course_summaries(org=org))
+
+    courses_summary = filter(course_filter, courses_summary)
+    in_process_course_actions = [
+        course for course in
+        CourseRerunState.objects.find_all(
+            exclude_args={'state': CourseRerunUIStateManager.State.SUCCEEDED}, should_display=True
+        )
+        if has_studio_read_access(user, course.course_key)
+    ]
+    return courses_summary, in_process_course_actions
+
+
 def _accessible_courses_list_from_groups(request):
     """
     List all courses available to the logged in user by reversing access group names
@@ -569,19 +609,19 @@ def course_index(request, course_key):
 
 def get_courses_accessible_to_user(request):
     """
-    Try to get all courses by first reversing django groups and fallback to old method if it fails
-    Note: overhead of pymongo reads will increase if getting courses from django groups fails
+    Try to get all courses by first reversing django groups and fallback to listing course summaries if it fails.
+    The returned courses may be course descriptors or lightweight course summaries.
     """
     if GlobalStaff().has_user(request.user):
         # user has global access so no need to get courses from django groups
-        courses, in_process_course_actions = _accessible_courses_list(request)
+        courses, in_process_course_actions = _accessible_courses_summary_list(request)
     else:
         try:
             courses, in_process_course_actions = _accessible_courses_list_from_groups(request)
         except AccessListFallback:
-            # user have some old groups or there was some error getting courses from django groups
-            # so fallback to iterating through all courses
-            courses, in_process_course_actions = _accessible_courses_list(request)
+            # user has some org-based roles, so fall back to listing the summaries of the courses in
+            # those orgs
+            courses, in_process_course_actions = _accessible_courses_summary_list(request)
     return courses, in_process_course_actions
 
 
@@ -756,7 +756,7 @@ def _get_module_info(xblock, rewrite_static_links=True, include_ancestor_info=Fa
 
 def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=False, include_child_info=False,
                        course_outline=False, include_children_predicate=NEVER, parent_xblock=None, graders=None,
-                       user=None):
+                       user=None, subtree_changes=None):
     """
     Creates the information needed for client-side XBlockInfo.
 
@@ -771,13 +771,20 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
 
     In addition, an optional include_children_predicate argument can be provided to define whether or
     not a particular xblock should have its children included.
+
+    subtree_changes is the result of the modulestore's get_subtree_changes for an ancestor of the xblock,
+    which is passed down while rendering the children of the course outline.
     """
     is_library_block = isinstance(xblock.location, LibraryUsageLocator)
     is_xblock_unit = is_unit(xblock, parent_xblock)
+    should_visit_children = include_child_info and (course_outline and not is_xblock_unit or not course_outline)
     # this should not be calculated for Sections and Subsections on Unit page or for library blocks
     has_changes = None
     if (is_xblock_unit or course_outline) and not is_library_block:
-        has_changes = modulestore().has_changes(xblock)
+        if subtree_changes is None and course_outline and should_visit_children and xblock.has_children:
+            # Check the changes of the whole outline in one pass, rather than the subtree of each of its blocks
+            subtree_changes = modulestore().get_subtree_changes(xblock)
+        has_changes = _get_has_changes(xblock, subtree_changes)
 
     if graders is None:
         if not is_library_block:
@@ -789,14 +796,14 @@ def create_xblock_info(xblock, data=None, metadata=None, include_ancestor_info=F
     graders = _filter_entrance_exam_grader(graders)
 
     # Compute the child info first so it can be included in aggregate information for the parent
-    should_visit_children = include_child_info and (course_outline and not is_xblock_unit or not course_outline)
     if should_visit_children and xblock.has_children:
         child_info = _create_xblock_child_info(
             xblock,
             course_outline,
             graders,
             include_children_predicate=include_children_predicate,
-            user=user
+            user=user,
+            subtree_changes=subtree_changes
         )
     else:
         child_info = None
@@ -1006,7 +1013,19 @@ def _create_xblock_ancestor_info(xblock, course_outline):
     }
 
 
-def _create_xblock_child_info(xblock, course_outline, graders, include_children_predicate=NEVER, user=None):
+def _get_has_changes(xblock, subtree_changes=None):
+    """
+    Returns whether the xblock has unpublished changes, from subtree_changes if it includes the xblock.
+    """
+    if subtree_changes is not None:
+        has_changes = subtree_changes.get((xblock.location.block_type, xblock.location.block_id))
+        if has_changes is not None:
+            return has_changes
+    return modulestore().has_changes(xblock)
+
+
+def _create_xblock_child_info(xblock, course_outline, graders, include_children_predicate=NEVER, user=None,
+                              subtree_changes=None):
     """
     Returns information about the children of an xblock, as well as about the primary category
     of xblock expected as children.
@@ -1025,7 +1044,8 @@ def _create_xblock_child_info(xblock, course_outline, graders, include_children_
                 include_children_predicate=include_children_predicate,
                 parent_xblock=xblock,
                 graders=graders,
-                user=user
+                user=user,
+                subtree_changes=subtree_changes
             ) for child in xblock.get_children()
         ]
     return child_info
@@ -2071,3 +2071,22 @@ class TestXBlockPublishingInfo(ItemTest):
         self._verify_has_staff_only_message(xblock_info, True)
         self._verify_has_staff_only_message(xblock_info, True, path=self.FIRST_SUBSECTION_PATH)
         self._verify_has_staff_only_message(xblock_info, True, path=self.FIRST_UNIT_PATH)
+
+    def test_outline_has_changes_single_pass(self):
+        """
+        Tests that the course outline checks the changes of all of its blocks at once.
+        """
+        chapter = self._create_child(self.course, 'chapter', "Test Chapter")
+        sequential = self._create_child(chapter, 'sequential', "Test Sequential")
+        unit = self._create_child(sequential, 'vertical', "Published Unit", publish_item=True)
+        self._create_child(sequential, 'vertical', "Draft Unit")
+        self._set_display_name(unit.location, 'Updated Unit')
+        self._create_child(chapter, 'sequential', "Empty Sequential", publish_item=True)
+        with patch.object(modulestore(), 'has_changes', side_effect=AssertionError) as mock_has_changes:
+            xblock_info = self._get_xblock_outline_info(chapter.location)
+        self.assertFalse(mock_has_changes.called)
+        self._verify_xblock_info_state(xblock_info, 'has_changes', True)
+        self._verify_xblock_info_state(xblock_info, 'has_changes', True, path=self.FIRST_SUBSECTION_PATH)
+        self._verify_xblock_info_state(xblock_info, 'has_changes', True, path=self.FIRST_UNIT_PATH)
+        self._verify_xblock_info_state(xblock_info, 'has_changes', True, path=self.SECOND_UNIT_PATH)
+        self._verify_xblock_info_state(xblock_info, 'has_changes', False, path=[1])
@@ -289,6 +289,11 @@ BROKER_URL = "{0}://{1}:{2}@{3}/{4}".format(CELERY_BROKER_TRANSPORT,
                                             CELERY_BROKER_HOSTNAME,
                                             CELERY_BROKER_VHOST)
 
+REQUEST_PROFILE_SAMPLE_RATE = ENV_TOKENS.get('REQUEST_PROFILE_SAMPLE_RATE', REQUEST_PROFILE_SAMPLE_RATE)
+CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT', CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT
+)
+
 # Event tracking
 TRACKING_BACKENDS.update(AUTH_TOKENS.get("TRACKING_BACKENDS", {}))
 EVENT_TRACKING_BACKENDS['tracking_logs']['OPTIONS']['backends'].update(AUTH_TOKENS.get("EVENT_TRACKING_BACKENDS", {}))
@@ -287,6 +287,7 @@ TEMPLATE_LOADERS = (
 
 MIDDLEWARE_CLASSES = (
     'request_cache.middleware.RequestCache',
+    'performance.middleware.RequestProfileMiddleware',
     'django.middleware.cache.UpdateCacheMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -716,6 +717,7 @@ INSTALLED_APPS = (
 
     # Monitoring
     'datadog',
+    'performance',
 
     # For asset pipelining
     'edxmako',
@@ -777,6 +779,17 @@ MKTG_URL_LINK_MAP = {
 
 COURSES_WITH_UNSAFE_CODE = []
 
+############################## REQUEST PROFILING ##############################
+
+# Fraction of the requests whose performance profile is collected and emitted
+# (see performance.middleware.RequestProfileMiddleware).
+REQUEST_PROFILE_SAMPLE_RATE = 0.0
+
+# Number of seconds a process uses its snapshot of a configuration model
+# without checking in the cache that the configuration hasn't changed
+# (see config_models.models.ConfigurationModel.current).
+CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT = 5
+
 ############################## EVENT TRACKING #################################
 
 TRACK_MAX_EVENT = 50000
@@ -174,6 +174,10 @@ CACHES = {
     },
 }
 
+# Check every configuration snapshot against the cache, so that clearing the
+# cache between tests resets the configuration models.
+CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT = 0
+
 # Add external_auth to Installed apps for testing
 INSTALLED_APPS += ('external_auth', )
 
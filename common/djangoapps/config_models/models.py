@@ -1,6 +1,12 @@
 """
 Django Model baseclass for database-backed configuration.
 """
+from collections import namedtuple
+from copy import copy
+import time
+import uuid
+
+from django.conf import settings
 from django.db import connection, models
 from django.contrib.auth.models import User
 from django.core.cache import get_cache, InvalidCacheBackendError
@@ -11,6 +17,24 @@ try:
 except InvalidCacheBackendError:
     from django.core.cache import cache
 
+# Snapshots of configuration values taken by this process, by model name and
+# then by cache key. A snapshot is used without any cache access until it
+# expires, after which it is used again as long as the version of its model in
+# the cache hasn't changed. The version is changed whenever the model is saved,
+# but before the change is committed, so a snapshot may be taken of the
+# previous value under the new version: snapshots are reloaded after the
+# `cache_timeout` of their model in any case.
+ConfigurationSnapshot = namedtuple('ConfigurationSnapshot', 'value version expires reload_at')
+_SNAPSHOTS = {}
+
+
+def _process_cache_timeout():
+    """
+    The number of seconds a process uses a configuration snapshot without
+    checking that it is still current.
+    """
+    return getattr(settings, 'CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT', 5)
+
 
 class ConfigurationModelManager(models.Manager):
     """
@@ -97,6 +121,45 @@ class ConfigurationModel(models.Model):
         cache.delete(self.cache_key_name(*[getattr(self, key) for key in self.KEY_FIELDS]))
         if self.KEY_FIELDS:
             cache.delete(self.key_values_cache_key_name())
+        # Make every process re-read the configuration
+        _SNAPSHOTS.pop(type(self).__name__, None)
+        cache.set(self.version_cache_key_name(), uuid.uuid4().hex)
+
+    @classmethod
+    def version_cache_key_name(cls):
+        """Return the name of the key to use to cache the version of the configuration"""
+        return 'configuration/{}/version'.format(cls.__name__)
+
+    @classmethod
+    def _snapshot(cls, cache_key, load):
+        """
+        Return a copy of the value cached under `cache_key` from this
+        process' snapshot if it is still current, or else the value from
+        `load()`, which is then snapshotted.
+        """
+        snapshots = _SNAPSHOTS.setdefault(cls.__name__, {})
+        snapshot = snapshots.get(cache_key)
+        now = time.time()
+        if snapshot is not None and snapshot.expires > now:
+            return copy(snapshot.value)
+
+        # The version is read before the value, so that a value loaded while the
+        # configuration is being changed is never recorded with the new version.
+        version_key = cls.version_cache_key_name()
+        version = cache.get(version_key)
+        if version is None:
+            cache.add(version_key, uuid.uuid4().hex)
+            version = cache.get(version_key)
+        elif snapshot is not None and snapshot.version == version and snapshot.reload_at > now:
+            snapshots[cache_key] = snapshot._replace(expires=now + _process_cache_timeout())
+            return copy(snapshot.value)
+
+        value = load()
+        if version is not None:
+            snapshots[cache_key] = ConfigurationSnapshot(
+                copy(value), version, now + _process_cache_timeout(), now + cls.cache_timeout
+            )
+        return value
 
     @classmethod
     def cache_key_name(cls, *args):
@@ -116,6 +179,17 @@ class ConfigurationModel(models.Model):
         Return the active configuration entry, either from cache,
         from the database, or by creating a new empty entry (which is not
         persisted).
+
+        The entry is also kept in a snapshot local to the process, so that
+        configuration checks usually don't even access the cache.
+        """
+        return cls._snapshot(cls.cache_key_name(*args), lambda: cls._current_from_cache(*args))
+
+    @classmethod
+    def _current_from_cache(cls, *args):
+        """
+        Return the active configuration entry, either from cache, from the
+        database, or by creating a new empty entry.
         """
         cached = cache.get(cls.cache_key_name(*args))
         if cached is not None:
@@ -168,9 +242,13 @@ class ConfigurationModel(models.Model):
         assert not kwargs, "'flat' is the only kwarg accepted"
         key_fields = key_fields or cls.KEY_FIELDS
         cache_key = cls.key_values_cache_key_name(*key_fields)
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
-        values = list(cls.objects.values_list(*key_fields, flat=flat).order_by().distinct())
-        cache.set(cache_key, values, cls.cache_timeout)
-        return values
+
+        def load():
+            """ Load the key values from the cache or the database. """
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+            values = list(cls.objects.values_list(*key_fields, flat=flat).order_by().distinct())
+            cache.set(cache_key, values, cls.cache_timeout)
+            return values
+        return cls._snapshot(cache_key, load)
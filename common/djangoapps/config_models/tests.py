@@ -7,10 +7,11 @@ import ddt
 from django.contrib.auth.models import User
 from django.db import models
 from django.test import TestCase
+from django.test.utils import override_settings
 from freezegun import freeze_time
 
 from mock import patch
-from config_models.models import ConfigurationModel
+from config_models.models import ConfigurationModel, cache
 
 
 class ExampleConfig(ConfigurationModel):
@@ -282,3 +283,64 @@ class KeyedConfigurationModelTests(TestCase):
         fake_result = [('a', 'b'), ('c', 'd')]
         mock_cache.get.return_value = fake_result
         self.assertEquals(ExampleKeyedConfig.key_values(), fake_result)
+
+
+@override_settings(CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT=60)
+class ConfigurationSnapshotTests(TestCase):
+    """
+    Tests of the process-local snapshots of ``ConfigurationModels``.
+    """
+    def setUp(self):
+        super(ConfigurationSnapshotTests, self).setUp()
+        cache.clear()
+        self.user = User()
+        self.user.save()
+        ExampleConfig(changed_by=self.user, string_field='first').save()
+
+    def test_snapshot_used(self):
+        self.assertEquals(ExampleConfig.current().string_field, 'first')
+        with patch('config_models.models.cache') as mock_cache:
+            with self.assertNumQueries(0):
+                self.assertEquals(ExampleConfig.current().string_field, 'first')
+        self.assertFalse(mock_cache.get.called)
+
+    def test_save_invalidates_snapshot(self):
+        self.assertEquals(ExampleConfig.current().string_field, 'first')
+        ExampleConfig(changed_by=self.user, string_field='second').save()
+        self.assertEquals(ExampleConfig.current().string_field, 'second')
+
+    def test_expired_snapshot(self):
+        with freeze_time('2015-01-01 00:00:00'):
+            self.assertEquals(ExampleConfig.current().string_field, 'first')
+
+        # An expired snapshot is used again if the version hasn't changed
+        with freeze_time('2015-01-01 00:02:00'):
+            with self.assertNumQueries(0):
+                self.assertEquals(ExampleConfig.current().string_field, 'first')
+
+        # Simulate a change of the configuration made by another process
+        ExampleConfig.objects.create(changed_by=self.user, string_field='second')
+        cache.delete(ExampleConfig.cache_key_name())
+        cache.set(ExampleConfig.version_cache_key_name(), 'new version')
+        with freeze_time('2015-01-01 00:02:30'):
+            self.assertEquals(ExampleConfig.current().string_field, 'first')
+        with freeze_time('2015-01-01 00:04:00'):
+            self.assertEquals(ExampleConfig.current().string_field, 'second')
+
+    def test_snapshot_reloaded_after_cache_timeout(self):
+        with freeze_time('2015-01-01 00:00:00'):
+            self.assertEquals(ExampleConfig.current().string_field, 'first')
+
+        # Simulate a snapshot taken of the previous value under the version of a change
+        ExampleConfig.objects.create(changed_by=self.user, string_field='second')
+        cache.delete(ExampleConfig.cache_key_name())
+        with freeze_time('2015-01-01 00:02:00'):
+            self.assertEquals(ExampleConfig.current().string_field, 'first')
+        with freeze_time('2015-01-01 00:06:00'):
+            self.assertEquals(ExampleConfig.current().string_field, 'second')
+
+    def test_snapshot_values_are_copies(self):
+        current = ExampleConfig.current()
+        current.string_field = 'changed'
+        self.assertEquals(ExampleConfig.current().string_field, 'first')
+        self.assertIsNot(ExampleConfig.current(), ExampleConfig.current())
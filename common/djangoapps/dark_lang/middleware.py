@@ -15,9 +15,9 @@ from django.conf import settings
 from dark_lang import DARK_LANGUAGE_KEY
 from dark_lang.models import DarkLangConfig
 from openedx.core.djangoapps.user_api.preferences.api import (
-    delete_user_preference, get_user_preference, set_user_preference
+    delete_user_preference, set_user_preference
 )
-from lang_pref import LANGUAGE_KEY
+from openedx.core.djangoapps.user_api.user_context import get_user_context
 
 # TODO re-import this once we're on Django 1.5 or greater. [PLAT-671]
 # from django.utils.translation.trans_real import parse_accept_lang_header
@@ -142,7 +142,7 @@ class DarkLangMiddleware(object):
                 # Reset user's dark lang preference to null
                 delete_user_preference(request.user, DARK_LANGUAGE_KEY)
                 # Get & set user's preferred language
-                user_pref = get_user_preference(request.user, LANGUAGE_KEY)
+                user_pref = get_user_context(request.user).language
                 if user_pref:
                     request.session[LANGUAGE_SESSION_KEY] = user_pref
             return
@@ -152,7 +152,7 @@ class DarkLangMiddleware(object):
         preview_lang = request.GET.get('preview-lang', None)
         if not preview_lang and auth_user:
             # Get the request user's dark lang preference
-            preview_lang = get_user_preference(request.user, DARK_LANGUAGE_KEY)
+            preview_lang = get_user_context(request.user).dark_language
 
         # User doesn't have a dark lang preference, so just return
         if not preview_lang:
@@ -8,13 +8,13 @@ This API is exposed via the middleware(emabargo/middileware.py) layer but may be
 import logging
 import pygeoip
 
-from django.core.cache import cache
 from django.conf import settings
 from rest_framework.response import Response
 from rest_framework import status
 from ipware.ip import get_ip
 
 from embargo.models import CountryAccessRule, RestrictedCourse
+from openedx.core.djangoapps.user_api.user_context import get_user_context
 
 
 log = logging.getLogger(__name__)
@@ -140,17 +140,7 @@ def _get_user_country_from_profile(user):
         user country from profile.
 
     """
-    cache_key = u'user.{user_id}.profile.country'.format(user_id=user.id)
-    profile_country = cache.get(cache_key)
-    if profile_country is None:
-        profile = getattr(user, 'profile', None)
-        if profile is not None and profile.country.code is not None:
-            profile_country = profile.country.code.upper()
-        else:
-            profile_country = ""
-        cache.set(cache_key, profile_country)
-
-    return profile_country
+    return get_user_context(user).country
 
 
 def _country_code_from_ip(ip_addr):
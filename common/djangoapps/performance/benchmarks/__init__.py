@@ -0,0 +1,15 @@
+"""
+A benchmark suite for the hot paths of the LMS and Studio.
+
+The suite generates a synthetic course of a configurable size in the
+configured modulestores, along with learners and their state, and then times
+scenarios such as rendering the courseware or grading a learner against it.
+It is run with the `run_benchmarks` management command, e.g.
+
+    ./manage.py lms run_benchmarks --settings=devstack --store=split --chapters=10
+    ./manage.py cms run_benchmarks --settings=devstack --store=mongo
+
+Each scenario is reported as a JSON object on its own line, with its latency,
+SQL and Mongo query counts and memory use, so that runs can be compared
+between releases.
+"""
@@ -0,0 +1,168 @@
+"""
+Generators of synthetic courses and learner state for the benchmarks.
+"""
+from collections import namedtuple
+import json
+import random
+import uuid
+
+from django.contrib.auth.models import User
+
+from courseware.models import StudentModule
+from student.models import CourseEnrollment, UserProfile
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+
+
+# The number of children of each level of the course, and the relative
+# frequency of each type of leaf block.
+CourseShape = namedtuple('CourseShape', 'chapters sequentials verticals blocks block_mix')
+
+DEFAULT_BLOCK_MIX = {'problem': 5, 'html': 3, 'video': 2}
+
+BENCHMARK_PASSWORD = 'benchmark'
+
+PROBLEM_DATA = """
+<problem>
+  <multiplechoiceresponse>
+    <choicegroup type="MultipleChoice">
+      <choice correct="true">Right</choice>
+      <choice correct="false">Wrong</choice>
+    </choicegroup>
+  </multiplechoiceresponse>
+</problem>
+"""
+
+LEAF_BLOCK_FIELDS = {
+    'problem': {'data': PROBLEM_DATA, 'weight': 1},
+    'html': {'data': '<p>Some benchmark content.</p>' * 10},
+    'video': {'youtube_id_1_0': 'OEoXaMPEzfM'},
+}
+
+
+def parse_block_mix(block_mix):
+    """
+    Parse a block mix given as e.g. "problem:5,html:3,video:2".
+    """
+    parsed = {}
+    for item in block_mix.split(','):
+        block_type, __, frequency = item.partition(':')
+        parsed[block_type.strip()] = int(frequency or 1)
+    return parsed
+
+
+def generate_course(shape, user_id, store_type=ModuleStoreEnum.Type.split, seed=0):
+    """
+    Create and publish a course of the given `shape` in the modulestore of
+    type `store_type`, and return it.
+
+    Every sequential is graded as homework, so that the course has something to
+    grade. Leaf blocks are picked at random according to `shape.block_mix`,
+    from a generator seeded with `seed`.
+    """
+    store = modulestore()
+    rand = random.Random(seed)
+    block_types = [
+        block_type for block_type, frequency in sorted(shape.block_mix.items()) for __ in range(frequency)
+    ]
+
+    with store.default_store(store_type):
+        course = store.create_course(
+            'Benchmark',
+            'B{}'.format(uuid.uuid4().hex[:8]),
+            'run',
+            user_id,
+            fields={
+                'display_name': 'Benchmark course',
+                'grading_policy': {
+                    'GRADER': [{
+                        'type': 'Homework', 'min_count': 1, 'drop_count': 0, 'short_label': 'HW', 'weight': 1.0,
+                    }],
+                    'GRADE_CUTOFFS': {'Pass': 0.5},
+                },
+            },
+        )
+        with store.bulk_operations(course.id):
+            for chapter_index in range(shape.chapters):
+                chapter = store.create_child(
+                    user_id, course.location, 'chapter', fields={'display_name': 'Chapter {}'.format(chapter_index)}
+                )
+                for sequential_index in range(shape.sequentials):
+                    sequential = store.create_child(
+                        user_id, chapter.location, 'sequential',
+                        fields={
+                            'display_name': 'Sequential {}'.format(sequential_index),
+                            'graded': True,
+                            'format': 'Homework',
+                        },
+                    )
+                    for vertical_index in range(shape.verticals):
+                        vertical = store.create_child(
+                            user_id, sequential.location, 'vertical',
+                            fields={'display_name': 'Vertical {}'.format(vertical_index)},
+                        )
+                        for block_index in range(shape.blocks):
+                            block_type = rand.choice(block_types)
+                            fields = dict(LEAF_BLOCK_FIELDS.get(block_type, {}))
+                            fields['display_name'] = '{} {}'.format(block_type, block_index)
+                            store.create_child(user_id, vertical.location, block_type, fields=fields)
+            store.publish(course.location, user_id)
+
+    return store.get_course(course.id)
+
+
+def create_user(is_staff=False):
+    """
+    Create a user with a profile and the benchmark password, and return it.
+    """
+    username = 'benchmark_{}'.format(uuid.uuid4().hex[:12])
+    user = User.objects.create_user(username, '{}@example.com'.format(username), BENCHMARK_PASSWORD)
+    if is_staff:
+        user.is_staff = True
+        user.save()
+    UserProfile.objects.create(user=user, name=username)
+    return user
+
+
+def generate_learners(course_key, num_learners, attempted=0.5, seed=0):
+    """
+    Create `num_learners` users enrolled in `course_key`, each of whom has
+    answered a random `attempted` fraction of the course's problems, and
+    return them.
+    """
+    rand = random.Random(seed)
+    problems = [
+        problem.location
+        for problem in modulestore().get_items(course_key, qualifiers={'category': 'problem'})
+    ]
+
+    learners = []
+    for __ in range(num_learners):
+        user = create_user()
+        CourseEnrollment.enroll(user, course_key)
+
+        answered = rand.sample(problems, int(len(problems) * attempted))
+        StudentModule.objects.bulk_create([
+            StudentModule(
+                student=user,
+                course_id=course_key,
+                module_state_key=location,
+                module_type='problem',
+                state=json.dumps({'attempts': 1, 'done': True}),
+                grade=rand.choice([0, 1]),
+                max_grade=1,
+            )
+            for location in answered
+        ])
+        learners.append(user)
+    return learners
+
+
+def delete_generated_data(course_key, users):
+    """
+    Delete a course and users generated by this module.
+    """
+    StudentModule.objects.filter(course_id=course_key).delete()
+    CourseEnrollment.objects.filter(course_id=course_key).delete()
+    modulestore().delete_course(course_key, users[0].id)
+    User.objects.filter(id__in=[user.id for user in users]).delete()
@@ -0,0 +1,106 @@
+"""
+Timing of benchmark scenarios.
+"""
+import gc
+import resource
+from time import time
+
+from django.db import connections
+
+from dogstats_wrapper import request_profile
+from request_cache.middleware import RequestCache
+
+
+def _percentile(values, percent):
+    """
+    Return the `percent` percentile of the sorted list `values`.
+    """
+    index = min(len(values) - 1, int(round(percent / 100.0 * (len(values) - 1))))
+    return values[index]
+
+
+def _max_rss_kb():
+    """
+    Return the peak resident set size of this process.
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _profile_call(func):
+    """
+    Call `func` and return its request profile, with its SQL queries recorded
+    under the 'sql' category.
+    """
+    query_logs = []
+    for connection in connections.all():
+        query_logs.append((connection, connection.use_debug_cursor, len(connection.queries)))
+        connection.use_debug_cursor = True
+
+    profile = request_profile.start_profile()
+    try:
+        func()
+    finally:
+        for connection, use_debug_cursor, first_query in query_logs:
+            connection.use_debug_cursor = use_debug_cursor
+            for query in connection.queries[first_query:]:
+                profile.record('sql', 'queries', float(query['time']))
+        request_profile.stop_profile()
+    return profile
+
+
+def _median_count(profiles, category):
+    """
+    Return the median over `profiles` of the number of measurements in `category`.
+    """
+    counts = sorted(
+        sum(measure['count'] for measure in profile.get(category, {}).itervalues()) for profile in profiles
+    )
+    return _percentile(counts, 50)
+
+
+def run_scenario(name, func, iterations=10, warmup=1, count_mongo_queries=True):
+    """
+    Call `func` `warmup` times, then time `iterations` calls of it, and return
+    a report of the calls as a dict.
+
+    Every call is made with an empty request cache, as it would be by a new
+    request. The query counts in the report are the medians over the timed
+    calls. Only the split modulestore's Mongo queries are profiled, so pass
+    `count_mongo_queries=False` to leave their count out of the report for
+    scenarios using other stores.
+    """
+    for __ in range(warmup):
+        RequestCache.clear_request_cache()
+        func()
+
+    gc.collect()
+    start_max_rss = _max_rss_kb()
+    durations = []
+    profiles = []
+    for __ in range(iterations):
+        RequestCache.clear_request_cache()
+        start = time()
+        profile = _profile_call(func)
+        durations.append(time() - start)
+        profiles.append(profile.summary())
+    RequestCache.clear_request_cache()
+
+    durations.sort()
+    report = {
+        'scenario': name,
+        'iterations': iterations,
+        'latency': {
+            'min': durations[0],
+            'median': _percentile(durations, 50),
+            'p95': _percentile(durations, 95),
+            'max': durations[-1],
+            'mean': sum(durations) / len(durations),
+        },
+        'sql_queries': _median_count(profiles, 'sql'),
+        'modulestore_calls': _median_count(profiles, 'modulestore'),
+        'max_rss_kb': _max_rss_kb(),
+        'max_rss_growth_kb': _max_rss_kb() - start_max_rss,
+    }
+    if count_mongo_queries:
+        report['mongo_queries'] = _median_count(profiles, 'mongo')
+    return report
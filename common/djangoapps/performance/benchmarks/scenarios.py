@@ -0,0 +1,145 @@
+"""
+The benchmark scenarios.
+
+A scenario is a function that takes a `BenchmarkContext` and returns the
+function to be timed. Each scenario belongs to the service (LMS or Studio)
+whose code it exercises, and can only be run by that service.
+"""
+from collections import namedtuple, OrderedDict
+import uuid
+
+from django.core.urlresolvers import reverse
+from django.test.client import Client, RequestFactory
+
+from performance.benchmarks.generators import BENCHMARK_PASSWORD
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+
+
+# The course being benchmarked, an enrolled learner with some state in it,
+# and a staff user.
+BenchmarkContext = namedtuple('BenchmarkContext', 'course learner staff')
+
+Scenario = namedtuple('Scenario', 'service setup')
+
+
+class ScenarioError(Exception):
+    """
+    A scenario did not behave as expected, so its timings are meaningless.
+    """
+    pass
+
+
+def _client(user):
+    """
+    Return a test client logged in as `user`.
+    """
+    client = Client()
+    client.login(username=user.username, password=BENCHMARK_PASSWORD)
+    return client
+
+
+def _checked(response):
+    """
+    Raise a ScenarioError unless `response` is successful.
+    """
+    if response.status_code != 200:
+        raise ScenarioError(u'Unexpected response status {}'.format(response.status_code))
+    return response
+
+
+def courseware_index(context):
+    """
+    Render the first section of the course for the learner.
+    """
+    chapter = context.course.get_children()[0]
+    section = chapter.get_children()[0]
+    url = reverse('courseware_section', kwargs={
+        'course_id': unicode(context.course.id),
+        'chapter': chapter.location.name,
+        'section': section.location.name,
+    })
+    client = _client(context.learner)
+    return lambda: _checked(client.get(url))
+
+
+def progress_page(context):
+    """
+    Render the progress page of the learner.
+    """
+    url = reverse('progress', kwargs={'course_id': unicode(context.course.id)})
+    client = _client(context.learner)
+    return lambda: _checked(client.get(url))
+
+
+def grade(context):
+    """
+    Grade the learner.
+    """
+    from courseware import grades
+
+    request = RequestFactory().get('/')
+    request.user = context.learner
+    request.session = {}
+    course = modulestore().get_course(context.course.id, depth=None)
+    return lambda: grades.grade(context.learner, request, course)
+
+
+def problem_check(context):
+    """
+    Submit an answer to the first problem of the course as the learner.
+    """
+    from lms.djangoapps.lms_xblock.runtime import quote_slashes
+
+    problem = modulestore().get_items(context.course.id, qualifiers={'category': 'problem'})[0]
+    url = reverse('xblock_handler', kwargs={
+        'course_id': unicode(context.course.id),
+        'usage_id': quote_slashes(unicode(problem.location)),
+        'handler': 'xmodule_handler',
+        'suffix': 'problem_check',
+    })
+    data = {'input_{}_2_1'.format(problem.location.html_id()): 'choice_0'}
+    client = _client(context.learner)
+    return lambda: _checked(client.post(url, data))
+
+
+def studio_outline(context):
+    """
+    Load the course outline in Studio.
+    """
+    from contentstore.utils import reverse_course_url
+
+    url = reverse_course_url('course_handler', context.course.id)
+    client = _client(context.staff)
+    return lambda: _checked(client.get(url, HTTP_ACCEPT='application/json'))
+
+
+def course_publish(context):
+    """
+    Edit a unit of the course, and publish the course.
+    """
+    store = modulestore()
+    course_key = context.course.id
+    vertical_location = store.get_items(course_key, qualifiers={'category': 'vertical'})[0].location
+
+    def edit_and_publish():
+        """
+        Rename the unit, and publish the course.
+        """
+        with store.branch_setting(ModuleStoreEnum.Branch.draft_preferred, course_key):
+            vertical = store.get_item(vertical_location)
+            vertical.display_name = 'Vertical {}'.format(uuid.uuid4().hex[:8])
+            store.update_item(vertical, context.staff.id)
+            store.publish(context.course.location, context.staff.id)
+
+    return edit_and_publish
+
+
+SCENARIOS = OrderedDict([
+    ('courseware_index', Scenario('lms', courseware_index)),
+    ('progress_page', Scenario('lms', progress_page)),
+    ('grade', Scenario('lms', grade)),
+    ('problem_check', Scenario('lms', problem_check)),
+    ('studio_outline', Scenario('cms', studio_outline)),
+    ('course_publish', Scenario('cms', course_publish)),
+])
@@ -0,0 +1,122 @@
+"""
+Run the LMS or Studio benchmark suite against a generated course.
+"""
+import datetime
+import json
+import platform
+import sys
+from optparse import make_option
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from performance.benchmarks.generators import (
+    CourseShape,
+    DEFAULT_BLOCK_MIX,
+    create_user,
+    delete_generated_data,
+    generate_course,
+    generate_learners,
+    parse_block_mix,
+)
+from performance.benchmarks.runner import run_scenario
+from performance.benchmarks.scenarios import SCENARIOS, BenchmarkContext
+from xmodule.modulestore import ModuleStoreEnum
+
+
+STORE_TYPES = {
+    'split': ModuleStoreEnum.Type.split,
+    'mongo': ModuleStoreEnum.Type.mongo,
+}
+
+
+class Command(BaseCommand):
+    """
+    Run the benchmark scenarios of this service, and write one JSON report per
+    scenario and line.
+    """
+    help = """Run the benchmark scenarios of this service against a generated course.
+
+Examples:
+  ./manage.py lms run_benchmarks --settings=devstack --store=split --chapters=20
+  ./manage.py cms run_benchmarks --settings=devstack --scenario=course_publish --output=publish.jsonl
+"""
+
+    option_list = BaseCommand.option_list + (
+        make_option('--store', dest='store', default='split', choices=sorted(STORE_TYPES),
+                    help='The modulestore to generate the course in (split or mongo)'),
+        make_option('--chapters', dest='chapters', type='int', default=5, help='Chapters in the course'),
+        make_option('--sequentials', dest='sequentials', type='int', default=4, help='Sequentials per chapter'),
+        make_option('--verticals', dest='verticals', type='int', default=3, help='Verticals per sequential'),
+        make_option('--blocks', dest='blocks', type='int', default=4, help='Leaf blocks per vertical'),
+        make_option('--block-mix', dest='block_mix',
+                    default=','.join('{}:{}'.format(*item) for item in sorted(DEFAULT_BLOCK_MIX.items())),
+                    help='Relative frequency of the leaf block types, e.g. "problem:5,html:3,video:2"'),
+        make_option('--learners', dest='learners', type='int', default=10, help='Learners enrolled in the course'),
+        make_option('--attempted', dest='attempted', type='float', default=0.5,
+                    help='Fraction of the problems each learner has answered'),
+        make_option('--scenario', dest='scenarios', action='append', default=[],
+                    help='A scenario to run (may be repeated; defaults to all of this service)'),
+        make_option('--iterations', dest='iterations', type='int', default=10, help='Timed runs of each scenario'),
+        make_option('--seed', dest='seed', type='int', default=0, help='Seed of the generated data'),
+        make_option('--output', dest='output', default=None, help='File to append the reports to (default: stdout)'),
+        make_option('--keep', dest='keep', action='store_true', default=False,
+                    help='Keep the generated course and users'),
+    )
+
+    def handle(self, *args, **options):
+        service = 'cms' if settings.ROOT_URLCONF == 'cms.urls' else 'lms'
+        scenario_names = options['scenarios'] or [
+            name for name, scenario in SCENARIOS.items() if scenario.service == service
+        ]
+        for name in scenario_names:
+            if name not in SCENARIOS:
+                raise CommandError(u'Unknown scenario {}'.format(name))
+            if SCENARIOS[name].service != service:
+                raise CommandError(u'Scenario {} can only be run by {}'.format(name, SCENARIOS[name].service))
+
+        shape = CourseShape(
+            options['chapters'],
+            options['sequentials'],
+            options['verticals'],
+            options['blocks'],
+            parse_block_mix(options['block_mix']),
+        )
+
+        staff = create_user(is_staff=True)
+        course = generate_course(shape, staff.id, STORE_TYPES[options['store']], seed=options['seed'])
+        learners = generate_learners(course.id, options['learners'], options['attempted'], seed=options['seed'])
+        context = BenchmarkContext(course, learners[0], staff)
+
+        environment = {
+            'service': service,
+            'store': options['store'],
+            'course_shape': shape._asdict(),
+            'learners': options['learners'],
+            'attempted': options['attempted'],
+            'database': settings.DATABASES['default']['ENGINE'],
+            'python': platform.python_version(),
+            'time': datetime.datetime.utcnow().isoformat(),
+        }
+
+        output = open(options['output'], 'a') if options['output'] else sys.stdout
+        try:
+            # Don't let sampled request profiles add to the measurements
+            with override_settings(REQUEST_PROFILE_SAMPLE_RATE=0):
+                for name in scenario_names:
+                    report = run_scenario(
+                        name,
+                        SCENARIOS[name].setup(context),
+                        iterations=options['iterations'],
+                        # only the queries of the split modulestore are profiled
+                        count_mongo_queries=options['store'] == 'split',
+                    )
+                    report.update(environment)
+                    output.write(json.dumps(report, sort_keys=True) + '\n')
+                    output.flush()
+        finally:
+            if output is not sys.stdout:
+                output.close()
+            if not options['keep']:
+                delete_generated_data(course.id, [staff] + learners)
@@ -0,0 +1,115 @@
+"""
+Middleware that collects a performance profile of a sample of the requests.
+
+The profile breaks the time spent handling the request down by modulestore
+method and store, Mongo round trip, SQL table, memcache hit and miss, and
+XBlock render and handler by block type (see `dogstats_wrapper.request_profile`).
+
+A fraction of the requests, set by the REQUEST_PROFILE_SAMPLE_RATE setting, is
+profiled and its summary is emitted as a tracking event and as statsd metrics.
+Staff users can also ask for the summary of any request to be returned to them
+in a response header by sending the X-Edx-Request-Profile request header.
+"""
+import json
+import random
+import re
+
+from django.conf import settings
+from django.db import connections
+from eventtracking import tracker
+
+import dogstats_wrapper as dog_stats_api
+from dogstats_wrapper import request_profile
+
+
+REQUEST_PROFILE_EVENT_NAME = 'edx.performance.request_profile'
+REQUEST_PROFILE_HEADER = 'HTTP_X_EDX_REQUEST_PROFILE'
+RESPONSE_PROFILE_HEADER = 'X-Edx-Request-Profile'
+REQUEST_PROFILE_METRIC_NAME = 'edxapp.request_profile'
+
+# The table a SQL query reads from or writes to
+SQL_TABLE_PATTERN = re.compile(r'\b(?:FROM|INTO|UPDATE)\s+[`"]?(\w+)', re.IGNORECASE)
+
+
+class RequestProfileMiddleware(object):
+    """
+    Profiles sampled requests, and requests whose profile was asked for.
+    """
+    def process_request(self, request):
+        """
+        Start profiling the request, if it is sampled or its profile is asked for.
+        """
+        # in case the response of an earlier request on this thread wasn't processed
+        request_profile.discard_request_profiles()
+
+        sampled = random.random() < getattr(settings, 'REQUEST_PROFILE_SAMPLE_RATE', 0)
+        requested = REQUEST_PROFILE_HEADER in request.META
+        if not (sampled or requested):
+            return None
+
+        # Queries are only recorded by debug cursors, so use them while the
+        # request is being profiled.
+        query_logs = []
+        for connection in connections.all():
+            query_logs.append((connection, connection.use_debug_cursor, len(connection.queries)))
+            connection.use_debug_cursor = True
+
+        request.request_profile = {
+            'sampled': sampled,
+            'requested': requested,
+            'query_logs': query_logs,
+        }
+        request_profile.start_profile(for_request=True)
+        return None
+
+    def process_response(self, request, response):
+        """
+        Stop profiling the request, and report its profile.
+        """
+        profiling = getattr(request, 'request_profile', None)
+        if profiling is None:
+            return response
+
+        profile = request_profile.current_profile()
+        for connection, use_debug_cursor, first_query in profiling['query_logs']:
+            connection.use_debug_cursor = use_debug_cursor
+            for query in connection.queries[first_query:]:
+                table = SQL_TABLE_PATTERN.search(query['sql'])
+                profile.record('sql', table.group(1) if table else 'other', float(query['time']))
+        request_profile.stop_profile()
+
+        summary = profile.summary()
+        if profiling['sampled']:
+            self._emit(request, response, summary)
+
+        user = getattr(request, 'user', None)
+        if profiling['requested'] and user is not None and user.is_staff:
+            response[RESPONSE_PROFILE_HEADER] = json.dumps(summary, sort_keys=True)
+        return response
+
+    def _emit(self, request, response, summary):
+        """
+        Emit `summary` as a tracking event and as statsd metrics.
+        """
+        tracker.emit(REQUEST_PROFILE_EVENT_NAME, {
+            'path': request.path,
+            'method': request.method,
+            'status_code': response.status_code,
+            'profile': summary,
+        })
+
+        dog_stats_api.histogram('{}.duration'.format(REQUEST_PROFILE_METRIC_NAME), summary['duration'])
+        for category, measures in summary.iteritems():
+            if category == 'duration':
+                continue
+            tags = [u'category:{}'.format(category)]
+            dog_stats_api.histogram(
+                '{}.count'.format(REQUEST_PROFILE_METRIC_NAME),
+                sum(measure['count'] for measure in measures.itervalues()),
+                tags=tags,
+            )
+            dog_stats_api.histogram(
+                '{}.time'.format(REQUEST_PROFILE_METRIC_NAME),
+                sum(measure['self_time'] for measure in measures.itervalues()),
+                tags=tags,
+            )
@@ -0,0 +1,46 @@
+"""Tests for the benchmark suite."""
+from django.contrib.auth.models import User
+
+from courseware.models import StudentModule
+from performance.benchmarks.generators import CourseShape, create_user, generate_course, generate_learners
+from performance.benchmarks.runner import run_scenario
+from student.models import CourseEnrollment
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+
+
+class BenchmarkGeneratorsTest(ModuleStoreTestCase):
+    """
+    Tests that the generated course and learners have the requested shape.
+    """
+    def test_generate_course_and_learners(self):
+        staff = create_user(is_staff=True)
+        shape = CourseShape(2, 1, 1, 2, {'problem': 1})
+        course = generate_course(shape, staff.id, ModuleStoreEnum.Type.split)
+
+        self.assertEqual(2, len(course.get_children()))
+        problems = modulestore().get_items(course.id, qualifiers={'category': 'problem'})
+        self.assertEqual(4, len(problems))
+
+        learners = generate_learners(course.id, 2, attempted=0.5)
+        for learner in learners:
+            self.assertTrue(CourseEnrollment.is_enrolled(learner, course.id))
+            self.assertEqual(2, StudentModule.objects.filter(student=learner, course_id=course.id).count())
+
+
+class BenchmarkRunnerTest(ModuleStoreTestCase):
+    """
+    Tests the reports of the benchmark runner.
+    """
+    def test_report(self):
+        report = run_scenario('count_users', User.objects.count, iterations=3)
+        self.assertEqual('count_users', report['scenario'])
+        self.assertEqual(3, report['iterations'])
+        self.assertEqual(1, report['sql_queries'])
+        self.assertEqual(0, report['mongo_queries'])
+        self.assertLessEqual(report['latency']['min'], report['latency']['max'])
+
+    def test_report_without_mongo_queries(self):
+        report = run_scenario('count_users', User.objects.count, iterations=1, count_mongo_queries=False)
+        self.assertNotIn('mongo_queries', report)
@@ -0,0 +1,91 @@
+"""Tests for the request profiling middleware."""
+import json
+
+from django.contrib.auth.models import User
+from django.http import HttpResponse
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from mock import patch
+
+from dogstats_wrapper import request_profile
+from performance.middleware import RequestProfileMiddleware, REQUEST_PROFILE_EVENT_NAME, RESPONSE_PROFILE_HEADER
+from student.tests.factories import UserFactory
+
+
+class RequestProfileMiddlewareTest(TestCase):
+    """
+    Tests that requests are profiled when sampled or asked for.
+    """
+    def setUp(self):
+        super(RequestProfileMiddlewareTest, self).setUp()
+        self.middleware = RequestProfileMiddleware()
+        self.request = RequestFactory().get('/courses')
+        self.request.user = UserFactory.create(is_staff=True)
+        self.addCleanup(request_profile.stop_profile)
+
+    def _process(self):
+        """
+        Run the request through the middleware, doing some profiled work in
+        between, and return the response.
+        """
+        self.middleware.process_request(self.request)
+        with request_profile.timer('xblock_render', 'sequential'):
+            with request_profile.timer('xblock_render', 'problem'):
+                User.objects.count()
+        return self.middleware.process_response(self.request, HttpResponse())
+
+    @override_settings(REQUEST_PROFILE_SAMPLE_RATE=1)
+    @patch('performance.middleware.dog_stats_api')
+    @patch('performance.middleware.tracker')
+    def test_sampled_request(self, mock_tracker, mock_dog_stats_api):
+        response = self._process()
+        self.assertNotIn(RESPONSE_PROFILE_HEADER, response)
+        self.assertIsNone(request_profile.current_profile())
+
+        event_name, event = mock_tracker.emit.call_args[0]
+        self.assertEqual(REQUEST_PROFILE_EVENT_NAME, event_name)
+        self.assertEqual('/courses', event['path'])
+        profile = event['profile']
+        self.assertEqual(1, profile['sql']['auth_user']['count'])
+        self.assertEqual(1, profile['xblock_render']['sequential']['count'])
+        self.assertLessEqual(
+            profile['xblock_render']['sequential']['self_time'], profile['xblock_render']['sequential']['time']
+        )
+        self.assertTrue(mock_dog_stats_api.histogram.called)
+
+    @override_settings(REQUEST_PROFILE_SAMPLE_RATE=0)
+    @patch('performance.middleware.tracker')
+    def test_requested_by_staff(self, mock_tracker):
+        self.request.META['HTTP_X_EDX_REQUEST_PROFILE'] = '1'
+        response = self._process()
+        self.assertFalse(mock_tracker.emit.called)
+        profile = json.loads(response[RESPONSE_PROFILE_HEADER])
+        self.assertEqual(1, profile['xblock_render']['problem']['count'])
+
+    @override_settings(REQUEST_PROFILE_SAMPLE_RATE=0)
+    def test_requested_by_non_staff(self):
+        self.request.user = UserFactory.create()
+        self.request.META['HTTP_X_EDX_REQUEST_PROFILE'] = '1'
+        self.assertNotIn(RESPONSE_PROFILE_HEADER, self._process())
+
+    @override_settings(REQUEST_PROFILE_SAMPLE_RATE=0)
+    @patch('performance.middleware.tracker')
+    def test_not_profiled(self, mock_tracker):
+        response = self._process()
+        self.assertNotIn(RESPONSE_PROFILE_HEADER, response)
+        self.assertFalse(mock_tracker.emit.called)
+
+    @override_settings(REQUEST_PROFILE_SAMPLE_RATE=0)
+    def test_unfinished_request_profile_is_discarded(self):
+        enclosing_profile = request_profile.start_profile()
+        self.request.META['HTTP_X_EDX_REQUEST_PROFILE'] = '1'
+        self.middleware.process_request(self.request)
+        for connection, use_debug_cursor, __ in self.request.request_profile['query_logs']:
+            connection.use_debug_cursor = use_debug_cursor
+        request_profile.start_profile()
+
+        # The next request on the thread drops the profiles of the unfinished one
+        del self.request.META['HTTP_X_EDX_REQUEST_PROFILE']
+        self.middleware.process_request(self.request)
+        self.assertIs(enclosing_profile, request_profile.current_profile())
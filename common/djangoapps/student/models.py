@@ -26,14 +26,16 @@ from django.utils import timezone
 from django.contrib.auth.models import User
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.signals import user_logged_in, user_logged_out
-from django.db import models, IntegrityError
+from django.db import models, IntegrityError, transaction
 from django.db.models import Count
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver, Signal
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils.translation import ugettext_noop
 from django_countries.fields import CountryField
 from config_models.models import ConfigurationModel
+from request_cache.middleware import RequestCache
 from track import contexts
 from eventtracking import tracker
 from importlib import import_module
@@ -61,6 +63,14 @@ log = logging.getLogger(__name__)
 AUDIT_LOG = logging.getLogger("audit")
 SessionStore = import_module(settings.SESSION_ENGINE).SessionStore  # pylint: disable=invalid-name
 
+# Request cache and cache key of the enrollment index of a user (see CourseEnrollment.enrollment_index).
+# The index is invalidated before the enrollment change is committed, so rather than being deleted, it is
+# replaced by a marker for long enough for the change to be committed, during which it isn't cached.
+ENROLLMENT_INDEX_CACHE_KEY = u'student.enrollment_index.{user_id}'
+ENROLLMENT_INDEX_CACHE_TIMEOUT = 60 * 60
+ENROLLMENT_INDEX_INVALIDATED = 'invalidated'
+ENROLLMENT_INDEX_INVALIDATED_TIMEOUT = 60
+
 UNENROLLED_TO_ALLOWEDTOENROLL = 'from unenrolled to allowed to enroll'
 ALLOWEDTOENROLL_TO_ENROLLED = 'from allowed to enroll to enrolled'
 ENROLLED_TO_ENROLLED = 'from enrolled to enrolled'
@@ -1209,11 +1219,8 @@ class CourseEnrollment(models.Model):
         if isinstance(course_key, CCXLocator):
             course_key = course_key.to_course_locator()
 
-        try:
-            record = CourseEnrollment.objects.get(user=user, course_id=course_key)
-            return record.is_active
-        except cls.DoesNotExist:
-            return False
+        __, is_active = cls.enrollment_index(user).get(unicode(course_key), (None, False))
+        return is_active
 
     @classmethod
     def is_enrolled_by_partial(cls, user, course_id_partial):
@@ -1234,14 +1241,11 @@ class CourseEnrollment(models.Model):
         assert not course_id_partial.run  # None or empty string
         course_key = SlashSeparatedCourseKey(course_id_partial.org, course_id_partial.course, '')
         querystring = unicode(course_key.to_deprecated_string())
-        try:
-            return CourseEnrollment.objects.filter(
-                user=user,
-                course_id__startswith=querystring,
-                is_active=1
-            ).exists()
-        except cls.DoesNotExist:
-            return False
+        return any(
+            is_active
+            for course_id, (__, is_active) in cls.enrollment_index(user).iteritems()
+            if course_id.startswith(querystring)
+        )
 
     @classmethod
     def enrollment_mode_for_user(cls, user, course_id):
@@ -1255,21 +1259,59 @@ class CourseEnrollment(models.Model):
             and is_active is whether the enrollment is active.
         Returns (None, None) if the courseenrollment record does not exist.
         """
-        try:
-            record = CourseEnrollment.objects.get(user=user, course_id=course_id)
-            return (record.mode, record.is_active)
-        except cls.DoesNotExist:
-            return (None, None)
+        return cls.enrollment_index(user).get(unicode(course_id), (None, None))
+
+    @classmethod
+    def enrollment_index(cls, user):
+        """
+        Returns the enrollments of the given user, as a dict mapping the
+        course_id (as a string) of each of the user's courseenrollment records
+        to a (mode, is_active) tuple.
+
+        The index is loaded with a single query, and kept in the cache until
+        one of the user's enrollments changes, so that enrollment checks
+        usually don't query the database. It isn't cached while the changes
+        may still be uncommitted: for a while after an enrollment of the user
+        changed, or when loaded in a transaction with uncommitted changes.
+
+        When servicing a request, the index is also kept for the rest of the
+        request; the request cache is not cleared outside of requests (e.g. in
+        celery tasks), so it isn't used there.
+        """
+        if user.id is None:
+            return {}
+
+        cache_key = ENROLLMENT_INDEX_CACHE_KEY.format(user_id=user.id)
+        request_cache = RequestCache.get_request_cache().data if RequestCache.get_current_request() is not None else {}
+        index = request_cache.get(cache_key)
+        if index is None:
+            index = cache.get(cache_key)
+            if index is None or index == ENROLLMENT_INDEX_INVALIDATED:
+                index = {
+                    unicode(course_id): (mode, bool(is_active))
+                    for course_id, mode, is_active in CourseEnrollment.objects.filter(
+                        user_id=user.id
+                    ).values_list('course_id', 'mode', 'is_active')
+                }
+                # The invalidation marker is kept by cache.add, as is an index
+                # cached since by a request which saw newer enrollments
+                if not transaction.is_dirty():
+                    cache.add(cache_key, index, ENROLLMENT_INDEX_CACHE_TIMEOUT)
+            request_cache[cache_key] = index
+        return index
 
     @classmethod
     def enrollments_for_user(cls, user):
         return CourseEnrollment.objects.filter(user=user, is_active=1)
 
-    def is_paid_course(self):
+    def is_paid_course(self, modes_dict=None):
         """
         Returns True, if course is paid
+
+        If provided, `modes_dict` is used as the course modes of the course
+        (see `CourseMode.is_white_label`).
         """
-        paid_course = CourseMode.is_white_label(self.course_id)
+        paid_course = CourseMode.is_white_label(self.course_id, modes_dict=modes_dict)
         if paid_course or CourseMode.is_professional_slug(self.mode):
             return True
 
@@ -1289,10 +1331,14 @@ class CourseEnrollment(models.Model):
         """Changes this `CourseEnrollment` record's mode to `mode`.  Saves immediately."""
         self.update_enrollment(mode=mode)
 
-    def refundable(self):
+    def refundable(self, certificate=None, modes=None):
         """
         For paid/verified certificates, students may receive a refund if they have
         a verified certificate and the deadline for refunds has not yet passed.
+
+        Callers that have already loaded the student's certificate (or lack of
+        it, given as False) and the unexpired modes of the course can pass them
+        as `certificate` and `modes` to avoid database queries.
         """
         # In order to support manual refunds past the deadline, set can_refund on this object.
         # On unenrolling, the "UNENROLL_DONE" signal calls CertificateItem.refund_cert_callback(),
@@ -1303,12 +1349,14 @@ class CourseEnrollment(models.Model):
             return True
 
         # If the student has already been given a certificate they should not be refunded
-        if GeneratedCertificate.certificate_for_student(self.user, self.course_id) is not None:
+        if certificate is None:
+            certificate = GeneratedCertificate.certificate_for_student(self.user, self.course_id)
+        if certificate:
             return False
 
         #TODO - When Course administrators to define a refund period for paid courses then refundable will be supported. # pylint: disable=fixme
 
-        course_mode = CourseMode.mode_for_course(self.course_id, 'verified')
+        course_mode = CourseMode.mode_for_course(self.course_id, 'verified', modes=modes)
         if course_mode is None:
             return False
         else:
@@ -1348,6 +1396,35 @@ class CourseEnrollment(models.Model):
         return CourseMode.is_verified_slug(self.mode)
 
 
+def _clear_enrollment_index(user_id):
+    """
+    Clear the enrollment index of a user from the request cache, and replace it
+    with the invalidation marker in the cache.
+    """
+    cache_key = ENROLLMENT_INDEX_CACHE_KEY.format(user_id=user_id)
+    cache.set(cache_key, ENROLLMENT_INDEX_INVALIDATED, ENROLLMENT_INDEX_INVALIDATED_TIMEOUT)
+    RequestCache.get_request_cache().data.pop(cache_key, None)
+
+
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_delete, sender=CourseEnrollment)
+def invalidate_enrollment_index(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Clear the enrollment index of the user of a changed enrollment.
+    """
+    _clear_enrollment_index(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def clear_new_user_enrollment_index(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
+    """
+    Clear any enrollment index left behind by a deleted user whose id is
+    reused by a new user (e.g. after a rolled back transaction).
+    """
+    if created:
+        _clear_enrollment_index(instance.id)
+
+
 class ManualEnrollmentAudit(models.Model):
     """
     Table for tracking which enrollments were performed through manual enrollment.
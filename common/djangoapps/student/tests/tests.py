@@ -10,21 +10,26 @@ import ddt
 
 from django.conf import settings
 from django.contrib.auth.models import User, AnonymousUser
+from django.core.cache import cache as default_cache
 from django.core.urlresolvers import reverse
+from django.db import connection
 from django.test import TestCase
-from django.test.client import Client
+from django.test.client import Client, RequestFactory
 from mock import Mock, patch
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
 from student.models import (
-    anonymous_id_for_user, user_by_anonymous_id, CourseEnrollment, unique_id_for_user, LinkedInAddToProfileConfiguration
+    anonymous_id_for_user, user_by_anonymous_id, CourseEnrollment, unique_id_for_user,
+    LinkedInAddToProfileConfiguration, ENROLLMENT_INDEX_CACHE_KEY,
 )
 from student.views import (
     process_survey_link,
     _cert_info,
     complete_course_mode_info,
+    load_dashboard_courses,
 )
 from student.tests.factories import UserFactory, CourseModeFactory
+from request_cache.middleware import RequestCache
 from util.testing import EventTestMixin
 from util.model_utils import USER_SETTINGS_CHANGED_EVENT_NAME
 from xmodule.modulestore.tests.factories import CourseFactory, check_mongo_calls
@@ -529,6 +534,60 @@ class DashboardTest(ModuleStoreTestCase):
             response_3 = self.client.get(reverse('dashboard'))
             self.assertEquals(response_3.status_code, 200)
 
+    def _load_dashboard_courses_queries(self):
+        """
+        Load the dashboard courses of the user, and return the number of SQL
+        queries made along with the loaded courses.
+        """
+        request = RequestFactory().get(reverse('dashboard'))
+        request.user = self.user
+        use_debug_cursor = connection.use_debug_cursor
+        connection.use_debug_cursor = True
+        first_query = len(connection.queries)
+        try:
+            dashboard_courses = load_dashboard_courses(request, None, set())
+        finally:
+            connection.use_debug_cursor = use_debug_cursor
+        return len(connection.queries) - first_query, dashboard_courses
+
+    @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+    def test_dashboard_courses_queries(self):
+        """
+        Check that the number of queries made to load the dashboard courses
+        doesn't depend on the number of enrollments.
+        """
+        for mode in ('honor', 'verified'):
+            CourseModeFactory(mode_slug=mode, course_id=self.course.id)
+        CourseEnrollment.enroll(self.user, self.course.id, mode='verified')
+        GeneratedCertificateFactory.create(
+            user=self.user,
+            course_id=self.course.id,
+            status=CertificateStatuses.downloadable,
+            mode='verified',
+            download_url='http://www.example.com/certificate.pdf',
+        )
+        # Create the course overviews, so that every load reads them from the database.
+        self._load_dashboard_courses_queries()
+        num_queries, dashboard_courses = self._load_dashboard_courses_queries()
+        self.assertEqual([course.enrollment.course_id for course in dashboard_courses], [self.course.id])
+        self.assertEqual(dashboard_courses[0].cert_status['status'], 'ready')
+        self.assertFalse(dashboard_courses[0].is_refundable)
+
+        new_course_ids = set()
+        for __ in range(3):
+            course = CourseFactory.create()
+            CourseModeFactory(mode_slug='verified', course_id=course.id)
+            CourseEnrollment.enroll(self.user, course.id, mode='verified')
+            new_course_ids.add(course.id)
+        self._load_dashboard_courses_queries()
+        num_queries_more_courses, dashboard_courses = self._load_dashboard_courses_queries()
+        self.assertEqual(len(dashboard_courses), 4)
+        self.assertEqual(
+            {course.enrollment.course_id for course in dashboard_courses if course.is_refundable},
+            new_course_ids
+        )
+        self.assertEqual(num_queries_more_courses, num_queries)
+
 
 class UserSettingsEventTestMixin(EventTestMixin):
     """
@@ -723,6 +782,46 @@ class EnrollInCourseTest(EnrollmentEventTestMixin, TestCase):
         self.assertFalse(CourseEnrollment.is_enrolled(user, course_id1))
         self.assertFalse(CourseEnrollment.is_enrolled(user, course_id2))
 
+    @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+    def test_enrollment_index_caching(self):
+        user = User.objects.create(username="jack", email="jack@fake.edx.org")
+        course_id = SlashSeparatedCourseKey("edX", "Test101", "2013")
+        course_id_partial = SlashSeparatedCourseKey("edX", "Test101", None)
+        cache_key = ENROLLMENT_INDEX_CACHE_KEY.format(user_id=user.id)
+        CourseEnrollment.enroll(user, course_id, mode="verified")
+
+        # The index isn't cached while the enrollment change may still be uncommitted
+        with self.assertNumQueries(2):
+            self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
+            self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
+        # Nor when it is loaded in a transaction with uncommitted changes
+        default_cache.delete(cache_key)
+        self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
+        self.assertIsNone(default_cache.get(cache_key))
+
+        # Once committed, the index is loaded once, then enrollment checks don't query the database
+        with patch('student.models.transaction.is_dirty', return_value=False):
+            with self.assertNumQueries(1):
+                self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
+                self.assertTrue(CourseEnrollment.is_enrolled_by_partial(user, course_id_partial))
+                self.assertEquals(CourseEnrollment.enrollment_mode_for_user(user, course_id), ("verified", True))
+
+        # Including in other requests, until an enrollment of the user changes
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(0):
+            self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
+
+        # Outside of a request, the index is only kept in the cache
+        self.assertNotIn(cache_key, RequestCache.get_request_cache().data)
+
+        CourseEnrollment.unenroll(user, course_id)
+        self.assertFalse(CourseEnrollment.is_enrolled(user, course_id))
+        self.assertFalse(CourseEnrollment.is_enrolled_by_partial(user, course_id_partial))
+        self.assertEquals(CourseEnrollment.enrollment_mode_for_user(user, course_id), ("verified", False))
+
+        CourseEnrollment.objects.filter(user=user).delete()
+        self.assertEquals(CourseEnrollment.enrollment_mode_for_user(user, course_id), (None, None))
+
     @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
     def test_activation(self):
         user = User.objects.create(username="jack", email="jack@fake.edx.org")
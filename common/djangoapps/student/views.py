@@ -55,13 +55,16 @@ from student.models import (
 from student.forms import AccountCreationForm, PasswordResetFormNoActive
 
 from verify_student.models import SoftwareSecurePhotoVerification  # pylint: disable=import-error
-from certificates.models import CertificateStatuses, certificate_status_for_student
+from certificates.models import (  # pylint: disable=import-error
+    CertificateStatuses, GeneratedCertificate, certificate_status, certificate_status_for_student
+)
 from certificates.api import (  # pylint: disable=import-error
     get_certificate_url,
     has_html_certificates_enabled,
 )
 
 from xmodule.modulestore.django import modulestore
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from opaque_keys.edx.locator import CourseLocator
@@ -178,7 +181,7 @@ def process_survey_link(survey_link, user):
     return survey_link.format(UNIQUE_ID=unique_id_for_user(user))
 
 
-def cert_info(user, course_overview, course_mode):
+def cert_info(user, course_overview, course_mode, cert_status=None):
     """
     Get the certificate info needed to render the dashboard section for the given
     student and course.
@@ -187,6 +190,8 @@ def cert_info(user, course_overview, course_mode):
         user (User): A user.
         course_overview (CourseOverview): A course.
         course_mode (str): The enrollment mode (honor, verified, audit, etc.)
+        cert_status (dict): The certificate status of the user in the course, as
+            returned by `certificate_status_for_student`. Loaded if not provided.
 
     Returns:
         dict: A dictionary with keys:
@@ -200,12 +205,9 @@ def cert_info(user, course_overview, course_mode):
     """
     if not course_overview.may_certify():
         return {}
-    return _cert_info(
-        user,
-        course_overview,
-        certificate_status_for_student(user, course_overview.id),
-        course_mode
-    )
+    if cert_status is None:
+        cert_status = certificate_status_for_student(user, course_overview.id)
+    return _cert_info(user, course_overview, cert_status, course_mode)
 
 
 def reverification_info(statuses):
@@ -246,10 +248,12 @@ def get_course_enrollments(user, org_to_include, orgs_to_exclude):
         generator[CourseEnrollment]: a sequence of enrollments to be displayed
         on the user's dashboard.
     """
-    for enrollment in CourseEnrollment.enrollments_for_user(user):
+    enrollments = list(CourseEnrollment.enrollments_for_user(user))
+    course_overviews = CourseOverview.get_from_ids([enrollment.course_id for enrollment in enrollments])
+    for enrollment in enrollments:
 
         # If the course is missing or broken, log an error and skip it.
-        course_overview = enrollment.course_overview
+        course_overview = course_overviews[enrollment.course_id]
         if not course_overview:
             log.error(
                 "User %s enrolled in broken or non-existent course %s",
@@ -257,6 +261,7 @@ def get_course_enrollments(user, org_to_include, orgs_to_exclude):
                 enrollment.course_id
             )
             continue
+        enrollment._course_overview = course_overview  # pylint: disable=protected-access
 
         # If we are in a Microsite, then filter out anything that is not
         # attributed (by ORG) to that Microsite.
@@ -503,6 +508,92 @@ def is_course_blocked(request, redeemed_registration_codes, course_key):
     return blocked
 
 
+# The data displayed on the dashboard for one of the user's enrollments.
+DashboardCourse = namedtuple('DashboardCourse', [
+    'enrollment',  # CourseEnrollment, with its course overview loaded
+    'modes',  # dict of the unexpired course modes, keyed by slug
+    'mode_info',  # see complete_course_mode_info
+    'cert_status',  # see cert_info
+    'verify_status',  # see check_verify_status_by_course, or None
+    'credit_status',  # see _credit_statuses, or None
+    'show_email_settings',
+    'is_blocked',
+    'is_paid',
+    'is_refundable',
+])
+
+
+def load_dashboard_courses(request, course_org_filter, org_filter_out_set):
+    """
+    Load the data displayed on the dashboard for each of the user's enrollments.
+
+    The data of all the enrollments is loaded at once, so that the number of
+    database queries does not grow with the number of enrollments.
+
+    Arguments:
+        request (HttpRequest): The dashboard request.
+        course_org_filter (str): If not None, only courses of this org are loaded.
+        org_filter_out_set (set[str]): Orgs whose courses are not loaded, if
+            course_org_filter is None.
+
+    Returns:
+        list[DashboardCourse]: the enrollments of the user in courses that
+        exist, most recent first.
+    """
+    user = request.user
+
+    # Ignore any courses that no longer exist (because the course IDs have
+    # changed). Still, we don't delete those enrollments, because it could have
+    # been a data push snafu.
+    course_enrollments = list(get_course_enrollments(user, course_org_filter, org_filter_out_set))
+    course_enrollments.sort(key=lambda x: x.created, reverse=True)
+    course_ids = [enrollment.course_id for enrollment in course_enrollments]
+
+    all_course_modes, unexpired_course_modes = CourseMode.all_and_unexpired_modes_for_courses(course_ids)
+    verify_status_by_course = check_verify_status_by_course(user, course_enrollments, all_course_modes)
+    credit_statuses = _credit_statuses(user, course_enrollments)
+    certificates = GeneratedCertificate.certificates_for_student(user, course_ids)
+
+    # only show email settings for Mongo course and when bulk email is turned on
+    email_enabled_course_ids = frozenset()
+    if settings.FEATURES['ENABLE_INSTRUCTOR_EMAIL']:
+        email_enabled_course_ids = CourseAuthorization.instructor_email_enabled_for_courses(course_ids)
+
+    redeemed_registration_codes = defaultdict(list)
+    for registration_code in CourseRegistrationCode.objects.filter(
+            course_id__in=course_ids,
+            registrationcoderedemption__redeemed_by=user
+    ).select_related('invoice_item__invoice'):
+        redeemed_registration_codes[registration_code.course_id].append(registration_code)
+
+    dashboard_courses = []
+    for enrollment in course_enrollments:
+        course_id = enrollment.course_id
+        modes = {mode.slug: mode for mode in unexpired_course_modes[course_id]}
+        selectable_modes = {
+            slug: mode for slug, mode in modes.iteritems() if slug not in CourseMode.CREDIT_MODES
+        }
+        certificate = certificates.get(course_id)
+        dashboard_courses.append(DashboardCourse(
+            enrollment=enrollment,
+            modes=modes,
+            mode_info=complete_course_mode_info(course_id, enrollment, modes=modes),
+            cert_status=cert_info(user, enrollment.course_overview, enrollment.mode, certificate_status(certificate)),
+            verify_status=verify_status_by_course.get(course_id),
+            credit_status=credit_statuses.get(course_id),
+            show_email_settings=(
+                course_id in email_enabled_course_ids and
+                modulestore().get_modulestore_type(course_id) != ModuleStoreEnum.Type.xml
+            ),
+            is_blocked=is_course_blocked(request, redeemed_registration_codes[course_id], course_id),
+            is_paid=enrollment.is_paid_course(modes_dict=selectable_modes),
+            is_refundable=enrollment.refundable(
+                certificate=certificate or False, modes=unexpired_course_modes[course_id]
+            ),
+        ))
+    return dashboard_courses
+
+
 @login_required
 @ensure_csrf_cookie
 def dashboard(request):
@@ -522,29 +613,15 @@ def dashboard(request):
     if course_org_filter:
         org_filter_out_set.remove(course_org_filter)
 
-    # Build our (course, enrollment) list for the user, but ignore any courses that no
-    # longer exist (because the course IDs have changed). Still, we don't delete those
-    # enrollments, because it could have been a data push snafu.
-    course_enrollments = list(get_course_enrollments(user, course_org_filter, org_filter_out_set))
-
-    # sort the enrollment pairs by the enrollment date
-    course_enrollments.sort(key=lambda x: x.created, reverse=True)
-
-    # Retrieve the course modes for each course
-    enrolled_course_ids = [enrollment.course_id for enrollment in course_enrollments]
-    all_course_modes, unexpired_course_modes = CourseMode.all_and_unexpired_modes_for_courses(enrolled_course_ids)
-    course_modes_by_course = {
-        course_id: {
-            mode.slug: mode
-            for mode in modes
-        }
-        for course_id, modes in unexpired_course_modes.iteritems()
-    }
+    # Load everything displayed for each of the user's enrollments at once.
+    dashboard_courses = load_dashboard_courses(request, course_org_filter, org_filter_out_set)
+    course_enrollments = [dashboard_course.enrollment for dashboard_course in dashboard_courses]
 
     # Check to see if the student has recently enrolled in a course.
     # If so, display a notification message confirming the enrollment.
     enrollment_message = _create_recent_enrollment_message(
-        course_enrollments, course_modes_by_course
+        course_enrollments,
+        {dashboard_course.enrollment.course_id: dashboard_course.modes for dashboard_course in dashboard_courses}
     )
 
     course_optouts = Optout.objects.filter(user=user).values_list('course_id', flat=True)
@@ -570,48 +647,40 @@ def dashboard(request):
         and has_access(request.user, 'view_courseware_with_prerequisites', enrollment.course_overview)
     )
 
-    # Construct a dictionary of course mode information
-    # used to render the course list.  We re-use the course modes dict
-    # we loaded earlier to avoid hitting the database.
+    # The per-course data of the dashboard, keyed by course for the template.
     course_mode_info = {
-        enrollment.course_id: complete_course_mode_info(
-            enrollment.course_id, enrollment,
-            modes=course_modes_by_course[enrollment.course_id]
-        )
-        for enrollment in course_enrollments
+        dashboard_course.enrollment.course_id: dashboard_course.mode_info
+        for dashboard_course in dashboard_courses
+    }
+    verify_status_by_course = {
+        dashboard_course.enrollment.course_id: dashboard_course.verify_status
+        for dashboard_course in dashboard_courses
+        if dashboard_course.verify_status is not None
     }
-
-    # Determine the per-course verification status
-    # This is a dictionary in which the keys are course locators
-    # and the values are one of:
-    #
-    # VERIFY_STATUS_NEED_TO_VERIFY
-    # VERIFY_STATUS_SUBMITTED
-    # VERIFY_STATUS_APPROVED
-    # VERIFY_STATUS_MISSED_DEADLINE
-    #
-    # Each of which correspond to a particular message to display
-    # next to the course on the dashboard.
-    #
-    # If a course is not included in this dictionary,
-    # there is no verification messaging to display.
-    verify_status_by_course = check_verify_status_by_course(
-        user,
-        course_enrollments,
-        all_course_modes
-    )
     cert_statuses = {
-        enrollment.course_id: cert_info(request.user, enrollment.course_overview, enrollment.mode)
-        for enrollment in course_enrollments
+        dashboard_course.enrollment.course_id: dashboard_course.cert_status
+        for dashboard_course in dashboard_courses
+    }
+    credit_statuses = {
+        dashboard_course.enrollment.course_id: dashboard_course.credit_status
+        for dashboard_course in dashboard_courses
+        if dashboard_course.credit_status is not None
     }
-
-    # only show email settings for Mongo course and when bulk email is turned on
     show_email_settings_for = frozenset(
-        enrollment.course_id for enrollment in course_enrollments if (
-            settings.FEATURES['ENABLE_INSTRUCTOR_EMAIL'] and
-            modulestore().get_modulestore_type(enrollment.course_id) != ModuleStoreEnum.Type.xml and
-            CourseAuthorization.instructor_email_enabled(enrollment.course_id)
-        )
+        dashboard_course.enrollment.course_id for dashboard_course in dashboard_courses
+        if dashboard_course.show_email_settings
+    )
+    show_refund_option_for = frozenset(
+        dashboard_course.enrollment.course_id for dashboard_course in dashboard_courses
+        if dashboard_course.is_refundable
+    )
+    block_courses = frozenset(
+        dashboard_course.enrollment.course_id for dashboard_course in dashboard_courses
+        if dashboard_course.is_blocked
+    )
+    enrolled_courses_either_paid = frozenset(
+        dashboard_course.enrollment.course_id for dashboard_course in dashboard_courses
+        if dashboard_course.is_paid
     )
 
     # Verification Attempts
@@ -622,28 +691,6 @@ def dashboard(request):
     statuses = ["approved", "denied", "pending", "must_reverify"]
     reverifications = reverification_info(statuses)
 
-    show_refund_option_for = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if enrollment.refundable()
-    )
-
-    block_courses = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if is_course_blocked(
-            request,
-            CourseRegistrationCode.objects.filter(
-                course_id=enrollment.course_id,
-                registrationcoderedemption__redeemed_by=request.user
-            ),
-            enrollment.course_id
-        )
-    )
-
-    enrolled_courses_either_paid = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if enrollment.is_paid_course()
-    )
-
     # If there are *any* denied reverifications that have not been toggled off,
     # we'll display the banner
     denied_banner = any(item.display for item in reverifications["denied"])
@@ -675,7 +722,7 @@ def dashboard(request):
         'show_courseware_links_for': show_courseware_links_for,
         'all_course_modes': course_mode_info,
         'cert_statuses': cert_statuses,
-        'credit_statuses': _credit_statuses(user, course_enrollments),
+        'credit_statuses': credit_statuses,
         'show_email_settings_for': show_email_settings_for,
         'reverifications': reverifications,
         'verification_status': verification_status,
@@ -0,0 +1,99 @@
+"""
+A cache of the rendered views of XBlocks that are the same for every user.
+
+A block opts into the cache by listing the names of these views in its
+`user_independent_views` attribute. Their fragments must not depend on the
+render context either. The fragments are cached by course version, usage id,
+view and language, with the values that are specific to the user or to the
+request (such as the anonymous user id that replaces `%%USER_ID%%`) replaced by
+placeholders, which are substituted back when a fragment is read from the cache.
+
+The version of a course is changed whenever the course is published in Studio
+(see `contentstore.signals`), so that its cached fragments are no longer read.
+"""
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.utils.translation import get_language
+from xblock.fragment import Fragment
+
+from request_cache.middleware import RequestCache
+
+FRAGMENT_CACHE_KEY = u'xblock_django.fragment.{course_id}.{version}.{usage_id}.{view_name}.{language}'
+FRAGMENT_CACHE_TIMEOUT = 24 * 60 * 60
+COURSE_VERSION_CACHE_KEY = u'xblock_django.fragment_version.{course_id}'
+# The versions outlive the fragments, so that a fragment is never read again
+# once the version it was cached with has been replaced
+COURSE_VERSION_CACHE_TIMEOUT = 2 * FRAGMENT_CACHE_TIMEOUT
+
+USER_ID_PLACEHOLDER = u'%%USER_ID%%'
+REQUEST_TOKEN_PLACEHOLDER = u'%%REQUEST_TOKEN%%'
+
+
+def is_user_independent(block, view_name):
+    """
+    Returns whether the `view_name` view of `block` is the same for every user.
+    """
+    return view_name in getattr(block, 'user_independent_views', ())
+
+
+def get_course_version(course_id):
+    """
+    Returns the current version of the cached fragments of a course, which is
+    kept for the rest of the request.
+    """
+    key = COURSE_VERSION_CACHE_KEY.format(course_id=course_id)
+    request_cache = RequestCache.get_request_cache().data
+    if key not in request_cache:
+        version = cache.get(key)
+        if version is None:
+            # The version is random rather than a counter, so that the
+            # fragments cached before the version was evicted are never read
+            version = uuid4().hex
+            if not cache.add(key, version, COURSE_VERSION_CACHE_TIMEOUT):
+                version = cache.get(key) or version
+        request_cache[key] = version
+    return request_cache[key]
+
+
+def invalidate_course_fragments(course_id):
+    """
+    Changes the version of the cached fragments of a course, so that they are
+    rendered again.
+    """
+    key = COURSE_VERSION_CACHE_KEY.format(course_id=course_id)
+    cache.set(key, uuid4().hex, COURSE_VERSION_CACHE_TIMEOUT)
+    RequestCache.get_request_cache().data.pop(key, None)
+
+
+def get_cached_fragment(course_id, block, view_name, substitutions, render):
+    """
+    Returns the `view_name` fragment of `block` from the cache, or renders it
+    with `render` and caches it.
+
+    `substitutions` maps the placeholders of the cached content to the values
+    of the current user and request. Placeholders with an empty value are left
+    as they are.
+    """
+    key = FRAGMENT_CACHE_KEY.format(
+        course_id=course_id,
+        version=get_course_version(course_id),
+        usage_id=block.scope_ids.usage_id,
+        view_name=view_name,
+        language=get_language(),
+    )
+    substitutions = [(placeholder, value) for placeholder, value in substitutions.iteritems() if value]
+
+    cached = cache.get(key)
+    if cached is not None:
+        fragment = Fragment.from_pyobj(cached)
+        for placeholder, value in substitutions:
+            fragment.content = fragment.content.replace(placeholder, value)
+        return fragment
+
+    fragment = render()
+    cached = fragment.to_pyobj()
+    for placeholder, value in substitutions:
+        cached['content'] = cached['content'].replace(value, placeholder)
+    cache.set(key, cached, FRAGMENT_CACHE_TIMEOUT)
+    return fragment
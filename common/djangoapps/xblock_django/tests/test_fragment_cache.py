@@ -0,0 +1,76 @@
+"""
+Tests for the cache of user independent XBlock fragments.
+"""
+from django.core.cache import cache
+from django.test import TestCase
+from mock import Mock
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from xblock.fragment import Fragment
+
+from request_cache.middleware import RequestCache
+from xblock_django.fragment_cache import (
+    get_cached_fragment,
+    invalidate_course_fragments,
+    is_user_independent,
+    REQUEST_TOKEN_PLACEHOLDER,
+    USER_ID_PLACEHOLDER,
+)
+
+
+class FragmentCacheTestCase(TestCase):
+    """
+    Tests for the cache of user independent XBlock fragments.
+    """
+    def setUp(self):
+        super(FragmentCacheTestCase, self).setUp()
+        cache.clear()
+        self.addCleanup(RequestCache.clear_request_cache)
+        self.course_id = SlashSeparatedCourseKey('edX', 'fragments', '2015')
+        self.block = Mock(user_independent_views=('student_view',))
+        self.block.scope_ids.usage_id = self.course_id.make_usage_key('html', 'intro')
+
+    def get_fragment(self, anonymous_user_id, request_token, render):
+        """
+        Returns the student_view fragment of the block for a user and a request.
+        """
+        return get_cached_fragment(
+            self.course_id,
+            self.block,
+            'student_view',
+            {USER_ID_PLACEHOLDER: anonymous_user_id, REQUEST_TOKEN_PLACEHOLDER: request_token},
+            render,
+        )
+
+    def test_is_user_independent(self):
+        self.assertTrue(is_user_independent(self.block, 'student_view'))
+        self.assertFalse(is_user_independent(self.block, 'author_view'))
+        self.assertFalse(is_user_independent(object(), 'student_view'))
+
+    def test_substitutions(self):
+        fragment = Fragment(u'<div data-request-token="token1">Hello user1</div>')
+        fragment.add_css(u'.hello {}')
+        render = Mock(return_value=fragment)
+        self.assertEqual(self.get_fragment('user1', 'token1', render), fragment)
+
+        # The second user gets the cached fragment, with their own values
+        render.reset_mock()
+        cached_fragment = self.get_fragment('user2', 'token2', render)
+        self.assertFalse(render.called)
+        self.assertEqual(cached_fragment.content, u'<div data-request-token="token2">Hello user2</div>')
+        self.assertEqual(cached_fragment.resources, fragment.resources)
+
+        # The placeholders are left as they are for empty values
+        self.assertEqual(
+            self.get_fragment('', 'token3', render).content,
+            u'<div data-request-token="token3">Hello %%USER_ID%%</div>'
+        )
+
+    def test_invalidation(self):
+        render = Mock(return_value=Fragment(u'Hello'))
+        self.get_fragment('user1', 'token1', render)
+        self.get_fragment('user1', 'token1', render)
+        self.assertEqual(render.call_count, 1)
+
+        invalidate_course_fragments(self.course_id)
+        self.get_fragment('user1', 'token1', render)
+        self.assertEqual(render.call_count, 2)
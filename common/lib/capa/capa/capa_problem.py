@@ -13,11 +13,13 @@ Main module which shows problems (of "capa" type).
 This is used by capa_module.
 """
 
+from contextlib import contextmanager
 from copy import deepcopy
 from datetime import datetime
 import logging
 import os.path
 import re
+import threading
 
 from lxml import etree
 from pytz import UTC
@@ -58,6 +60,30 @@ html_problem_semantics = [
 
 log = logging.getLogger(__name__)
 
+# Per-thread cache of parsed problem trees, used by `cache_parsed_problems`
+_parsed_problems = threading.local()
+
+
+@contextmanager
+def cache_parsed_problems():
+    """
+    Within this block, the XML of each problem is only parsed (and its includes
+    read) once in this thread, and every LoncapaProblem created for the same
+    problem gets its own copy of the parsed tree.
+
+    This is meant for code creating the same problem for many students, like
+    the rescoring of a problem.
+    """
+    if getattr(_parsed_problems, 'trees', None) is not None:
+        yield
+        return
+
+    _parsed_problems.trees = {}
+    try:
+        yield
+    finally:
+        _parsed_problems.trees = None
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -161,13 +187,7 @@ class LoncapaProblem(object):
         problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
         self.problem_text = problem_text
 
-        # parse problem XML file into an element tree
-        self.tree = etree.XML(problem_text)
-
-        self.make_xml_compatible(self.tree)
-
-        # handle any <include file="foo"> tags
-        self._process_includes()
+        self.tree = self._parse_problem_text(problem_text)
 
         # construct script processor context (eg for customresponse problems)
         self.context = self._extract_context(self.tree)
@@ -195,6 +215,27 @@ class LoncapaProblem(object):
 
         self.extracted_tree = self._extract_html(self.tree)
 
+    def _parse_problem_text(self, problem_text):
+        """
+        Returns the element tree of `problem_text`, with its includes processed.
+        """
+        parsed_trees = getattr(_parsed_problems, 'trees', None)
+        cache_key = (self.problem_id, problem_text)
+        if parsed_trees is not None and cache_key in parsed_trees:
+            return deepcopy(parsed_trees[cache_key])
+
+        # parse problem XML file into an element tree
+        self.tree = etree.XML(problem_text)
+
+        self.make_xml_compatible(self.tree)
+
+        # handle any <include file="foo"> tags
+        self._process_includes()
+
+        if parsed_trees is not None:
+            parsed_trees[cache_key] = deepcopy(self.tree)
+        return self.tree
+
     def make_xml_compatible(self, tree):
         """
         Adjust tree xml in-place for compatibility before creating
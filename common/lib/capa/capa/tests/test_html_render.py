@@ -7,6 +7,7 @@ import mock
 
 from .response_xml_factory import StringResponseXMLFactory, CustomResponseXMLFactory
 from . import test_capa_system, new_loncapa_problem
+from capa.capa_problem import cache_parsed_problems
 
 
 class CapaHtmlRenderTest(unittest.TestCase):
@@ -54,6 +55,29 @@ class CapaHtmlRenderTest(unittest.TestCase):
         self.assertEqual(test_element.tag, "test")
         self.assertEqual(test_element.text, "Test include")
 
+    def test_cache_parsed_problems(self):
+        self._create_test_file(
+            'test_include.xml',
+            '<test>Test include</test>'
+        )
+        xml_str = textwrap.dedent("""
+            <problem>
+                <include file="test_include.xml"/>
+            </problem>
+        """)
+
+        filestore = self.capa_system.filestore
+        with mock.patch.object(filestore, 'open', wraps=filestore.open) as mock_open:
+            with cache_parsed_problems():
+                problems = [new_loncapa_problem(xml_str, capa_system=self.capa_system) for __ in range(3)]
+
+        # The include file was only read once, but each problem has its own tree
+        self.assertEqual(mock_open.call_count, 1)
+        self.assertEqual(len(set(id(problem.tree) for problem in problems)), 3)
+        for problem in problems:
+            rendered_html = etree.XML(problem.get_html())
+            self.assertEqual(rendered_html.find("test").text, "Test include")
+
     def test_process_outtext(self):
         # Generate some XML with <startouttext /> and <endouttext />
         xml_str = textwrap.dedent("""
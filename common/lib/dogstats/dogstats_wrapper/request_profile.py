@@ -0,0 +1,203 @@
+"""
+Collection of per-request performance profiles.
+
+A profile is started for the current thread (usually by a middleware, for a
+sample of the requests), and code that is worth measuring times itself with
+:func:`timer` or counts events with :func:`record`. Measurements are grouped
+by a category (e.g. ``modulestore`` or ``xblock_render``) and a name within
+that category (e.g. the method or the block type).
+
+When no profile is active, :func:`timer` and :func:`record` do nothing but
+look up the thread's profile, so they can be left in hot code paths.
+
+Profiles can be nested (e.g. a benchmark profiling a request that is itself
+sampled): the measurements of a nested profile are added to the enclosing
+one when it is stopped.
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+import threading
+from time import time
+
+
+_PROFILES = threading.local()
+
+
+class _ActiveTimer(object):
+    """
+    A measurement in progress. Its name may still be changed by the timed code
+    (see :func:`label_current`).
+    """
+    __slots__ = ('category', 'name', 'labelled', 'child_time')
+
+    def __init__(self, category, name):
+        self.category = category
+        self.name = name
+        self.labelled = False
+        self.child_time = 0.0
+
+
+class RequestProfile(object):
+    """
+    The measurements taken while handling a single request.
+
+    For each (category, name), the profile keeps the number of measurements,
+    their total duration, and their self duration, which excludes the time
+    spent in measurements nested in them.
+    """
+    def __init__(self, for_request=False):
+        self.for_request = for_request
+        self._measures = defaultdict(lambda: [0, 0.0, 0.0])
+        self._active_timers = []
+        self.start_time = time()
+
+    def record(self, category, name, duration=0.0, count=1, self_duration=None):
+        """
+        Add `count` measurements of `duration` seconds to (category, name).
+        """
+        measure = self._measures[(category, name)]
+        measure[0] += count
+        measure[1] += duration
+        measure[2] += duration if self_duration is None else self_duration
+
+    @contextmanager
+    def timer(self, category, name):
+        """
+        Time the wrapped code as a measurement of (category, name).
+        """
+        active_timer = _ActiveTimer(category, name)
+        self._active_timers.append(active_timer)
+        start = time()
+        try:
+            yield active_timer
+        finally:
+            duration = time() - start
+            self._active_timers.pop()
+            if self._active_timers:
+                self._active_timers[-1].child_time += duration
+            self.record(
+                active_timer.category, active_timer.name, duration, self_duration=duration - active_timer.child_time
+            )
+
+    def merge(self, profile):
+        """
+        Add the measurements of `profile` to this profile.
+        """
+        measures = profile._measures  # pylint: disable=protected-access
+        for (category, name), (count, duration, self_duration) in measures.iteritems():
+            self.record(category, name, duration, count, self_duration)
+
+    def label_current(self, category, label):
+        """
+        Prefix the name of the innermost active timer with `label`, if that
+        timer is for `category`. Only the first label is applied.
+        """
+        if self._active_timers:
+            active_timer = self._active_timers[-1]
+            if active_timer.category == category and not active_timer.labelled:
+                active_timer.name = u'{}.{}'.format(label, active_timer.name)
+                active_timer.labelled = True
+
+    def summary(self):
+        """
+        Return the measurements as a dict of the form
+        ``{category: {name: {'count': ..., 'time': ..., 'self_time': ...}}}``,
+        along with the total duration of the profile under the 'duration' key.
+        """
+        summary = defaultdict(dict)
+        for (category, name), (count, duration, self_duration) in self._measures.iteritems():
+            summary[category][name] = {
+                'count': count,
+                'time': round(duration, 6),
+                'self_time': round(self_duration, 6),
+            }
+        summary = dict(summary)
+        summary['duration'] = round(time() - self.start_time, 6)
+        return summary
+
+
+def _profile_stack():
+    """
+    Return the stack of the current thread's active profiles.
+    """
+    if not hasattr(_PROFILES, 'stack'):
+        _PROFILES.stack = []
+    return _PROFILES.stack
+
+
+def start_profile(for_request=False):
+    """
+    Start a new profile for the current thread, and return it. `for_request`
+    marks the profile of a request (see :func:`discard_request_profiles`).
+    """
+    profile = RequestProfile(for_request)
+    _profile_stack().append(profile)
+    return profile
+
+
+def discard_request_profiles():
+    """
+    Discard the current thread's request profiles, and the profiles nested in
+    them, in case earlier requests on this thread were not done with theirs
+    (e.g. when their response wasn't processed). The profiles enclosing them
+    are kept.
+    """
+    stack = _profile_stack()
+    for index, profile in enumerate(stack):
+        if profile.for_request:
+            del stack[index:]
+            return
+
+
+def stop_profile():
+    """
+    Stop the current thread's innermost profile, and return it (or None). Its
+    measurements are added to the enclosing profile, if any.
+    """
+    stack = _profile_stack()
+    if not stack:
+        return None
+    profile = stack.pop()
+    if stack:
+        stack[-1].merge(profile)
+    return profile
+
+
+def current_profile():
+    """
+    Return the current thread's innermost profile, or None if it isn't being profiled.
+    """
+    stack = getattr(_PROFILES, 'stack', None)
+    return stack[-1] if stack else None
+
+
+def record(category, name, duration=0.0, count=1):
+    """
+    Add measurements to the current profile, if any. See `RequestProfile.record`.
+    """
+    profile = current_profile()
+    if profile is not None:
+        profile.record(category, name, duration, count)
+
+
+@contextmanager
+def timer(category, name):
+    """
+    Time the wrapped code in the current profile, if any. See `RequestProfile.timer`.
+    """
+    profile = current_profile()
+    if profile is None:
+        yield None
+    else:
+        with profile.timer(category, name) as active_timer:
+            yield active_timer
+
+
+def label_current(category, label):
+    """
+    Label the innermost active timer of the current profile, if any. See
+    `RequestProfile.label_current`.
+    """
+    profile = current_profile()
+    if profile is not None:
+        profile.label_current(category, label)
@@ -918,6 +918,66 @@ class CourseFields(object):
     )
 
 
+class CourseSummary(object):
+    """
+    A lightweight stand-in for a course descriptor, built straight from the stored course block fields
+    without constructing the course. Used by Studio to list courses.
+
+    It exposes the attributes the course listing needs: ``id``, ``location``, ``display_name``,
+    ``display_org_with_default`` and ``display_number_with_default``.
+    """
+    course_info_fields = ['display_name', 'display_coursenumber', 'display_organization']
+
+    def __init__(self, course_locator, display_name=u"Empty", display_coursenumber=None, display_organization=None,
+                 location=None):
+        """
+        Arguments:
+            course_locator (CourseKey): the key of the course
+            display_name (unicode): the course's display name. Callers should leave the default when the
+                course block doesn't set one, to match the course field default.
+            display_coursenumber (unicode|None): the display course number override, if any
+            display_organization (unicode|None): the display organization override, if any
+            location (UsageKey|None): the course block's usage key. Defaults to the split course root key.
+        """
+        self.display_coursenumber = display_coursenumber
+        self.display_organization = display_organization
+        self.display_name = display_name
+
+        self.id = course_locator  # pylint: disable=invalid-name
+        self.location = location or course_locator.make_usage_key('course', 'course')
+
+    @property
+    def display_org_with_default(self):
+        """
+        Return a display organization if it has been specified, otherwise return the 'org' that is in the location
+        """
+        if self.display_organization:
+            return self.display_organization
+        return self.location.org
+
+    @property
+    def display_number_with_default(self):
+        """
+        Return a display course number if it has been specified, otherwise return the 'course' that is in the location
+        """
+        if self.display_coursenumber:
+            return self.display_coursenumber
+        return self.location.course
+
+    @classmethod
+    def from_course(cls, course):
+        """
+        Build a summary from an already loaded course descriptor
+        """
+        return cls(
+            course.id,
+            display_name=course.display_name,
+            display_coursenumber=course.display_coursenumber,
+            display_organization=course.display_organization,
+            location=course.location,
+        )
+
+
 class CourseModule(CourseFields, SequenceModule):  # pylint: disable=abstract-method
     """
     The CourseDescriptor needs its module_class to be a SequenceModule, but some code that
@@ -899,6 +899,15 @@ class ModuleStoreRead(ModuleStoreAssetBase):
         '''
         pass
 
+    @abstractmethod
+    def get_course_summaries(self, **kwargs):
+        '''
+        Returns a list of :class:`~xmodule.course_module.CourseSummary` objects for the courses in this
+        modulestore, read without constructing the course descriptors. Accepts the same optional 'org'
+        filter as get_courses.
+        '''
+        pass
+
     @abstractmethod
     def get_course(self, course_id, depth=0, **kwargs):
         '''
@@ -1163,6 +1172,20 @@ class ModuleStoreReadBase(BulkOperationsMixin, ModuleStoreRead):
         """
         return {}
 
+    def get_course_summaries(self, **kwargs):
+        """
+        See ModuleStoreRead.get_course_summaries
+
+        Default impl--summarize the loaded course descriptors
+        """
+        from xmodule.course_module import CourseSummary  # avoid circular import
+        from xmodule.error_module import ErrorDescriptor
+        return [
+            CourseSummary.from_course(course)
+            for course in self.get_courses(**kwargs)
+            if not isinstance(course, ErrorDescriptor)
+        ]
+
     def get_course(self, course_id, depth=0, **kwargs):
         """
         See ModuleStoreRead.get_course
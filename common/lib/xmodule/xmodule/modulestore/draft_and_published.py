@@ -81,6 +81,25 @@ class ModuleStoreDraftAndPublished(BranchSettingMixin):
     def has_changes(self, xblock):
         raise NotImplementedError
 
+    def get_subtree_changes(self, xblock):
+        """
+        Returns whether each block of the subtree rooted at xblock has unpublished changes, as
+        `has_changes` would for that block, as a dict keyed by (block_type, block_id).
+
+        Stores should override this to compute the whole subtree in a single pass, rather than
+        checking the descendants of every block again.
+        """
+        changes = {}
+
+        def visit(block):
+            """ Record the changes of block and of its descendants. """
+            changes[(block.location.block_type, block.location.block_id)] = self.has_changes(block)
+            if block.has_children:
+                for child in block.get_children():
+                    visit(child)
+        visit(xblock)
+        return changes
+
     @abstractmethod
     def publish(self, location, user_id):
         raise NotImplementedError
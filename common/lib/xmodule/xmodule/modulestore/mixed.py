@@ -11,6 +11,7 @@ import itertools
 import functools
 from contracts import contract, new_contract
 
+from dogstats_wrapper import request_profile
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey, AssetKey
 from opaque_keys.edx.locator import LibraryLocator
@@ -41,6 +42,8 @@ def strip_key(func):
 
     The behavior can be controlled by passing 'remove_version' and 'remove_branch' booleans to the decorated
     function's kwargs.
+
+    The calls are also timed in the current request profile, if any (see `dogstats_wrapper.request_profile`).
     """
     @functools.wraps(func)
     def inner(*args, **kwargs):
@@ -87,7 +90,8 @@ def strip_key(func):
             return field_value
 
         # call the decorated function
-        retval = func(field_decorator=strip_key_collection, *args, **kwargs)
+        with request_profile.timer('modulestore', func.__name__):
+            retval = func(field_decorator=strip_key_collection, *args, **kwargs)
 
         # strip the return value
         return strip_key_collection(retval)
@@ -180,6 +184,16 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
 
         If locator is None, returns the first (ordered) store as the default
         """
+        store = self._find_modulestore_for_courselike(locator)
+        if request_profile.current_profile() is not None:
+            # attribute the modulestore call being profiled to the store serving it
+            request_profile.label_current('modulestore', store.get_modulestore_type(locator))
+        return store
+
+    def _find_modulestore_for_courselike(self, locator):
+        """
+        See `_get_modulestore_for_courselike`.
+        """
         if locator is not None:
             locator = self._clean_locator_for_mapping(locator)
             mapping = self.mappings.get(locator, None)
@@ -280,6 +294,23 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
                     courses[course_id] = course
         return courses.values()
 
+    @strip_key
+    def get_course_summaries(self, **kwargs):
+        """
+        Returns a list containing the course information in CourseSummary objects.
+        Information contains `location`, `display_name`, `display_coursenumber`
+        and `display_organization`.
+        """
+        summaries = {}
+        for store in self.modulestores:
+            # filter out ones which were fetched from earlier stores but locations may not be ==
+            for summary in store.get_course_summaries(**kwargs):
+                course_id = self._clean_locator_for_mapping(summary.id)
+                if course_id not in summaries:
+                    # course is indeed unique. save it in result
+                    summaries[course_id] = summary
+        return summaries.values()
+
     @strip_key
     def get_courses_keys(self, **kwargs):
         '''
@@ -869,6 +900,15 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._verify_modulestore_support(xblock.location.course_key, 'has_changes')
         return store.has_changes(xblock)
 
+    def get_subtree_changes(self, xblock):
+        """
+        Returns whether each block of the subtree rooted at xblock has unpublished changes
+        :param xblock: the root of the subtree to check
+        :return: a dict of the changes of each block, keyed by (block_type, block_id)
+        """
+        store = self._verify_modulestore_support(xblock.location.course_key, 'get_subtree_changes')
+        return store.get_subtree_changes(xblock)
+
     def check_supports(self, course_key, method):
         """
         Verifies that the modulestore for a particular course supports a feature.
@@ -26,6 +26,7 @@ from mongodb_proxy import MongoProxy, autoretry_read
 from path import path
 from pytz import UTC
 from contracts import contract, new_contract
+from dogstats_wrapper import request_profile
 
 from importlib import import_module
 from opaque_keys.edx.keys import UsageKey, CourseKey, AssetKey
@@ -39,6 +40,7 @@ from xblock.fields import Scope, ScopeIds, Reference, ReferenceList, ReferenceVa
 from xblock.runtime import KvsFieldData
 
 from xmodule.assetstore import AssetMetadata, CourseAssetsFromStorage
+from xmodule.course_module import CourseSummary
 from xmodule.error_module import ErrorDescriptor
 from xmodule.errortracker import null_error_tracker, exc_info_to_str
 from xmodule.exceptions import HeartbeatFailure
@@ -775,6 +777,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             # then look in any caching subsystem (e.g. memcached)
             if self.metadata_inheritance_cache_subsystem is not None:
                 tree = self.metadata_inheritance_cache_subsystem.get(unicode(course_id), {})
+                request_profile.record('memcache', 'metadata_inheritance.hit' if tree else 'metadata_inheritance.miss')
             else:
                 logging.warning(
                     'Running MongoModuleStore without a metadata_inheritance_cache_subsystem. This is \
@@ -1012,6 +1015,34 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         )
         return [course for course in base_list if not isinstance(course, ErrorDescriptor)]
 
+    @autoretry_read()
+    def get_course_summaries(self, **kwargs):
+        """
+        Returns a list of `CourseSummary`. This accepts an optional parameter of 'org' which
+        will apply an efficient filter to only get courses with the specified ORG
+        """
+        query = {'_id.category': 'course'}
+        course_org_filter = kwargs.get('org')
+        if course_org_filter:
+            query['_id.org'] = course_org_filter
+
+        projection = {'_id': True}
+        for field in CourseSummary.course_info_fields:
+            projection['metadata.{}'.format(field)] = True
+
+        summaries = []
+        for course in self.collection.find(query, projection):
+            course_id = course['_id']
+            if course_id['org'] == 'edx' and course_id['course'] == 'templates':  # TODO kill this
+                continue
+            course_key = self.make_course_key(course_id['org'], course_id['course'], course_id['name'])
+            metadata = course.get('metadata', {})
+            course_info = {field: metadata[field] for field in CourseSummary.course_info_fields if field in metadata}
+            summaries.append(CourseSummary(
+                course_key, location=course_key.make_usage_key('course', course_id['name']), **course_info
+            ))
+        return summaries
+
     def _find_one(self, location):
         '''Look for a given location in the collection. If the item is not present, raise
         ItemNotFoundError.
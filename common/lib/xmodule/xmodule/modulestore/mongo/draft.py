@@ -658,6 +658,31 @@ class DraftModuleStore(MongoModuleStore):
         else:
             return False
 
+    def get_subtree_changes(self, xblock):
+        """
+        Check which blocks of the subtree rooted at xblock have drafts anywhere in their own subtrees,
+        in a single bottom-up pass.
+        :param xblock: the root of the subtree to check
+        :return: a dict of the `has_changes` value of each block, keyed by (block_type, block_id)
+        """
+        changes = {}
+
+        def visit(block):
+            """ Record and return the changes of block, after those of its children. """
+            block_has_changes = getattr(block, 'is_draft', False)
+            if block.has_children:
+                children = block.get_children()
+                # dangling pointers imply a change, as in has_changes
+                if len(block.children) > len(children):
+                    block_has_changes = True
+                for child in children:
+                    block_has_changes = visit(child) or block_has_changes
+            changes[(block.location.block_type, block.location.block_id)] = block_has_changes
+            return block_has_changes
+
+        visit(xblock)
+        return changes
+
     def publish(self, location, user_id, **kwargs):
         """
         Publish the subtree rooted at location to the live course and remove the drafts.
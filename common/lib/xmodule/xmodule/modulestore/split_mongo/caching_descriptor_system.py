@@ -11,11 +11,12 @@ from xmodule.library_tools import LibraryToolsService
 from xmodule.mako_module import MakoDescriptorSystem
 from xmodule.error_module import ErrorDescriptor
 from xmodule.errortracker import exc_info_to_str
-from xmodule.modulestore import BlockData
+from xmodule.modulestore import BlockData, ModuleStoreEnum
 from xmodule.modulestore.edit_info import EditInfoRuntimeMixin
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.inheritance import inheriting_field_data, InheritanceMixin
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
+from xmodule.modulestore.split_mongo.descriptor_pool import BlockBlueprint, DESCRIPTOR_POOL
 from xmodule.modulestore.split_mongo.id_manager import SplitMongoIdManager
 from xmodule.modulestore.split_mongo.definition_lazy_loader import DefinitionLazyLoader
 from xmodule.modulestore.split_mongo.split_mongo_kvs import SplitMongoKVS
@@ -202,18 +203,23 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
             block_id=block_key.id,
         )
 
-        converted_fields = convert_fields(block_data.fields)
-        converted_defaults = convert_fields(block_data.defaults)
-        if block_key in self._parent_map:
-            parent_key = self._parent_map[block_key]
-            parent = course_key.make_usage_key(parent_key.type, parent_key.id)
-        else:
-            parent = None
+        pool_key = self._descriptor_pool_key(course_key, block_key, block_data)
+        blueprint = DESCRIPTOR_POOL.get(pool_key) if pool_key is not None else None
+        if blueprint is None:
+            if block_key in self._parent_map:
+                parent_key = self._parent_map[block_key]
+                parent = course_key.make_usage_key(parent_key.type, parent_key.id)
+            else:
+                parent = None
+            blueprint = BlockBlueprint(convert_fields(block_data.fields), convert_fields(block_data.defaults), parent)
+            if pool_key is not None:
+                DESCRIPTOR_POOL.add(pool_key, blueprint)
+
         kvs = SplitMongoKVS(
             definition_loader,
-            converted_fields,
-            converted_defaults,
-            parent=parent,
+            blueprint.fields,
+            blueprint.defaults,
+            parent=blueprint.parent,
             field_decorator=kwargs.get('field_decorator')
         )
 
@@ -257,6 +263,22 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
 
         return module
 
+    def _descriptor_pool_key(self, course_key, block_key, block_data):
+        """
+        Return the key of `block_key` in the process-wide descriptor pool, or
+        None if the block can't be pooled.
+
+        Only blocks of the published branch are pooled, and only outside of
+        bulk operations, which may change a structure without changing its id.
+        Blocks whose definition was loaded eagerly have their content in their
+        fields, so they are pooled separately from lazily loaded ones.
+        """
+        if isinstance(block_key.id, LocalId) or course_key.branch != ModuleStoreEnum.BranchName.published:
+            return None
+        if self.modulestore._is_in_bulk_operation(course_key):  # pylint: disable=protected-access
+            return None
+        return (self.course_entry.structure['_id'], course_key, block_key, block_data.definition_loaded)
+
     def get_edited_by(self, xblock):
         """
         See :meth: cms.lib.xblock.runtime.EditInfoRuntimeMixin.get_edited_by
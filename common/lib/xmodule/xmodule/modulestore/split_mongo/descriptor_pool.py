@@ -0,0 +1,87 @@
+"""
+A per-process pool of the request-independent parts of published split blocks.
+
+Every request that loads a block of a course builds its descriptor from the
+structure json: the references in its fields are converted to usage keys and
+its parent is looked up in a parent map computed from the whole structure.
+For a given structure version the result is always the same, so it is built
+once per process and kept in a bounded pool, keyed by the structure version.
+A new published version has a new structure id, so its blocks are simply
+pooled under new keys while the stale ones age out of the pool.
+
+The descriptors themselves are not shared, as they are bound to a single
+user when modules are created from them.
+"""
+from collections import namedtuple, OrderedDict
+import threading
+
+from django.conf import settings
+
+
+# The fields and defaults of a block with their references converted to usage
+# keys, and the usage key of its parent (or None).
+BlockBlueprint = namedtuple('BlockBlueprint', 'fields defaults parent')
+
+# The size of the pool when the SPLIT_DESCRIPTOR_POOL_MAX_SIZE setting isn't set.
+DEFAULT_MAX_SIZE = 50000
+
+
+class DescriptorPool(object):
+    """
+    A thread-safe, least recently used pool of `BlockBlueprint`s, keyed by
+    (structure version, course key, block key).
+    """
+    def __init__(self, max_size=None):
+        """
+        max_size: the number of blueprints kept in the pool. If None, the
+            SPLIT_DESCRIPTOR_POOL_MAX_SIZE setting is used.
+        """
+        self._max_size = max_size
+        self._blueprints = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        """
+        The number of blueprints kept in the pool.
+        """
+        if self._max_size is not None:
+            return self._max_size
+        if hasattr(settings, 'SPLIT_DESCRIPTOR_POOL_MAX_SIZE'):
+            return settings.SPLIT_DESCRIPTOR_POOL_MAX_SIZE
+        return DEFAULT_MAX_SIZE
+
+    def get(self, key):
+        """
+        Return the blueprint stored for `key`, or None.
+        """
+        with self._lock:
+            blueprint = self._blueprints.pop(key, None)
+            if blueprint is not None:
+                self._blueprints[key] = blueprint
+            return blueprint
+
+    def add(self, key, blueprint):
+        """
+        Store `blueprint` for `key`, evicting the least recently used
+        blueprints if the pool is full.
+        """
+        max_size = self.max_size
+        with self._lock:
+            self._blueprints.pop(key, None)
+            self._blueprints[key] = blueprint
+            while len(self._blueprints) > max_size:
+                self._blueprints.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all blueprints from the pool.
+        """
+        with self._lock:
+            self._blueprints.clear()
+
+    def __len__(self):
+        return len(self._blueprints)
+
+
+DESCRIPTOR_POOL = DescriptorPool()
@@ -15,6 +15,7 @@ from time import time
 from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import
 from django.core.cache import get_cache, InvalidCacheBackendError
 import dogstats_wrapper as dog_stats_api
+from dogstats_wrapper import request_profile
 
 from contracts import check, new_contract
 from mongodb_proxy import autoretry_read, MongoProxy
@@ -97,7 +98,7 @@ class QueryTimer(object):
         self._sample_rate = sample_rate
 
     @contextmanager
-    def timer(self, metric_name, course_context):
+    def timer(self, metric_name, course_context, profile_category='mongo'):
         """
         Contextmanager which acts as a timer for the metric ``metric_name``,
         but which also yields a :class:`Tagger` object that allows the timed block
@@ -105,16 +106,22 @@ class QueryTimer(object):
         timer output. Measurements are recorded as histogram measurements in their own,
         and also as bucketed tags on the timer measurement.
 
+        The block is also timed in the current request profile, if any, under
+        ``profile_category``.
+
         Arguments:
             metric_name: The name used to aggregate all of these metrics.
             course_context: The course which the query is being made for.
+            profile_category: The request profile category of the timed code.
         """
         tagger = Tagger(self._sample_rate)
+        profile_name = metric_name
         metric_name = "{}.{}".format(self._metric_base, metric_name)
 
         start = time()
         try:
-            yield tagger
+            with request_profile.timer(profile_category, profile_name):
+                yield tagger
         finally:
             end = time()
             tags = tagger.tags
@@ -158,7 +165,7 @@ def structure_from_mongo(structure, course_context=None):
         course_context (CourseKey): For metrics gathering, the CourseKey
             for the course that this data is being processed for.
     """
-    with TIMER.timer('structure_from_mongo', course_context) as tagger:
+    with TIMER.timer('structure_from_mongo', course_context, profile_category='split') as tagger:
         tagger.measure('blocks', len(structure['blocks']))
 
         check('seq[2]', structure['root'])
@@ -186,7 +193,7 @@ def structure_to_mongo(structure, course_context=None):
     Doesn't convert 'root', since namedtuple's can be inserted
         directly into mongo.
     """
-    with TIMER.timer('structure_to_mongo', course_context) as tagger:
+    with TIMER.timer('structure_to_mongo', course_context, profile_category='split') as tagger:
         tagger.measure('blocks', len(structure['blocks']))
 
         check('BlockKey', structure['root'])
@@ -227,9 +234,13 @@ class CourseStructureCache(object):
         if self.no_cache_found:
             return None
 
-        with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
+        with TIMER.timer("CourseStructureCache.get", course_context, profile_category='memcache') as tagger:
             compressed_pickled_data = self.cache.get(key)
             tagger.tag(from_cache=str(compressed_pickled_data is not None).lower())
+            if compressed_pickled_data is None:
+                request_profile.record('memcache', 'course_structure_cache.miss')
+            else:
+                request_profile.record('memcache', 'course_structure_cache.hit')
 
             if compressed_pickled_data is None:
                 # Always log cache misses, because they are unexpected
@@ -248,7 +259,7 @@ class CourseStructureCache(object):
         if self.no_cache_found:
             return None
 
-        with TIMER.timer("CourseStructureCache.set", course_context) as tagger:
+        with TIMER.timer("CourseStructureCache.set", course_context, profile_category='memcache') as tagger:
             pickled_data = pickle.dumps(structure, pickle.HIGHEST_PROTOCOL)
             tagger.measure('uncompressed_size', len(pickled_data))
 
@@ -317,7 +328,7 @@ class MongoConnection(object):
 
         This method will use a cached version of the structure if it is availble.
         """
-        with TIMER.timer("get_structure", course_context) as tagger_get_structure:
+        with TIMER.timer("get_structure", course_context, profile_category='split') as tagger_get_structure:
             cache = CourseStructureCache()
 
             structure = cache.get(key, course_context)
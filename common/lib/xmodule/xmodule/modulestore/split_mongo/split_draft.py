@@ -86,6 +86,22 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
         else:
             raise InsufficientSpecificationError()
 
+    def get_course_summaries(self, **kwargs):
+        """
+        Returns course summaries on the Draft or Published branch depending on the branch setting.
+        """
+        branch_setting = self.get_branch_setting()
+        if branch_setting == ModuleStoreEnum.Branch.draft_preferred:
+            return super(DraftVersioningModuleStore, self).get_course_summaries(
+                ModuleStoreEnum.BranchName.draft, **kwargs
+            )
+        elif branch_setting == ModuleStoreEnum.Branch.published_only:
+            return super(DraftVersioningModuleStore, self).get_course_summaries(
+                ModuleStoreEnum.BranchName.published, **kwargs
+            )
+        else:
+            raise InsufficientSpecificationError()
+
     def _auto_publish_no_children(self, location, category, user_id, **kwargs):
         """
         Publishes item if the category is DIRECT_ONLY. This assumes another method has checked that
@@ -345,6 +361,39 @@ class DraftVersioningModuleStore(SplitMongoModuleStore, ModuleStoreDraftAndPubli
 
         return has_changes_subtree(BlockKey.from_usage_key(xblock.location))
 
+    def get_subtree_changes(self, xblock):
+        """
+        Checks which blocks of the subtree rooted at xblock have unpublished changes, comparing
+        the draft and published structures in a single bottom-up pass
+        :param xblock: the root of the subtree to check
+        :return: a dict of the `has_changes` value of each block, keyed by (block_type, block_id)
+        """
+        course_key = xblock.location.course_key
+        draft_course = self._lookup_course(course_key.for_branch(ModuleStoreEnum.BranchName.draft)).structure
+        published_course = self._lookup_course(course_key.for_branch(ModuleStoreEnum.BranchName.published)).structure
+        changes = {}
+
+        def visit(block_key):
+            """ Record and return the changes of block_key, after those of its children. """
+            if block_key in changes:
+                return changes[block_key]
+            draft_block = self._get_block_from_structure(draft_course, block_key)
+            if draft_block is None:  # temporary fix for bad pointers TNL-1141
+                changes[block_key] = True
+                return True
+            published_block = self._get_block_from_structure(published_course, block_key)
+            block_has_changes = (
+                published_block is None or
+                self._get_version(draft_block) != self._get_version(published_block)
+            )
+            for child_block_key in draft_block.fields.get('children', []):
+                block_has_changes = visit(BlockKey(*child_block_key)) or block_has_changes
+            changes[block_key] = block_has_changes
+            return block_has_changes
+
+        visit(BlockKey.from_usage_key(xblock.location))
+        return {(block_key.type, block_key.id): value for block_key, value in changes.iteritems()}
+
     def publish(self, location, user_id, blacklist=None, **kwargs):
         """
         Publishes the subtree under location from the draft branch to the published branch
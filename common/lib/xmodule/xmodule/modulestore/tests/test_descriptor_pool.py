@@ -0,0 +1,102 @@
+"""
+Tests for the split modulestore's descriptor pool.
+"""
+import unittest
+
+from mock import patch
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.split_mongo.descriptor_pool import BlockBlueprint, DescriptorPool, DESCRIPTOR_POOL
+from xmodule.modulestore.tests.utils import MixedSplitTestCase
+
+
+class TestDescriptorPool(unittest.TestCase):
+    """
+    Tests for DescriptorPool
+    """
+    def setUp(self):
+        super(TestDescriptorPool, self).setUp()
+        self.pool = DescriptorPool(max_size=2)
+
+    def _blueprint(self, name):
+        """ Return a blueprint with the given display name. """
+        return BlockBlueprint({'display_name': name}, {}, None)
+
+    def test_get_missing(self):
+        self.assertIsNone(self.pool.get('missing'))
+
+    def test_least_recently_used_is_evicted(self):
+        self.pool.add('a', self._blueprint('a'))
+        self.pool.add('b', self._blueprint('b'))
+        # using 'a' makes 'b' the least recently used blueprint
+        self.assertEqual(self.pool.get('a'), self._blueprint('a'))
+        self.pool.add('c', self._blueprint('c'))
+
+        self.assertEqual(len(self.pool), 2)
+        self.assertIsNone(self.pool.get('b'))
+        self.assertEqual(self.pool.get('a'), self._blueprint('a'))
+        self.assertEqual(self.pool.get('c'), self._blueprint('c'))
+
+    def test_clear(self):
+        self.pool.add('a', self._blueprint('a'))
+        self.pool.clear()
+        self.assertIsNone(self.pool.get('a'))
+
+    def test_max_size_from_settings(self):
+        with patch('xmodule.modulestore.split_mongo.descriptor_pool.settings') as mock_settings:
+            mock_settings.SPLIT_DESCRIPTOR_POOL_MAX_SIZE = 1
+            pool = DescriptorPool()
+            pool.add('a', self._blueprint('a'))
+            pool.add('b', self._blueprint('b'))
+
+        self.assertEqual(len(pool), 1)
+        self.assertIsNone(pool.get('a'))
+
+
+class TestSplitDescriptorPooling(MixedSplitTestCase):
+    """
+    Tests for the pooling of the published blocks loaded by the split modulestore
+    """
+    def setUp(self):
+        super(TestSplitDescriptorPooling, self).setUp()
+        DESCRIPTOR_POOL.clear()
+        self.addCleanup(DESCRIPTOR_POOL.clear)
+
+        self.course = self.store.create_course('org', 'course', 'run', self.user_id)
+        self.chapter = self.make_block('chapter', self.course, display_name='Old Name')
+        self.store.publish(self.course.location, self.user_id)
+
+    def _get_chapter(self, revision=ModuleStoreEnum.RevisionOption.published_only):
+        """ Load the chapter from the modulestore. """
+        return self.store.get_item(self.chapter.location, revision=revision)
+
+    def test_published_blocks_are_pooled(self):
+        blueprint_path = 'xmodule.modulestore.split_mongo.caching_descriptor_system.BlockBlueprint'
+        with patch(blueprint_path, wraps=BlockBlueprint) as mock_blueprint:
+            self._get_chapter()
+            built = mock_blueprint.call_count
+            chapter = self._get_chapter()
+
+        self.assertGreater(built, 0)
+        self.assertEqual(mock_blueprint.call_count, built)
+        self.assertEqual(chapter.display_name, 'Old Name')
+
+    def test_draft_blocks_are_not_pooled(self):
+        self._get_chapter(revision=ModuleStoreEnum.RevisionOption.draft_only)
+        self.assertEqual(len(DESCRIPTOR_POOL), 0)
+
+    def test_blocks_are_not_pooled_in_bulk_operations(self):
+        with self.store.bulk_operations(self.course.id):
+            self._get_chapter()
+        self.assertEqual(len(DESCRIPTOR_POOL), 0)
+
+    def test_new_published_version_is_not_served_from_pool(self):
+        old_chapter = self._get_chapter()
+
+        self.chapter.display_name = 'New Name'
+        self.chapter = self.store.update_item(self.chapter, self.user_id)
+        self.store.publish(self.chapter.location, self.user_id)
+        new_chapter = self._get_chapter()
+
+        self.assertEqual(old_chapter.display_name, 'Old Name')
+        self.assertEqual(new_chapter.display_name, 'New Name')
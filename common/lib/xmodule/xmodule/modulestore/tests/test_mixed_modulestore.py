@@ -723,6 +723,28 @@ class TestMixedModuleStore(CommonMixedModuleStoreSetup):
         self.assertFalse(self._has_changes(locations['grandparent']))
         self.assertFalse(self._has_changes(locations['parent']))
 
+    @ddt.data('draft', 'split')
+    def test_get_subtree_changes(self, default_ms):
+        """
+        Tests that get_subtree_changes() agrees with has_changes() for every block of the subtree
+        """
+        locations = self.setup_has_changes(default_ms)
+
+        # Change the child
+        child = self.store.get_item(locations['child'])
+        child.display_name = 'Changed Display Name'
+        self.store.update_item(child, self.user_id)
+
+        subtree_changes = self.store.get_subtree_changes(self.store.get_item(locations['grandparent'], depth=None))
+        for location in locations.values():
+            self.assertEqual(
+                subtree_changes[(location.block_type, location.block_id)],
+                self._has_changes(location)
+            )
+        grandparent, parent_sibling = locations['grandparent'], locations['parent_sibling']
+        self.assertTrue(subtree_changes[(grandparent.block_type, grandparent.block_id)])
+        self.assertFalse(subtree_changes[(parent_sibling.block_type, parent_sibling.block_id)])
+
     @ddt.data('draft', 'split')
     def test_has_changes_add_remove_child(self, default_ms):
         """
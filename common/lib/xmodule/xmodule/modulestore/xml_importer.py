@@ -20,8 +20,10 @@ Modulestore virtual   |          XML physical (draft, published)
              (a, a)   |  (a, a) | (x, a) | (x, x) | (x, y) | (a, x)
              (a, b)   |  (a, b) | (x, b) | (x, x) | (x, y) | (a, x)
 """
+import hashlib
 import logging
 from abc import abstractmethod
+from multiprocessing.pool import ThreadPool
 from opaque_keys.edx.locator import LibraryLocator
 import os
 import mimetypes
@@ -53,10 +55,97 @@ from xmodule.modulestore.tests.utils import LocationMixin
 log = logging.getLogger(__name__)
 
 
+# Files at or below this size are read into memory; larger ones are streamed into the contentstore
+STATIC_CONTENT_IN_MEMORY_LIMIT = 1024 * 1024
+STATIC_CONTENT_READ_CHUNK_SIZE = 256 * 1024
+# Number of threads used to generate thumbnails and save assets during import
+STATIC_CONTENT_IMPORT_WORKERS = 4
+
+
+def _hash_static_file(content_path):
+    """
+    Return the md5 hexdigest (the same digest GridFS records) of the file at content_path, reading it in chunks
+    """
+    digest = hashlib.md5()
+    with open(content_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(STATIC_CONTENT_READ_CHUNK_SIZE), ''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _stream_static_file(content_path):
+    """
+    Generator yielding the contents of content_path in chunks so the contentstore can write it piecemeal
+    """
+    with open(content_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(STATIC_CONTENT_READ_CHUNK_SIZE), ''):
+            yield chunk
+
+
+def _existing_static_assets(static_content_store, target_id):
+    """
+    Return a dict of asset path -> asset attrs for the assets already stored for target_id so that
+    unchanged files can be skipped on reimport.
+    """
+    try:
+        assets, __ = static_content_store.get_all_content_for_course(target_id)
+    except NotImplementedError:
+        return {}
+    return {asset['asset_key'].path: asset for asset in assets}
+
+
+def _is_unchanged_asset(existing, md5, displayname, mime_type, locked, import_path):
+    """
+    Whether the existing stored asset attrs match the file about to be imported
+    """
+    if existing is None or existing.get('md5') != md5:
+        return False
+    if mime_type and mime_type.split('/')[0] == 'image' and not existing.get('thumbnail_location'):
+        # a previous import failed to generate the thumbnail; try again
+        return False
+    return (
+        existing.get('displayname') == displayname and
+        existing.get('contentType') == mime_type and
+        existing.get('locked', False) == locked and
+        existing.get('import_path') == import_path
+    )
+
+
+def _save_static_content(static_content_store, content, content_path):
+    """
+    Generate the thumbnail for content (if any) and save content. Run in the import worker pool.
+    """
+    try:
+        # first let's save a thumbnail so we can get back a thumbnail location
+        if isinstance(content.data, basestring):
+            thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
+        else:
+            thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(
+                content, tempfile_path=content_path
+            )
+
+        if thumbnail_content is not None:
+            content.thumbnail_location = thumbnail_location
+
+        # then commit the content
+        static_content_store.save(content)
+    except Exception as err:  # pylint: disable=broad-except
+        log.exception(u'Error importing {0}, error={1}'.format(
+            content.import_path, err
+        ))
+
+
 def import_static_content(
         course_data_path, static_content_store,
         target_id, subpath='static', verbose=False):
+    """
+    Import the files under course_data_path/subpath into static_content_store for target_id and
+    return a dict mapping each file's path (relative to subpath) to its asset key.
 
+    Files whose content (by md5) and policy attributes match what is already stored are not rewritten.
+    Large files are streamed into the store rather than read into memory, and thumbnail generation and
+    saving are done in a thread pool.
+    """
     remap_dict = {}
 
     # now import all static assets
@@ -75,6 +164,9 @@ def import_static_content(
     mimetypes.add_type('application/octet-stream', '.srt')
     mimetypes_list = mimetypes.types_map.values()
 
+    existing_assets = _existing_static_assets(static_content_store, target_id)
+    to_save = []
+
     for dirname, _, filenames in os.walk(static_dir):
         for filename in filenames:
 
@@ -89,9 +181,9 @@ def import_static_content(
                 log.debug('importing static content %s...', content_path)
 
             try:
-                with open(content_path, 'rb') as f:
-                    data = f.read()
-            except IOError:
+                md5 = _hash_static_file(content_path)
+                file_size = os.path.getsize(content_path)
+            except (IOError, OSError):
                 if filename.startswith('._'):
                     # OS X "companion files". See
                     # http://www.diigo.com/annotated/0c936fda5da4aa1159c189cea227e174
@@ -113,29 +205,38 @@ def import_static_content(
             # Check extracted contentType in list of all valid mimetypes
             if not mime_type or mime_type not in mimetypes_list:
                 mime_type = mimetypes.guess_type(filename)[0]   # Assign guessed mimetype
-            content = StaticContent(
-                asset_key, displayname, mime_type, data,
-                import_path=fullname_with_subpath, locked=locked
-            )
-
-            # first let's save a thumbnail so we can get back a thumbnail location
-            thumbnail_content, thumbnail_location = static_content_store.generate_thumbnail(content)
-
-            if thumbnail_content is not None:
-                content.thumbnail_location = thumbnail_location
-
-            # then commit the content
-            try:
-                static_content_store.save(content)
-            except Exception as err:
-                log.exception(u'Error importing {0}, error={1}'.format(
-                    fullname_with_subpath, err
-                ))
 
             # store the remapping information which will be needed
             # to subsitute in the module data
             remap_dict[fullname_with_subpath] = asset_key
 
+            if _is_unchanged_asset(
+                    existing_assets.get(asset_key.path), md5, displayname, mime_type, locked, fullname_with_subpath
+            ):
+                if verbose:
+                    log.debug('static content %s is unchanged, skipping...', content_path)
+                continue
+
+            if file_size <= STATIC_CONTENT_IN_MEMORY_LIMIT:
+                with open(content_path, 'rb') as f:
+                    data = f.read()
+            else:
+                data = _stream_static_file(content_path)
+
+            content = StaticContent(
+                asset_key, displayname, mime_type, data,
+                import_path=fullname_with_subpath, locked=locked, length=file_size
+            )
+            to_save.append((content, content_path))
+
+    if to_save:
+        pool = ThreadPool(min(STATIC_CONTENT_IMPORT_WORKERS, len(to_save)))
+        try:
+            pool.map(lambda args: _save_static_content(static_content_store, *args), to_save)
+        finally:
+            pool.close()
+            pool.join()
+
     return remap_dict
 
 
@@ -112,14 +112,25 @@ class SequenceModule(SequenceFields, XModule):
 
         fragment = Fragment()
 
-        for child in self.get_display_items():
+        # When the runtime supports it, only the active child is rendered with the sequence.
+        # The others are rendered by the runtime's XBlock view when they are first shown.
+        lazy = getattr(self.system, 'lazy_sequences', False)
+
+        for position, child in enumerate(self.get_display_items(), start=1):
             progress = child.get_progress()
-            rendered_child = child.render(STUDENT_VIEW, context)
-            fragment.add_frag_resources(rendered_child)
+            if lazy and position != self.position:
+                content = ''
+                content_url = self.system.xblock_view_url(child, STUDENT_VIEW)
+            else:
+                rendered_child = child.render(STUDENT_VIEW, context)
+                fragment.add_frag_resources(rendered_child)
+                content = rendered_child.content
+                content_url = None
 
             titles = child.get_content_titles()
             childinfo = {
-                'content': rendered_child.content,
+                'content': content,
+                'content_url': content_url,
                 'title': "\n".join(titles),
                 'page_title': titles[0] if titles else '',
                 'progress_status': Progress.to_js_status_str(progress),
@@ -1,6 +1,7 @@
 """
 Tests that check that we ignore the appropriate files when importing courses.
 """
+import hashlib
 import unittest
 from mock import Mock
 from xmodule.modulestore.xml_importer import import_static_content
@@ -15,6 +16,7 @@ class IgnoredFilesTestCase(unittest.TestCase):
         course_id = SlashSeparatedCourseKey("edX", "tilde", "Fall_2012")
         content_store = Mock()
         content_store.generate_thumbnail.return_value = ("content", "location")
+        content_store.get_all_content_for_course.return_value = ([], 0)
         import_static_content(course_dir, content_store, course_id)
         saved_static_content = [call[0][0] for call in content_store.save.call_args_list]
         name_val = {sc.name: sc.data for sc in saved_static_content}
@@ -30,6 +32,7 @@ class IgnoredFilesTestCase(unittest.TestCase):
         course_id = SlashSeparatedCourseKey("edX", "dot-underscore", "2014_Fall")
         content_store = Mock()
         content_store.generate_thumbnail.return_value = ("content", "location")
+        content_store.get_all_content_for_course.return_value = ([], 0)
         import_static_content(course_dir, content_store, course_id)
         saved_static_content = [call[0][0] for call in content_store.save.call_args_list]
         name_val = {sc.name: sc.data for sc in saved_static_content}
@@ -39,3 +42,26 @@ class IgnoredFilesTestCase(unittest.TestCase):
         self.assertNotIn(".DS_Store", name_val)
         self.assertIn("GREEN", name_val["example.txt"])
         self.assertIn("BLUE", name_val[".example.txt"])
+
+
+class UnchangedFilesTestCase(unittest.TestCase):
+    "Tests that reimporting unchanged files does not rewrite them"
+    def test_skip_unchanged_static_files(self):
+        course_dir = DATA_DIR / "tilde"
+        course_id = SlashSeparatedCourseKey("edX", "tilde", "Fall_2012")
+        with open(course_dir / "static" / "example.txt", 'rb') as example:
+            md5 = hashlib.md5(example.read()).hexdigest()
+        content_store = Mock()
+        content_store.generate_thumbnail.return_value = (None, "location")
+        content_store.get_all_content_for_course.return_value = ([{
+            'asset_key': course_id.make_asset_key('asset', 'example.txt'),
+            'md5': md5,
+            'displayname': 'example.txt',
+            'contentType': 'text/plain',
+            'locked': False,
+            'import_path': 'example.txt',
+        }], 1)
+        remap = import_static_content(course_dir, content_store, course_id)
+        saved_names = [call[0][0].name for call in content_store.save.call_args_list]
+        self.assertNotIn("example.txt", saved_names)
+        self.assertIn("example.txt", remap)
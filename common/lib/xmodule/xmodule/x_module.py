@@ -35,6 +35,7 @@ from opaque_keys.edx.keys import UsageKey
 from opaque_keys.edx.asides import AsideUsageKeyV1, AsideDefinitionKeyV1
 from xmodule.exceptions import UndefinedContext
 import dogstats_wrapper as dog_stats_api
+from dogstats_wrapper import request_profile
 
 
 log = logging.getLogger(__name__)
@@ -1222,13 +1223,16 @@ def descriptor_global_local_resource_url(block, uri):  # pylint: disable=invalid
 class MetricsMixin(object):
     """
     Mixin for adding metric logging for render and handle methods in the DescriptorSystem and ModuleSystem.
+
+    Renders and handler calls are also timed by block type in the current request profile, if any.
     """
 
     def render(self, block, view_name, context=None):
         start_time = time.time()
         try:
             status = "success"
-            return super(MetricsMixin, self).render(block, view_name, context=context)
+            with request_profile.timer('xblock_render', block.scope_ids.block_type):
+                return super(MetricsMixin, self).render(block, view_name, context=context)
 
         except:
             status = "failure"
@@ -1265,7 +1269,8 @@ class MetricsMixin(object):
         start_time = time.time()
         try:
             status = "success"
-            return super(MetricsMixin, self).handle(block, handler_name, request, suffix=suffix)
+            with request_profile.timer('xblock_handler', block.scope_ids.block_type):
+                return super(MetricsMixin, self).handle(block, handler_name, request, suffix=suffix)
 
         except:
             status = "failure"
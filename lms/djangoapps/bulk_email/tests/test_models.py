@@ -168,6 +168,17 @@ class CourseAuthorizationTest(TestCase):
             "Course 'abc/123/doremi': Instructor Email Not Enabled"
         )
 
+    @patch.dict(settings.FEATURES, {'REQUIRE_COURSE_EMAIL_AUTH': True})
+    def test_enabled_for_courses_auth_on(self):
+        enabled_id = SlashSeparatedCourseKey('abc', '123', 'enabled')
+        disabled_id = SlashSeparatedCourseKey('abc', '123', 'disabled')
+        unauthorized_id = SlashSeparatedCourseKey('abc', '123', 'unauthorized')
+        CourseAuthorization(course_id=enabled_id, email_enabled=True).save()
+        CourseAuthorization(course_id=disabled_id, email_enabled=False).save()
+
+        enabled = CourseAuthorization.instructor_email_enabled_for_courses([enabled_id, disabled_id, unauthorized_id])
+        self.assertEqual(enabled, frozenset([enabled_id]))
+
     @patch.dict(settings.FEATURES, {'REQUIRE_COURSE_EMAIL_AUTH': False})
     def test_creation_auth_off(self):
         course_id = SlashSeparatedCourseKey('blahx', 'blah101', 'ehhhhhhh')
@@ -143,6 +143,17 @@ class GeneratedCertificate(models.Model):
 
         return None
 
+    @classmethod
+    def certificates_for_student(cls, student, course_ids):
+        """
+        This returns a dictionary mapping the IDs of the courses among
+        `course_ids` in which the student has a certificate to that certificate.
+        """
+        return {
+            certificate.course_id: certificate
+            for certificate in cls.objects.filter(user=student, course_id__in=course_ids)
+        }
+
 
 @receiver(post_save, sender=GeneratedCertificate)
 def handle_post_cert_generated(sender, instance, **kwargs):  # pylint: disable=no-self-argument, unused-argument
@@ -185,20 +196,24 @@ def certificate_status_for_student(student, course_id):
     grade for the course with the key "grade".
     '''
 
-    try:
-        generated_certificate = GeneratedCertificate.objects.get(
-            user=student, course_id=course_id)
-        d = {'status': generated_certificate.status,
-             'mode': generated_certificate.mode}
-        if generated_certificate.grade:
-            d['grade'] = generated_certificate.grade
-        if generated_certificate.status == CertificateStatuses.downloadable:
-            d['download_url'] = generated_certificate.download_url
-
-        return d
-    except GeneratedCertificate.DoesNotExist:
-        pass
-    return {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor}
+    return certificate_status(GeneratedCertificate.certificate_for_student(student, course_id))
+
+
+def certificate_status(generated_certificate):
+    '''
+    Returns the status dictionary of `certificate_status_for_student` for
+    an already loaded GeneratedCertificate, which may be None.
+    '''
+    if generated_certificate is None:
+        return {'status': CertificateStatuses.unavailable, 'mode': GeneratedCertificate.MODES.honor}
+
+    d = {'status': generated_certificate.status,
+         'mode': generated_certificate.mode}
+    if generated_certificate.grade:
+        d['grade'] = generated_certificate.grade
+    if generated_certificate.status == CertificateStatuses.downloadable:
+        d['download_url'] = generated_certificate.download_url
+    return d
 
 
 def certificate_info_for_user(user, course_id, grade, user_is_whitelisted=None):
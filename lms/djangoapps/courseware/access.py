@@ -33,7 +33,9 @@ from xmodule.util.django import get_current_request_hostname
 
 from external_auth.models import ExternalAuthMap
 from courseware.masquerade import get_masquerade_role, is_masquerading_as_student
+from courseware.partition_groups import UserPartitionGroupResolver
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from request_cache.middleware import RequestCache
 from student import auth
 from student.models import CourseEnrollmentAllowed
 from student.roles import (
@@ -471,13 +473,9 @@ def _has_group_access(descriptor, user, course_key):
         return False
 
     # look up the user's group for each partition
-    user_groups = {}
-    for partition, groups in partition_groups:
-        user_groups[partition.id] = partition.scheme.get_group_for_user(
-            course_key,
-            user,
-            partition,
-        )
+    user_groups = UserPartitionGroupResolver.for_user(user, course_key).get_groups(
+        partition for partition, _ in partition_groups
+    )
 
     # finally: check that the user has a satisfactory group assignment
     # for each partition.
@@ -776,3 +774,109 @@ def in_preview_mode():
     """
     hostname = get_current_request_hostname()
     return bool(hostname and settings.PREVIEW_DOMAIN in hostname.split('.'))
+
+
+class CourseAccessEvaluator(object):
+    """
+    Evaluates the 'load' access of a user to many blocks of the same course.
+
+    The parts of the access rules that only depend on the user and the course
+    (staff access, beta testing, masquerading, start date settings and the
+    current time) are evaluated once, and then applied to each block, with the
+    same result as `has_access(user, 'load', block, course_key)`.
+
+    Use `get_course_access_evaluator` to get the evaluator of the current
+    request.
+    """
+    def __init__(self, user, course_key):
+        if not user:
+            user = AnonymousUser()
+        if isinstance(course_key, CCXLocator):
+            course_key = course_key.to_course_locator()
+
+        self.user = user
+        self.course_key = course_key
+        self.now = datetime.now(UTC())
+        self.start_dates_disabled = (
+            settings.FEATURES['DISABLE_START_DATES'] and not is_masquerading_as_student(user, course_key)
+        )
+        self.has_staff_access = _has_access_to_course(user, 'staff', course_key)
+        self._is_beta_tester = None
+        self._in_preview_mode = None
+
+    @property
+    def is_beta_tester(self):
+        """
+        Whether the user is a beta tester of the course.
+        """
+        if self._is_beta_tester is None:
+            self._is_beta_tester = CourseBetaTesterRole(self.course_key).has_user(self.user)
+        return self._is_beta_tester
+
+    @property
+    def in_preview_mode(self):
+        """
+        Whether the current request is made in preview mode.
+        """
+        if self._in_preview_mode is None:
+            self._in_preview_mode = in_preview_mode()
+        return self._in_preview_mode
+
+    def _can_access_with_start_date(self, block):
+        """
+        Same as `_can_access_descriptor_with_start_date`.
+        """
+        if self.start_dates_disabled or block.start is None:
+            return True
+
+        effective_start = block.start
+        if block.days_early_for_beta is not None and self.is_beta_tester:
+            effective_start -= timedelta(block.days_early_for_beta)
+        return self.now > effective_start or self.in_preview_mode
+
+    def can_load(self, block):
+        """
+        Returns whether the user can load `block`, which is a descriptor or an
+        XModule of the course.
+        """
+        if isinstance(block, XModule):
+            block = block.descriptor
+
+        if isinstance(block, ErrorDescriptor):
+            return self.has_staff_access
+
+        return (
+            not block.visible_to_staff_only
+            and _has_group_access(block, self.user, self.course_key)
+            and (
+                'detached' in block._class_tags  # pylint: disable=protected-access
+                or self._can_access_with_start_date(block)
+            )
+        ) or self.has_staff_access
+
+    def filter_loadable(self, blocks):
+        """
+        Returns the list of the blocks among `blocks` that the user can load.
+        """
+        return [block for block in blocks if self.can_load(block)]
+
+
+def get_course_access_evaluator(user, course_key):
+    """
+    Returns the CourseAccessEvaluator of `user` in `course_key`, which is kept
+    for the rest of the current request (as long as the user masquerades as the
+    same role).
+
+    Outside of a request nothing would ever clear the request cache, so a new
+    evaluator is returned instead.
+    """
+    if RequestCache.get_current_request() is None or not user or user.id is None:
+        return CourseAccessEvaluator(user, course_key)
+
+    request_cache = RequestCache.get_request_cache()
+    cache_key = u"CourseAccessEvaluator.{}.{}.{}".format(
+        user.id, course_key, get_masquerade_role(user, course_key)
+    )
+    if cache_key not in request_cache.data:
+        request_cache.data[cache_key] = CourseAccessEvaluator(user, course_key)
+    return request_cache.data[cache_key]
@@ -1,15 +1,17 @@
 # Compute grades using real division, with no integer truncation
 from __future__ import division
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict
 from functools import partial
 import json
 import random
 import logging
+import threading
 
 from contextlib import contextmanager
 from django.conf import settings
 from django.db import transaction
 from django.test.client import RequestFactory
+from django.utils import timezone
 from django.core.cache import cache
 
 import dogstats_wrapper as dog_stats_api
@@ -24,10 +26,10 @@ from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from .models import StudentModule
 from .module_render import get_module_for_descriptor
+from .tasks import dispatch_grades_updated
 from submissions import api as sub_api  # installed from the edx-submissions repository
 from opaque_keys import InvalidKeyError
-from opaque_keys.edx.keys import CourseKey
-from openedx.core.djangoapps.signals.signals import GRADES_UPDATED
+from opaque_keys.edx.keys import CourseKey, UsageKey
 
 
 log = logging.getLogger("edx.courseware")
@@ -85,6 +87,8 @@ class MaxScoresCache(object):
                 },
                 60 * 60 * 24  # 1 day
             )
+            self._max_scores_cache.update(self._max_scores_updates)
+            self._max_scores_updates = {}
 
     def _remote_cache_key(self, location):
         """Convert a location to a remote cache key (add our prefixing)."""
@@ -181,68 +185,168 @@ def answer_distributions(course_key):
 
     This method will try to use a read-replica database if one is available.
     """
-    # dict: { module.module_state_key : (url_name, display_name) }
-    state_keys_to_problem_info = {}  # For caching, used by url_and_display_name
+    answer_counts = defaultdict(Counter)
+    for problem_part, counts in iter_answer_distributions(course_key):
+        answer_counts[problem_part].update(counts)
+    return answer_counts
+
+
+def iter_answer_distributions(course_key, chunk_size=None):
+    """
+    Stream the answer distributions for `course_key` one problem at a time.
+
+    Yields `((problem url_name, problem display_name, problem_id), Counter)`
+    pairs, where the Counter maps each unicode answer to the number of
+    students that submitted it. See `answer_distributions` for which
+    StudentModule rows are counted.
+
+    Rows are read from the database in `module_state_key` order, so only the
+    counters of the problem currently being read are held in memory. Rows are
+    parsed in chunks of `chunk_size` and the per-chunk counters are merged
+    here. Problem metadata comes from a single `get_items` call instead of a
+    `get_item` per problem.
 
-    def url_and_display_name(usage_key):
+    A problem part may be yielded more than once if its StudentModule rows
+    were stored under differently-formatted (e.g. run-less) usage keys.
+    """
+    if chunk_size is None:
+        chunk_size = settings.ANSWER_DISTRIBUTION_CHUNK_SIZE
+
+    problem_info = _ProblemInfoResolver(course_key)
+    rows = StudentModule.all_submitted_problems_read_only(course_key).order_by(
+        'module_state_key'
+    ).values_list('id', 'student_id', 'module_state_key', 'state').iterator()
+
+    current_state_key, current_counts = None, None
+    for chunk_counts in (_count_answers(chunk) for chunk in _chunks(rows, chunk_size)):
+        for state_key, part_counts, row_count in chunk_counts:
+            if state_key == current_state_key:
+                _merge_part_counts(current_counts[0], part_counts)
+                current_counts[1] += row_count
+                continue
+            if current_state_key is not None:
+                for item in problem_info.distributions(current_state_key, *current_counts):
+                    yield item
+            current_state_key, current_counts = state_key, [part_counts, row_count]
+
+    if current_state_key is not None:
+        for item in problem_info.distributions(current_state_key, *current_counts):
+            yield item
+
+
+class _ProblemInfoResolver(object):
+    """
+    Maps StudentModule state keys to problem (url_name, display_name) pairs
+    for a course, reading all of its problems from the modulestore up front.
+    """
+    def __init__(self, course_key):
+        self.course_key = course_key
+        self.problem_info = {
+            problem.location: (problem.url_name, problem.display_name_with_default)
+            for problem in modulestore().get_items(course_key, qualifiers={'category': 'problem'})
+        }
+
+    def url_and_display_name(self, state_key):
         """
-        For a given usage_key, return the problem's url and display_name.
-        Handle modulestore access and caching. This method ignores permissions.
+        Return the (url_name, display_name) of the problem stored under
+        `state_key`, falling back to the modulestore for problems that were
+        not part of the initial read.
 
         Raises:
-            InvalidKeyError: if the usage_key does not parse
+            InvalidKeyError: if the state_key does not parse
             ItemNotFoundError: if there is no content that corresponds
-                to this usage_key.
+                to this state_key.
+        """
+        usage_key = UsageKey.from_string(state_key).map_into_course(self.course_key)
+        if usage_key not in self.problem_info:
+            problem = modulestore().get_item(usage_key)
+            self.problem_info[usage_key] = (problem.url_name, problem.display_name_with_default)
+        return self.problem_info[usage_key]
+
+    def distributions(self, state_key, part_counts, row_count):
+        """
+        Return the `((url, display_name, problem_part_id), Counter)` pairs for
+        the merged `part_counts` of a single problem.
         """
-        problem_store = modulestore()
-        if usage_key not in state_keys_to_problem_info:
-            problem = problem_store.get_item(usage_key)
-            problem_info = (problem.url_name, problem.display_name_with_default)
-            state_keys_to_problem_info[usage_key] = problem_info
-
-        return state_keys_to_problem_info[usage_key]
-
-    # Iterate through all problems submitted for this course in no particular
-    # order, and build up our answer_counts dict that we will eventually return
-    answer_counts = defaultdict(lambda: defaultdict(int))
-    for module in StudentModule.all_submitted_problems_read_only(course_key):
         try:
-            state_dict = json.loads(module.state) if module.state else {}
+            url, display_name = self.url_and_display_name(state_key)
+        except (ItemNotFoundError, InvalidKeyError):
+            log.warning(
+                u"Answer Distribution: Item %s referenced in %d StudentModule rows in course %s not found; "
+                u"This can happen if a student answered a question that was later deleted from the course. "
+                u"These answers will be omitted from the answer distribution CSV.",
+                state_key, row_count, self.course_key
+            )
+            return []
+
+        return [
+            ((url, display_name, problem_part_id), counts)
+            for problem_part_id, counts in sorted(part_counts.items())
+        ]
+
+
+def _chunks(iterable, chunk_size):
+    """
+    Yield lists of at most `chunk_size` items from `iterable`.
+    """
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _count_answers(rows):
+    """
+    Parse a chunk of `(id, student_id, module_state_key, state)` StudentModule
+    rows ordered by `module_state_key`.
+
+    Returns a list of `(module_state_key, {problem_part_id: Counter}, row_count)`
+    tuples in the order the state keys appear in `rows`. The counters of a
+    state key split across two chunks can be merged with `_merge_part_counts`.
+    """
+    results = []
+    for module_id, _student_id, state_key, state in rows:
+        if not results or results[-1][0] != state_key:
+            results.append((state_key, defaultdict(Counter), [0]))
+        part_counts, row_count = results[-1][1], results[-1][2]
+        row_count[0] += 1
+
+        try:
+            state_dict = json.loads(state) if state else {}
             raw_answers = state_dict.get("student_answers", {})
         except ValueError:
             log.error(
-                u"Answer Distribution: Could not parse module state for StudentModule id=%s, course=%s",
-                module.id,
-                course_key,
+                u"Answer Distribution: Could not parse module state for StudentModule id=%s, module=%s",
+                module_id,
+                state_key,
             )
             continue
 
-        try:
-            url, display_name = url_and_display_name(module.module_state_key.map_into_course(course_key))
-            # Each problem part has an ID that is derived from the
-            # module.module_state_key (with some suffix appended)
-            for problem_part_id, raw_answer in raw_answers.items():
-                # Convert whatever raw answers we have (numbers, unicode, None, etc.)
-                # to be unicode values. Note that if we get a string, it's always
-                # unicode and not str -- state comes from the json decoder, and that
-                # always returns unicode for strings.
-                answer = unicode(raw_answer)
-                answer_counts[(url, display_name, problem_part_id)][answer] += 1
+        # Each problem part has an ID that is derived from the
+        # module.module_state_key (with some suffix appended)
+        for problem_part_id, raw_answer in raw_answers.items():
+            # Convert whatever raw answers we have (numbers, unicode, None, etc.)
+            # to be unicode values. Note that if we get a string, it's always
+            # unicode and not str -- state comes from the json decoder, and that
+            # always returns unicode for strings.
+            part_counts[problem_part_id][unicode(raw_answer)] += 1
 
-        except (ItemNotFoundError, InvalidKeyError):
-            msg = (
-                "Answer Distribution: Item {} referenced in StudentModule {} " +
-                "for user {} in course {} not found; " +
-                "This can happen if a student answered a question that " +
-                "was later deleted from the course. This answer will be " +
-                "omitted from the answer distribution CSV."
-            ).format(
-                module.module_state_key, module.id, module.student_id, course_key
-            )
-            log.warning(msg)
-            continue
+    return [(state_key, dict(part_counts), row_count[0]) for state_key, part_counts, row_count in results]
 
-    return answer_counts
+
+def _merge_part_counts(part_counts, other_part_counts):
+    """
+    Add the per-part answer counters of `other_part_counts` into `part_counts`.
+    """
+    for problem_part_id, counts in other_part_counts.iteritems():
+        if problem_part_id in part_counts:
+            part_counts[problem_part_id].update(counts)
+        else:
+            part_counts[problem_part_id] = counts
 
 
 @transaction.commit_manually
@@ -254,18 +358,173 @@ def grade(student, request, course, keep_raw_scores=False, field_data_cache=None
     """
     with manual_transaction():
         grade_summary = _grade(student, request, course, keep_raw_scores, field_data_cache, scores_client)
-        responses = GRADES_UPDATED.send_robust(
-            sender=None,
-            username=request.user.username,
-            grade_summary=grade_summary,
-            course_key=course.id,
-            deadline=course.end
+        _record_grades_updated(request.user.username, grade_summary, course)
+        return grade_summary
+
+
+class _GradesUpdatedQueue(threading.local):
+    """
+    Per-thread state of `deferred_grades_updated`.
+    """
+    def __init__(self):
+        super(_GradesUpdatedQueue, self).__init__()
+        self.depth = 0
+        self.events = OrderedDict()
+
+
+_GRADES_UPDATED_QUEUE = _GradesUpdatedQueue()
+
+
+@contextmanager
+def deferred_grades_updated():
+    """
+    Collect the GRADES_UPDATED events for the grades computed in this thread,
+    keeping only the latest one per user and course, and hand them to the
+    `dispatch_grades_updated` task in batches. Pending events are dispatched
+    when the outermost `deferred_grades_updated` block exits.
+    """
+    _GRADES_UPDATED_QUEUE.depth += 1
+    try:
+        yield
+    finally:
+        _GRADES_UPDATED_QUEUE.depth -= 1
+        if not _GRADES_UPDATED_QUEUE.depth:
+            _flush_grades_updated()
+
+
+def _record_grades_updated(username, grade_summary, course):
+    """
+    Record that the grade of `username` in `course` was computed. The
+    GRADES_UPDATED signal itself is sent by the `dispatch_grades_updated`
+    task, and only if the grade changed since it was last sent.
+
+    Outside of a `deferred_grades_updated` block (e.g. on the progress page),
+    the task is only started if the grade differs from the last one this
+    function handed to it.
+    """
+    event = {
+        'username': username,
+        'course_key': unicode(course.id),
+        'percent': grade_summary['percent'],
+        'grade': grade_summary['grade'],
+        'deadline': course.end.isoformat() if course.end else None,
+    }
+    if not _GRADES_UPDATED_QUEUE.depth:
+        cache_key = u"grades.GradesUpdated.{}.{}".format(username, event['course_key'])
+        dispatched = (
+            event['percent'],
+            event['grade'],
+            course.end is not None and course.end < timezone.now(),
         )
+        if cache.get(cache_key) != dispatched:
+            cache.set(cache_key, dispatched, 60 * 60 * 24)  # 1 day
+            dispatch_grades_updated.delay([event])
+        return
 
-        for receiver, response in responses:
-            log.info('Signal fired when student grade is calculated. Receiver: %s. Response: %s', receiver, response)
+    _GRADES_UPDATED_QUEUE.events[(username, event['course_key'])] = event
+    if len(_GRADES_UPDATED_QUEUE.events) >= settings.GRADES_UPDATED_BATCH_SIZE:
+        _flush_grades_updated()
 
-        return grade_summary
+
+def _flush_grades_updated():
+    """
+    Dispatch the pending GRADES_UPDATED events in batches.
+    """
+    events, _GRADES_UPDATED_QUEUE.events = _GRADES_UPDATED_QUEUE.events.values(), OrderedDict()
+    batch_size = settings.GRADES_UPDATED_BATCH_SIZE
+    for index in xrange(0, len(events), batch_size):
+        dispatch_grades_updated.delay(events[index:index + batch_size])
+
+
+class _GradingPass(object):
+    """
+    State shared by `grade` and `progress_summary` while scoring one student
+    in one course.
+
+    The progress page computes both the progress summary and the grade of the
+    same student with the same `FieldDataCache`. Sharing a pass between the
+    two means the submissions scores and max scores are fetched once, and
+    every module is created and scored only once, whichever of the two gets
+    to it first.
+    """
+    def __init__(self, student, course, field_data_cache, scores_client):
+        self.student = student
+        self.course = course
+        self.field_data_cache = field_data_cache
+        self.scores_client = scores_client
+
+        # Dict of item_ids -> (earned, possible) point tuples. This *only* grabs
+        # scores that were registered with the submissions API, which for the moment
+        # means only openassessment (edx-ora2)
+        self.submissions_scores = sub_api.get_scores(
+            course.id.to_deprecated_string(), anonymous_id_for_user(student, course.id)
+        )
+        self.max_scores_cache = MaxScoresCache.create_for_course(course)
+        # For the moment, we have to get scorable_locations from field_data_cache
+        # and not from scores_client, because scores_client is ignorant of things
+        # in the submissions API. As a further refactoring step, submissions should
+        # be hidden behind the ScoresClient.
+        self.max_scores_cache.fetch_from_remote(field_data_cache.scorable_locations)
+
+        self._modules = {}
+        self._scores = {}
+
+    @classmethod
+    def for_request(cls, request, student, course, field_data_cache=None, scores_client=None):
+        """
+        Return the grading pass of `student` in `course` for `request`.
+
+        A pass is only shared between calls that use the same
+        `field_data_cache`, so that scores are never read from a stale cache.
+        Only the latest pass is kept on the request, which bounds memory when
+        a single request is used to grade many students.
+        """
+        grading_pass = getattr(request, '_grading_pass', None)
+        if (
+                field_data_cache is not None and
+                grading_pass is not None and
+                grading_pass.field_data_cache is field_data_cache and
+                grading_pass.student.id == student.id and
+                grading_pass.course.id == course.id
+        ):
+            return grading_pass
+
+        if field_data_cache is None:
+            with manual_transaction():
+                field_data_cache = field_data_cache_for_grading(course, student)
+        if scores_client is None:
+            scores_client = ScoresClient.from_field_data_cache(field_data_cache)
+
+        grading_pass = cls(student, course, field_data_cache, scores_client)
+        setattr(request, '_grading_pass', grading_pass)
+        return grading_pass
+
+    def module_creator(self, create_module):
+        """
+        Wrap `create_module` so that each module is only created once.
+        """
+        def _create_module(descriptor):
+            """Return the (possibly already created) module for `descriptor`."""
+            if descriptor.location not in self._modules:
+                self._modules[descriptor.location] = create_module(descriptor)
+            return self._modules[descriptor.location]
+        return _create_module
+
+    def get_score(self, descriptor, module_creator):
+        """
+        Return the (correct, total) score of the student on `descriptor`, as
+        returned by `get_score`.
+        """
+        if descriptor.location not in self._scores:
+            self._scores[descriptor.location] = get_score(
+                self.student,
+                descriptor,
+                module_creator,
+                self.scores_client,
+                self.submissions_scores,
+                self.max_scores_cache,
+            )
+        return self._scores[descriptor.location]
 
 
 def _grade(student, request, course, keep_raw_scores, field_data_cache, scores_client):
@@ -289,22 +548,8 @@ def _grade(student, request, course, keep_raw_scores, field_data_cache, scores_c
 
     More information on the format is in the docstring for CourseGrader.
     """
-    if field_data_cache is None:
-        with manual_transaction():
-            field_data_cache = field_data_cache_for_grading(course, student)
-    if scores_client is None:
-        scores_client = ScoresClient.from_field_data_cache(field_data_cache)
-
-    # Dict of item_ids -> (earned, possible) point tuples. This *only* grabs
-    # scores that were registered with the submissions API, which for the moment
-    # means only openassessment (edx-ora2)
-    submissions_scores = sub_api.get_scores(course.id.to_deprecated_string(), anonymous_id_for_user(student, course.id))
-    max_scores_cache = MaxScoresCache.create_for_course(course)
-    # For the moment, we have to get scorable_locations from field_data_cache
-    # and not from scores_client, because scores_client is ignorant of things
-    # in the submissions API. As a further refactoring step, submissions should
-    # be hidden behind the ScoresClient.
-    max_scores_cache.fetch_from_remote(field_data_cache.scorable_locations)
+    grading_pass = _GradingPass.for_request(request, student, course, field_data_cache, scores_client)
+    field_data_cache = grading_pass.field_data_cache
 
     grading_context = course.grading_context
     raw_scores = []
@@ -330,13 +575,13 @@ def _grade(student, request, course, keep_raw_scores, field_data_cache, scores_c
             # API. If scores exist, we have to calculate grades for this section.
             if not should_grade_section:
                 should_grade_section = any(
-                    descriptor.location.to_deprecated_string() in submissions_scores
+                    descriptor.location.to_deprecated_string() in grading_pass.submissions_scores
                     for descriptor in section['xmoduledescriptors']
                 )
 
             if not should_grade_section:
                 should_grade_section = any(
-                    descriptor.location in scores_client
+                    descriptor.location in grading_pass.scores_client
                     for descriptor in section['xmoduledescriptors']
                 )
 
@@ -345,6 +590,7 @@ def _grade(student, request, course, keep_raw_scores, field_data_cache, scores_c
             if should_grade_section:
                 scores = []
 
+                @grading_pass.module_creator
                 def create_module(descriptor):
                     '''creates an XModule instance given a descriptor'''
                     # TODO: We need the request to pass into here. If we could forego that, our arguments
@@ -355,14 +601,7 @@ def _grade(student, request, course, keep_raw_scores, field_data_cache, scores_c
 
                 descendants = yield_dynamic_descriptor_descendants(section_descriptor, student.id, create_module)
                 for module_descriptor in descendants:
-                    (correct, total) = get_score(
-                        student,
-                        module_descriptor,
-                        create_module,
-                        scores_client,
-                        submissions_scores,
-                        max_scores_cache,
-                    )
+                    (correct, total) = grading_pass.get_score(module_descriptor, create_module)
                     if correct is None and total is None:
                         continue
 
@@ -420,7 +659,7 @@ def _grade(student, request, course, keep_raw_scores, field_data_cache, scores_c
         # so grader can be double-checked
         grade_summary['raw_scores'] = raw_scores
 
-    max_scores_cache.push_to_remote()
+    grading_pass.max_scores_cache.push_to_remote()
 
     return grade_summary
 
@@ -482,27 +721,16 @@ def _progress_summary(student, request, course, field_data_cache=None, scores_cl
 
     """
     with manual_transaction():
-        if field_data_cache is None:
-            field_data_cache = field_data_cache_for_grading(course, student)
-        if scores_client is None:
-            scores_client = ScoresClient.from_field_data_cache(field_data_cache)
+        grading_pass = _GradingPass.for_request(request, student, course, field_data_cache, scores_client)
 
         course_module = get_module_for_descriptor(
-            student, request, course, field_data_cache, course.id, course=course
+            student, request, course, grading_pass.field_data_cache, course.id, course=course
         )
         if not course_module:
             return None
 
         course_module = getattr(course_module, '_x_module', course_module)
 
-    submissions_scores = sub_api.get_scores(course.id.to_deprecated_string(), anonymous_id_for_user(student, course.id))
-    max_scores_cache = MaxScoresCache.create_for_course(course)
-    # For the moment, we have to get scorable_locations from field_data_cache
-    # and not from scores_client, because scores_client is ignorant of things
-    # in the submissions API. As a further refactoring step, submissions should
-    # be hidden behind the ScoresClient.
-    max_scores_cache.fetch_from_remote(field_data_cache.scorable_locations)
-
     chapters = []
     # Don't include chapters that aren't displayable (e.g. due to error)
     for chapter_module in course_module.get_display_items():
@@ -521,20 +749,12 @@ def _progress_summary(student, request, course, field_data_cache=None, scores_cl
                 graded = section_module.graded
                 scores = []
 
-                module_creator = section_module.xmodule_runtime.get_module
+                module_creator = grading_pass.module_creator(section_module.xmodule_runtime.get_module)
 
                 for module_descriptor in yield_dynamic_descriptor_descendants(
                         section_module, student.id, module_creator
                 ):
-                    course_id = course.id
-                    (correct, total) = get_score(
-                        student,
-                        module_descriptor,
-                        module_creator,
-                        scores_client,
-                        submissions_scores,
-                        max_scores_cache,
-                    )
+                    (correct, total) = grading_pass.get_score(module_descriptor, module_creator)
                     if correct is None and total is None:
                         continue
 
@@ -570,7 +790,7 @@ def _progress_summary(student, request, course, field_data_cache=None, scores_cl
             'sections': sections
         })
 
-    max_scores_cache.push_to_remote()
+    grading_pass.max_scores_cache.push_to_remote()
 
     return chapters
 
@@ -705,6 +925,15 @@ def iterate_grades_for(course_or_id, students, keep_raw_scores=False):
     # grading that student.
     request = RequestFactory().get('/')
 
+    with deferred_grades_updated():
+        for student, gradeset, err_msg in _iterate_grades_for(course, students, request, keep_raw_scores):
+            yield student, gradeset, err_msg
+
+
+def _iterate_grades_for(course, students, request, keep_raw_scores):
+    """
+    Unwrapped version of "iterate_grades_for"
+    """
     for student in students:
         with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course.id)]):
             try:
@@ -22,10 +22,13 @@ DjangoOrmFieldCache: A base-class for single-row-per-field caches.
 """
 
 import json
+import threading
 from abc import abstractmethod, ABCMeta
-from collections import defaultdict, namedtuple
+from collections import defaultdict, namedtuple, OrderedDict
+from contextlib import contextmanager
 from .models import (
     StudentModule,
+    StudentModuleHistory,
     XModuleUserStateSummaryField,
     XModuleStudentPrefsField,
     XModuleStudentInfoField
@@ -55,6 +58,59 @@ class InvalidWriteError(Exception):
     """
 
 
+class _DeferredWrites(threading.local):
+    """
+    Per-thread state of `deferred_user_state_writes`.
+    """
+    def __init__(self):
+        super(_DeferredWrites, self).__init__()
+        self.depth = 0
+        self.caches = []
+
+
+_DEFERRED_WRITES = _DeferredWrites()
+
+
+@contextmanager
+def deferred_user_state_writes():
+    """
+    Defer Scope.user_state writes made through any :class:`UserStateCache` in
+    this thread until the outermost `deferred_user_state_writes` block exits.
+
+    All of the field writes to a block are coalesced into a single update of
+    its StudentModule, each cache writes all of its blocks with a single
+    `DjangoXBlockUserStateClient.set_many` call, and the StudentModuleHistory
+    rows created in the meantime are inserted in bulk.
+
+    Code that reads the stored state, or that needs to handle the errors of
+    the writes, can write the deferred state earlier with
+    :func:`flush_deferred_user_state_writes`.
+    """
+    _DEFERRED_WRITES.depth += 1
+    try:
+        with StudentModuleHistory.batched_writes():
+            try:
+                yield
+            finally:
+                if _DEFERRED_WRITES.depth == 1:
+                    flush_deferred_user_state_writes()
+    finally:
+        _DEFERRED_WRITES.depth -= 1
+
+
+def flush_deferred_user_state_writes():
+    """
+    Write the Scope.user_state writes deferred so far in this thread by
+    `deferred_user_state_writes`. Later writes are still deferred.
+
+    Raises:
+        KeyValueMultiSaveError: if the state of a user can't be saved
+    """
+    caches, _DEFERRED_WRITES.caches = _DEFERRED_WRITES.caches, []
+    for cache in caches:
+        cache.flush()
+
+
 def _all_usage_keys(descriptors, aside_types):
     """
     Return a set of all usage_ids for the `descriptors` and for
@@ -350,6 +406,7 @@ class UserStateCache(object):
     """
     def __init__(self, user, course_id):
         self._cache = defaultdict(dict)
+        self._pending_writes = defaultdict(dict)
         self.course_id = course_id
         self.user = user
         self._client = DjangoXBlockUserStateClient(self.user)
@@ -392,6 +449,8 @@ class UserStateCache(object):
 
         Returns: datetime if there was a modified date, or None otherwise
         """
+        if kvs_key.block_scope_id in self._pending_writes:
+            self.flush()
         return self._client.get_mod_date(
             self.user.username,
             kvs_key.block_scope_id,
@@ -413,16 +472,41 @@ class UserStateCache(object):
 
             pending_updates[cache_key][kvs_key.field_name] = value
 
+        if not _DEFERRED_WRITES.depth:
+            try:
+                self._write(pending_updates)
+            finally:
+                self._cache.update(pending_updates)
+            return
+
+        if not self._pending_writes:
+            _DEFERRED_WRITES.caches.append(self)
+        for cache_key, field_state in pending_updates.iteritems():
+            self._pending_writes[cache_key].update(field_state)
+        self._cache.update(pending_updates)
+
+    def flush(self):
+        """
+        Write all of the field values whose writes were deferred by
+        `deferred_user_state_writes`.
+        """
+        pending_writes, self._pending_writes = self._pending_writes, defaultdict(dict)
+        if pending_writes:
+            self._write(pending_writes)
+
+    def _write(self, block_field_state):
+        """
+        Store `block_field_state`, a dict mapping usage keys to the field
+        values to update for that block.
+        """
         try:
             self._client.set_many(
                 self.user.username,
-                pending_updates
+                block_field_state
             )
         except DatabaseError:
             log.exception("Saving user state failed for %s", self.user.username)
             raise KeyValueMultiSaveError([])
-        finally:
-            self._cache.update(pending_updates)
 
     @contract(kvs_key=DjangoKeyValueStore.Key)
     def get(self, kvs_key):
@@ -460,6 +544,10 @@ class UserStateCache(object):
         if kvs_key.field_name not in field_state:
             raise KeyError(kvs_key.field_name)
 
+        if cache_key in self._pending_writes:
+            self._pending_writes[cache_key].pop(kvs_key.field_name, None)
+            if not self._pending_writes[cache_key]:
+                del self._pending_writes[cache_key]
         self._client.delete(self.user.username, cache_key, fields=[kvs_key.field_name])
         del field_state[kvs_key.field_name]
 
@@ -682,7 +770,7 @@ class FieldDataCache(object):
     A cache of django model objects needed to supply the data
     for a module and its descendants
     """
-    def __init__(self, descriptors, course_id, user, select_for_update=False, asides=None):
+    def __init__(self, descriptors, course_id, user, select_for_update=False, asides=None, lazy=False):
         """
         Find any courseware.models objects that are needed by any descriptor
         in descriptors. Attempts to minimize the number of queries to the database.
@@ -695,6 +783,12 @@ class FieldDataCache(object):
         user: The user for which to cache data
         select_for_update: Ignored
         asides: The list of aside types to load, or None to prefetch no asides.
+        lazy: If True, descriptors added to the cache are only recorded, and
+            the data of all recorded descriptors is loaded in one batch the
+            next time any field is accessed. Descriptors that are bound to a
+            user through `get_module_for_descriptor` are recorded along with
+            their children, so that callers don't have to guess how deep to
+            prefetch.
         """
         if asides is None:
             self.asides = []
@@ -721,19 +815,60 @@ class FieldDataCache(object):
             ),
         }
         self.scorable_locations = set()
+        self.lazy = lazy
+        self._loaded_locations = set()
+        self._pending_descriptors = OrderedDict()
         self.add_descriptors_to_cache(descriptors)
 
     def add_descriptors_to_cache(self, descriptors):
         """
         Add all `descriptors` to this FieldDataCache.
+
+        Descriptors whose data is already cached are skipped. If this cache
+        is lazy, the data is only loaded when a field is next accessed.
+        """
+        if not self.user.is_authenticated():
+            return
+
+        self.scorable_locations.update(desc.location for desc in descriptors if desc.has_score)
+        for descriptor in descriptors:
+            if descriptor.location not in self._loaded_locations:
+                self._pending_descriptors.setdefault(descriptor.location, descriptor)
+
+        if not self.lazy:
+            self._load_pending_descriptors()
+
+    def add_bound_descriptor(self, descriptor):
+        """
+        Record that `descriptor` is being bound to the user, so that its data
+        and its children's (which are likely to be bound next) gets loaded
+        with the next batch. Does nothing unless this cache is lazy.
         """
-        if self.user.is_authenticated():
-            self.scorable_locations.update(desc.location for desc in descriptors if desc.has_score)
-            for scope, fields in self._fields_to_cache(descriptors).items():
-                if scope not in self.cache:
-                    continue
+        if not self.lazy or descriptor.location in self._loaded_locations:
+            return
+
+        descriptors = [descriptor]
+        if descriptor.has_children:
+            descriptors.extend(descriptor.get_children())
+        self.add_descriptors_to_cache(descriptors)
 
-                self.cache[scope].cache_fields(fields, descriptors, self.asides)
+    def _load_pending_descriptors(self):
+        """
+        Load the data of all descriptors added to this cache since the last
+        load, with one query per scope.
+        """
+        if not self._pending_descriptors:
+            return
+
+        descriptors = self._pending_descriptors.values()
+        self._pending_descriptors = OrderedDict()
+        self._loaded_locations.update(descriptor.location for descriptor in descriptors)
+
+        for scope, fields in self._fields_to_cache(descriptors).items():
+            if scope not in self.cache:
+                continue
+
+            self.cache[scope].cache_fields(fields, descriptors, self.asides)
 
     def add_descriptor_descendents(self, descriptor, depth=None, descriptor_filter=lambda descriptor: True):
         """
@@ -778,7 +913,7 @@ class FieldDataCache(object):
     @classmethod
     def cache_for_descriptor_descendents(cls, course_id, user, descriptor, depth=None,
                                          descriptor_filter=lambda descriptor: True,
-                                         select_for_update=False, asides=None):
+                                         select_for_update=False, asides=None, lazy=False):
         """
         course_id: the course in the context of which we want StudentModules.
         user: the django user for whom to load modules.
@@ -788,8 +923,9 @@ class FieldDataCache(object):
         descriptor_filter is a function that accepts a descriptor and return whether the field data
             should be cached
         select_for_update: Ignored
+        lazy: whether to create a lazy FieldDataCache (see `FieldDataCache.__init__`)
         """
-        cache = FieldDataCache([], course_id, user, select_for_update, asides=asides)
+        cache = FieldDataCache([], course_id, user, select_for_update, asides=asides, lazy=lazy)
         cache.add_descriptor_descendents(descriptor, depth, descriptor_filter)
         return cache
 
@@ -814,6 +950,7 @@ class FieldDataCache(object):
         Returns: The found value
         Raises: KeyError if key isn't found in the cache
         """
+        self._load_pending_descriptors()
 
         if key.scope.user == UserScope.ONE and not self.user.is_anonymous():
             # If we're getting user data, we expect that the key matches the
@@ -835,6 +972,7 @@ class FieldDataCache(object):
             kv_dict (dict): dict mapping from `DjangoKeyValueStore.Key`s to field values
         Raises: DatabaseError if any fields fail to save
         """
+        self._load_pending_descriptors()
 
         saved_fields = []
         by_scope = defaultdict(dict)
@@ -870,6 +1008,7 @@ class FieldDataCache(object):
 
         Raises: KeyError if key isn't found in the cache
         """
+        self._load_pending_descriptors()
 
         if key.scope.user == UserScope.ONE and not self.user.is_anonymous():
             # If we're getting user data, we expect that the key matches the
@@ -891,6 +1030,7 @@ class FieldDataCache(object):
 
         Returns: bool
         """
+        self._load_pending_descriptors()
 
         if key.scope.user == UserScope.ONE and not self.user.is_anonymous():
             # If we're getting user data, we expect that the key matches the
@@ -912,6 +1052,8 @@ class FieldDataCache(object):
 
         Returns: datetime if there was a modified date, or None otherwise
         """
+        self._load_pending_descriptors()
+
         if key.scope.user == UserScope.ONE and not self.user.is_anonymous():
             # If we're getting user data, we expect that the key matches the
             # user we were constructed for.
@@ -923,6 +1065,7 @@ class FieldDataCache(object):
         return self.cache[key.scope].last_modified(key)
 
     def __len__(self):
+        self._load_pending_descriptors()
         return sum(len(cache) for cache in self.cache.values())
 
 
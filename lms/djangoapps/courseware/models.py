@@ -14,6 +14,8 @@ ASSUMPTIONS: modules have unique IDs, even across different module_types
 """
 import logging
 import itertools
+import threading
+from contextlib import contextmanager
 
 from django.contrib.auth.models import User
 from django.conf import settings
@@ -151,6 +153,9 @@ class StudentModuleHistory(models.Model):
     explode in size."""
     HISTORY_SAVING_TYPES = {'problem'}
 
+    # Per-thread buffer of unsaved history entries, used by `batched_writes`
+    _batch = threading.local()
+
     class Meta(object):  # pylint: disable=missing-docstring
         get_latest_by = "created"
 
@@ -177,7 +182,31 @@ class StudentModuleHistory(models.Model):
                                                  state=instance.state,
                                                  grade=instance.grade,
                                                  max_grade=instance.max_grade)
-            history_entry.save()
+            pending = getattr(StudentModuleHistory._batch, 'entries', None)
+            if pending is None:
+                history_entry.save()
+            else:
+                pending.append(history_entry)
+
+    @classmethod
+    @contextmanager
+    def batched_writes(cls):
+        """
+        Buffer the history entries created by StudentModule saves in this
+        thread, and write them with a single bulk insert when the outermost
+        `batched_writes` block exits.
+        """
+        if getattr(cls._batch, 'entries', None) is not None:
+            yield
+            return
+
+        cls._batch.entries = []
+        try:
+            yield
+        finally:
+            entries, cls._batch.entries = cls._batch.entries, None
+            if entries:
+                cls.objects.bulk_create(entries)
 
 
 class XBlockFieldBase(models.Model):
@@ -279,6 +308,48 @@ class OfflineComputedGradeLog(models.Model):
         return "[OCGLog] %s: %s" % (self.course_id.to_deprecated_string(), self.created)  # pylint: disable=no-member
 
 
+class DispatchedGrade(models.Model):
+    """
+    The last grade of a user in a course for which the GRADES_UPDATED signal
+    was sent. Grades that haven't changed since are not dispatched again.
+    """
+    user = models.ForeignKey(User, db_index=True)
+    course_id = CourseKeyField(max_length=255, db_index=True)
+
+    percent = models.FloatField()
+    letter_grade = models.CharField(max_length=255, null=True, blank=True)
+
+    modified = models.DateTimeField(auto_now=True)
+
+    class Meta(object):  # pylint: disable=missing-docstring
+        unique_together = (('user', 'course_id'), )
+
+    def __unicode__(self):
+        return "[DispatchedGrade] %s: %s = %s" % (self.user, self.course_id, self.percent)
+
+
+class PendingScoreEvent(models.Model):
+    """
+    A score change recorded by the courseware, whose side effects (the
+    SCORE_CHANGED signal and the fulfillment of content milestones) haven't been
+    processed yet. The events of each user in a course are processed in order,
+    in the background, by `courseware.tasks.process_score_events`.
+    """
+    user = models.ForeignKey(User)
+    course_id = CourseKeyField(max_length=255)
+    usage_key = LocationKeyField(max_length=255)
+
+    points_earned = models.FloatField(null=True, blank=True)
+    points_possible = models.FloatField(null=True, blank=True)
+
+    created = models.DateTimeField(auto_now_add=True)
+
+    def __unicode__(self):
+        return "[PendingScoreEvent] %s: %s = %s/%s" % (
+            self.user_id, self.usage_key, self.points_earned, self.points_possible  # pylint: disable=no-member
+        )
+
+
 class StudentFieldOverride(TimeStampedModel):
     """
     Holds the value of a specific field overriden for a student.  This is used
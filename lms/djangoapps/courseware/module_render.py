@@ -21,12 +21,12 @@ from django.core.context_processors import csrf
 from django.core.exceptions import PermissionDenied
 from django.core.urlresolvers import reverse
 from django.http import Http404, HttpResponse
-from django.test.client import RequestFactory
 from django.views.decorators.csrf import csrf_exempt
 
 import newrelic.agent
 
 from capa.xqueue_interface import XQueueInterface
+from ccx_keys.locator import CCXLocator
 from courseware.access import has_access, get_user_role
 from courseware.masquerade import (
     MasqueradingKeyValueStore,
@@ -34,12 +34,15 @@ from courseware.masquerade import (
     is_masquerading_as_specific_student,
     setup_masquerade,
 )
-from courseware.model_data import DjangoKeyValueStore, FieldDataCache, set_score
-from courseware.models import SCORE_CHANGED
-from courseware.entrance_exams import (
-    get_entrance_exam_score,
-    user_must_complete_entrance_exam
+from courseware.model_data import (
+    DjangoKeyValueStore,
+    FieldDataCache,
+    deferred_user_state_writes,
+    flush_deferred_user_state_writes,
+    set_score,
 )
+from courseware.entrance_exams import user_must_complete_entrance_exam
+from courseware.tasks import record_score_event
 from edxmako.shortcuts import render_to_string
 from eventtracking import tracker
 from lms.djangoapps.lms_xblock.field_data import LmsFieldData
@@ -294,7 +297,8 @@ def get_module_for_descriptor(user, request, descriptor, field_data_cache, cours
         user_location=user_location,
         request_token=xblock_request_token(request),
         disable_staff_debug_info=disable_staff_debug_info,
-        course=course
+        course=course,
+        field_data_cache=field_data_cache,
     )
 
 
@@ -303,7 +307,7 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
                                descriptor, course_id, track_function, xqueue_callback_url_prefix,
                                request_token, position=None, wrap_xmodule_display=True, grade_bucket_type=None,
                                static_asset_path='', user_location=None, disable_staff_debug_info=False,
-                               course=None):
+                               course=None, field_data_cache=None):
     """
     Helper function that returns a module system and student_data bound to a user and a descriptor.
 
@@ -319,6 +323,8 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
     Arguments:
         see arguments for get_module()
         request_token (str): A token unique to the request use by xblock initialization
+        field_data_cache (FieldDataCache): The cache `student_data` reads from, if any. Descriptors
+            bound by the returned system are added to it when it is lazy.
 
     Returns:
         (LmsModuleSystem, KvsFieldData):  (module system, student_data) bound to, primarily, the user and descriptor
@@ -397,43 +403,18 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
             static_asset_path=static_asset_path,
             user_location=user_location,
             request_token=request_token,
-            course=course
+            course=course,
+            field_data_cache=field_data_cache,
         )
 
-    def _fulfill_content_milestones(user, course_key, content_key):
-        """
-        Internal helper to handle milestone fulfillments for the specified content module
-        """
-        # Fulfillment Use Case: Entrance Exam
-        # If this module is part of an entrance exam, we'll need to see if the student
-        # has reached the point at which they can collect the associated milestone
-        if settings.FEATURES.get('ENTRANCE_EXAMS', False):
-            course = modulestore().get_course(course_key)
-            content = modulestore().get_item(content_key)
-            entrance_exam_enabled = getattr(course, 'entrance_exam_enabled', False)
-            in_entrance_exam = getattr(content, 'in_entrance_exam', False)
-            if entrance_exam_enabled and in_entrance_exam:
-                # We don't have access to the true request object in this context, but we can use a mock
-                request = RequestFactory().request()
-                request.user = user
-                exam_pct = get_entrance_exam_score(request, course)
-                if exam_pct >= course.entrance_exam_minimum_score_pct:
-                    exam_key = UsageKey.from_string(course.entrance_exam_id)
-                    relationship_types = milestones_helpers.get_milestone_relationship_types()
-                    content_milestones = milestones_helpers.get_course_content_milestones(
-                        course_key,
-                        exam_key,
-                        relationship=relationship_types['FULFILLS']
-                    )
-                    # Add each milestone to the user's set...
-                    user = {'id': request.user.id}
-                    for milestone in content_milestones:
-                        milestones_helpers.add_user_milestone(user, milestone)
-
     def handle_grade_event(block, event_type, event):  # pylint: disable=unused-argument
         """
         Manages the workflow for recording and updating of student module grade state
         """
+        # The score and the receivers of its change read the stored state, so
+        # write the state deferred by the handler first
+        flush_deferred_user_state_writes()
+
         user_id = event.get('user_id', user.id)
 
         grade = event.get('value')
@@ -460,23 +441,14 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
 
         dog_stats_api.increment("lms.courseware.question_answered", tags=tags)
 
-        # Cycle through the milestone fulfillment scenarios to see if any are now applicable
-        # thanks to the updated grading information that was just submitted
-        _fulfill_content_milestones(
-            user,
+        # The milestones fulfilled thanks to the updated grading information, and
+        # the listeners waiting for score change events, are handled in the background.
+        record_score_event(
+            user_id,
             course_id,
             descriptor.location,
-        )
-
-        # Send a signal out to any listeners who are waiting for score change
-        # events.
-        SCORE_CHANGED.send(
-            sender=None,
-            points_possible=event['max_value'],
             points_earned=event['value'],
-            user_id=user_id,
-            course_id=unicode(course_id),
-            usage_id=unicode(descriptor.location)
+            points_possible=event['max_value'],
         )
 
     def publish(block, event_type, event):
@@ -549,9 +521,12 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
     # Build a list of wrapping functions that will be applied in order
     # to the Fragment content coming out of the xblocks that are about to be rendered.
     block_wrappers = []
+    # Whether a wrapper makes the rendered fragments specific to the user
+    has_user_specific_wrappers = False
 
     if is_masquerading_as_specific_student(user, course_id):
         block_wrappers.append(filter_displayed_blocks)
+        has_user_specific_wrappers = True
 
     if settings.FEATURES.get("LICENSING", False):
         block_wrappers.append(wrap_with_license)
@@ -612,6 +587,7 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
             instructor_access = has_access(user, 'instructor', descriptor, course_id)
         if staff_access:
             block_wrappers.append(partial(add_staff_markup, user, instructor_access, disable_staff_debug_info))
+            has_user_specific_wrappers = True
 
     # These modules store data using the anonymous_student_id as a key.
     # To prevent loss of data, we will continue to provide old modules with
@@ -696,12 +672,28 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
             position = None
 
     system.set('position', position)
+    # sequences only render their active unit, and load the others through the xblock view endpoint
+    system.set(
+        'lazy_sequences',
+        settings.FEATURES.get('ENABLE_LAZY_SEQUENCES', False) and
+        settings.FEATURES.get('ENABLE_XBLOCK_VIEW_ENDPOINT', False)
+    )
     if settings.FEATURES.get('ENABLE_PSYCHOMETRICS') and user.is_authenticated():
         system.set(
             'psychometrics_handler',  # set callback for updating PsychometricsData
             make_psychometrics_data_update_handler(course_id, user, descriptor.location)
         )
 
+    # the views of blocks that are the same for every user can be cached, when they are wrapped
+    # in the same way for every user, and when the content isn't overridden for a CCX
+    system.set(
+        'cache_fragments',
+        settings.FEATURES.get('ENABLE_XBLOCK_FRAGMENT_CACHE', False) and
+        wrap_xmodule_display is True and
+        not has_user_specific_wrappers and
+        not isinstance(course_id, CCXLocator)
+    )
+
     system.set(u'user_is_staff', user_is_staff)
     system.set(u'user_is_admin', has_access(user, u'staff', 'global'))
     system.set(u'user_is_beta_tester', CourseBetaTesterRole(course_id).has_user(user))
@@ -722,7 +714,7 @@ def get_module_for_descriptor_internal(user, descriptor, student_data, course_id
                                        track_function, xqueue_callback_url_prefix, request_token,
                                        position=None, wrap_xmodule_display=True, grade_bucket_type=None,
                                        static_asset_path='', user_location=None, disable_staff_debug_info=False,
-                                       course=None):
+                                       course=None, field_data_cache=None):
     """
     Actually implement get_module, without requiring a request.
 
@@ -730,7 +722,11 @@ def get_module_for_descriptor_internal(user, descriptor, student_data, course_id
 
     Arguments:
         request_token (str): A unique token for this request, used to isolate xblock rendering
+        field_data_cache (FieldDataCache): The cache `student_data` reads from, if any. If it is
+            lazy, `descriptor` and its children are added to it.
     """
+    if field_data_cache is not None:
+        field_data_cache.add_bound_descriptor(descriptor)
 
     (system, student_data) = get_module_system_for_user(
         user=user,
@@ -746,7 +742,8 @@ def get_module_for_descriptor_internal(user, descriptor, student_data, course_id
         user_location=user_location,
         request_token=request_token,
         disable_staff_debug_info=disable_staff_debug_info,
-        course=course
+        course=course,
+        field_data_cache=field_data_cache,
     )
 
     descriptor.bind_for_student(
@@ -983,7 +980,9 @@ def _invoke_xblock_handler(request, course_id, usage_id, handler, suffix, course
     except InvalidKeyError:
         raise Http404
 
-    with modulestore().bulk_operations(course_key):
+    # Coalesce the user state writes made while handling the request, and
+    # write them once the handler is done (or before a grade is published).
+    with modulestore().bulk_operations(course_key), deferred_user_state_writes():
         instance, tracking_context = get_module_by_usage_id(request, course_id, usage_id, course=course)
 
         # Name the transaction so that we can view XBlock handlers separately in
@@ -998,6 +997,9 @@ def _invoke_xblock_handler(request, course_id, usage_id, handler, suffix, course
         try:
             with tracker.get_tracker().context(tracking_context_name, tracking_context):
                 resp = instance.handle(handler, req, suffix)
+            # Write the deferred state here, so that its errors are handled
+            # like those of the handler
+            flush_deferred_user_state_writes()
 
         except NoSuchHandlerError:
             log.exception("XBlock %s attempted to access missing handler %r", instance, handler)
@@ -0,0 +1,85 @@
+"""
+Request-scoped resolution of the groups a user is assigned to in a course's
+user partitions.
+
+Access checks, split_test modules and the partitions service all need a user's
+group for the same few partitions over and over while rendering a page. The
+`UserPartitionGroupResolver` loads the user's course tags (used by the random
+scheme) in one query, relies on the request-cached cohort lookups for the
+cohort scheme, and remembers each group assignment for the rest of the request.
+"""
+from request_cache.middleware import RequestCache
+from openedx.core.djangoapps.user_api.course_tag import api as course_tag_api
+
+
+class UserPartitionGroupResolver(object):
+    """
+    Resolves and memoizes a single user's group assignments in the user
+    partitions of a single course.
+    """
+    def __init__(self, user, course_key, preload=True):
+        self.user = user
+        self.course_key = course_key
+        self._groups = {}
+        self._preloaded = not preload
+
+    @classmethod
+    def for_user(cls, user, course_key):
+        """
+        Return the resolver for `user` in `course_key` for the current request.
+
+        Outside of a request (e.g. in a celery task going through many users)
+        nothing would ever clear the request cache, so a new resolver that
+        doesn't preload anything is returned instead.
+        """
+        if RequestCache.get_current_request() is None:
+            return cls(user, course_key, preload=False)
+
+        request_cache = RequestCache.get_request_cache()
+        cache_key = u"UserPartitionGroupResolver.{}.{}".format(user.id, course_key)
+        if cache_key not in request_cache.data:
+            request_cache.data[cache_key] = cls(user, course_key)
+        return request_cache.data[cache_key]
+
+    def get_group(self, user_partition, assign=True, track_function=None):
+        """
+        Return the group of `user_partition` the user is assigned to, or None.
+
+        As with the partition schemes, a group may be assigned to the user on
+        the fly if `assign` is True.
+        """
+        if user_partition.id in self._groups:
+            return self._groups[user_partition.id]
+
+        self._preload()
+        kwargs = {'track_function': track_function}
+        if not assign:
+            kwargs['assign'] = False
+        group = user_partition.scheme.get_group_for_user(self.course_key, self.user, user_partition, **kwargs)
+
+        # A missing assignment may still be made by a later call that allows
+        # assigning, so only remember it if this call could have made one.
+        if group is not None or assign:
+            self._groups[user_partition.id] = group
+        return group
+
+    def get_groups(self, user_partitions, assign=True, track_function=None):
+        """
+        Return a dict mapping the id of each of `user_partitions` to the group
+        the user is assigned to in it (or None).
+        """
+        return {
+            user_partition.id: self.get_group(user_partition, assign=assign, track_function=track_function)
+            for user_partition in user_partitions
+        }
+
+    def _preload(self):
+        """
+        Load all of the user's course tags with a single query, so that the
+        random scheme can look up the user's groups without further queries.
+        """
+        if self._preloaded:
+            return
+        self._preloaded = True
+        if self.user.is_authenticated():
+            course_tag_api.get_course_tags(self.user, self.course_key)
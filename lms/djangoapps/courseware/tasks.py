@@ -0,0 +1,305 @@
+"""
+Asynchronous tasks for the courseware app.
+"""
+import logging
+import time
+from collections import defaultdict, OrderedDict
+from datetime import timedelta
+
+from celery import task
+from dateutil.parser import parse as parse_date
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test.client import RequestFactory
+from django.utils import timezone
+from opaque_keys.edx.keys import CourseKey, UsageKey
+
+from courseware.entrance_exams import get_entrance_exam_score
+from courseware.models import DispatchedGrade, PendingScoreEvent, SCORE_CHANGED
+from openedx.core.djangoapps.signals.signals import GRADES_UPDATED
+from util import milestones_helpers
+from xmodule.modulestore.django import modulestore
+
+
+log = logging.getLogger("edx.courseware")
+
+# The pending score events are processed separately for each user and course,
+# in the order they were recorded.
+
+# The marker that a task processing the pending score events of a user in a
+# course is scheduled, and the number of seconds it outlives the delay of the
+# task, in case the task is lost.
+SCORE_EVENTS_SCHEDULED_CACHE_KEY = u'courseware.score_events.scheduled.{user_id}.{course_id}'
+SCORE_EVENTS_SCHEDULED_MARGIN = 60
+
+# The lock held by the task processing the pending score events of a user in a
+# course, so that they are processed in order.
+SCORE_EVENTS_LOCK_CACHE_KEY = u'courseware.score_events.lock.{user_id}.{course_id}'
+SCORE_EVENTS_LOCK_TIMEOUT = 10 * 60
+
+# The number of seconds after which a task stops processing the pending score
+# events and leaves the rest to a new task, well within the lock timeout.
+SCORE_EVENTS_TASK_DURATION = 5 * 60
+
+# The age in seconds of the pending score events that `sweep_score_events`
+# schedules again, as their task was lost or its worker died. It is beyond the
+# lifetime of both the scheduled marker and the lock.
+SCORE_EVENTS_SWEEP_AGE = SCORE_EVENTS_LOCK_TIMEOUT + 60
+
+
+@task()  # pylint: disable=not-callable
+def dispatch_grades_updated(events):
+    """
+    Send the GRADES_UPDATED signal for each of `events` (as recorded by
+    `courseware.grades`) whose grade changed since the signal was last sent
+    for that user and course.
+
+    The grade is also dispatched again once the course deadline has passed,
+    so that receivers can act on it.
+    """
+    events_by_course = defaultdict(list)
+    for event in events:
+        events_by_course[event['course_key']].append(event)
+
+    for course_id, course_events in events_by_course.iteritems():
+        course_key = CourseKey.from_string(course_id)
+        users = {
+            user.username: user
+            for user in User.objects.filter(username__in=[event['username'] for event in course_events])
+        }
+        dispatched_grades = {
+            dispatched_grade.user_id: dispatched_grade
+            for dispatched_grade in DispatchedGrade.objects.filter(course_id=course_key, user__in=users.values())
+        }
+
+        for event in course_events:
+            user = users.get(event['username'])
+            if user is None:
+                continue
+
+            deadline = parse_date(event['deadline']) if event['deadline'] else None
+            dispatched_grade = dispatched_grades.get(user.id)
+            if dispatched_grade is not None and not _grade_changed(dispatched_grade, event, deadline):
+                continue
+
+            responses = GRADES_UPDATED.send_robust(
+                sender=None,
+                username=user.username,
+                grade_summary={'percent': event['percent'], 'grade': event['grade']},
+                course_key=course_key,
+                deadline=deadline
+            )
+            for receiver, response in responses:
+                log.info(
+                    'Signal fired when student grade is calculated. Receiver: %s. Response: %s', receiver, response
+                )
+
+            _save_dispatched_grade(dispatched_grade, user, course_key, event)
+
+
+def _grade_changed(dispatched_grade, event, deadline):
+    """
+    Return whether the grade in `event` should be dispatched again.
+    """
+    if dispatched_grade.percent != event['percent'] or dispatched_grade.letter_grade != event['grade']:
+        return True
+    return deadline is not None and dispatched_grade.modified < deadline < timezone.now()
+
+
+def _save_dispatched_grade(dispatched_grade, user, course_key, event):
+    """
+    Remember the grade in `event` as the last one dispatched for `user`.
+    """
+    if dispatched_grade is None:
+        dispatched_grade, created = DispatchedGrade.objects.get_or_create(
+            user=user,
+            course_id=course_key,
+            defaults={'percent': event['percent'], 'letter_grade': event['grade']},
+        )
+        if created:
+            return
+
+    dispatched_grade.percent = event['percent']
+    dispatched_grade.letter_grade = event['grade']
+    dispatched_grade.save()
+
+
+def record_score_event(user_id, course_key, usage_key, points_earned, points_possible):
+    """
+    Record that the score of a user in a problem changed, and schedule the
+    processing of its side effects in the background.
+    """
+    PendingScoreEvent.objects.create(
+        user_id=user_id,
+        course_id=course_key,
+        usage_key=usage_key,
+        points_earned=points_earned,
+        points_possible=points_possible,
+    )
+    schedule_score_events(user_id, course_key)
+
+
+def _score_events_cache_key(key_format, user_id, course_id):
+    """
+    Return the `key_format` cache key of the score events of a user in a course.
+    """
+    return key_format.format(user_id=user_id, course_id=course_id)
+
+
+def schedule_score_events(user_id, course_key):
+    """
+    Schedule the processing of the pending score events of a user in a course,
+    unless it is already scheduled, so that the events recorded in the meantime
+    are processed together.
+    """
+    delay = settings.SCORE_EVENTS_DELAY_SECONDS
+    scheduled_key = _score_events_cache_key(SCORE_EVENTS_SCHEDULED_CACHE_KEY, user_id, course_key)
+    if cache.add(scheduled_key, True, delay + SCORE_EVENTS_SCHEDULED_MARGIN):
+        process_score_events.apply_async(args=(user_id, unicode(course_key)), countdown=delay)
+
+
+@task()  # pylint: disable=not-callable
+def process_score_events(user_id, course_id):
+    """
+    Process the pending score events of a user in a course in the order they
+    were recorded, in batches of SCORE_EVENTS_BATCH_SIZE: fulfill the content
+    milestones reached thanks to the new scores, and send the SCORE_CHANGED
+    signal.
+
+    Only one task processes the events of a user in a course at a time. A task
+    that can't take the lock leaves the events to the one holding it, which
+    schedules a new task if events were recorded after it was done, or if it
+    ran for longer than SCORE_EVENTS_TASK_DURATION. The lock is renewed after
+    each batch. The events left behind by lost tasks are scheduled again by
+    `sweep_score_events`.
+    """
+    course_key = CourseKey.from_string(course_id)
+    cache.delete(_score_events_cache_key(SCORE_EVENTS_SCHEDULED_CACHE_KEY, user_id, course_key))
+    lock_key = _score_events_cache_key(SCORE_EVENTS_LOCK_CACHE_KEY, user_id, course_key)
+    if not cache.add(lock_key, True, SCORE_EVENTS_LOCK_TIMEOUT):
+        return
+
+    stop_at = time.time() + SCORE_EVENTS_TASK_DURATION
+    try:
+        while _process_score_events_batch(user_id, course_key) and time.time() < stop_at:
+            cache.set(lock_key, True, SCORE_EVENTS_LOCK_TIMEOUT)
+    finally:
+        cache.delete(lock_key)
+
+    if PendingScoreEvent.objects.filter(user_id=user_id, course_id=course_key).exists():
+        schedule_score_events(user_id, course_key)
+
+
+@task(name='courseware.sweep_score_events')  # pylint: disable=not-callable
+def sweep_score_events():
+    """
+    Schedule the processing of the pending score events that are older than
+    SCORE_EVENTS_SWEEP_AGE, which were left behind by lost tasks. Meant to be
+    run periodically (see CELERYBEAT_SCHEDULE).
+    """
+    recorded_before = timezone.now() - timedelta(seconds=SCORE_EVENTS_SWEEP_AGE)
+    user_courses = PendingScoreEvent.objects.filter(
+        created__lt=recorded_before
+    ).values_list('user_id', 'course_id').order_by().distinct()
+    for user_id, course_id in user_courses:
+        # values_list returns the course ids as strings
+        schedule_score_events(user_id, CourseKey.from_string(unicode(course_id)))
+
+
+def _process_score_events_batch(user_id, course_key):
+    """
+    Process the next batch of pending score events of a user in a course, and
+    return whether there was one.
+    """
+    events = list(
+        PendingScoreEvent.objects.filter(
+            user_id=user_id, course_id=course_key
+        ).order_by('id')[:settings.SCORE_EVENTS_BATCH_SIZE]
+    )
+    if not events:
+        return False
+    for event in events:
+        event.usage_key = event.usage_key.map_into_course(event.course_id)
+
+    # Only the latest score in each problem is kept, at the position of that
+    # score, so that the scores are still handled in order.
+    latest_events = OrderedDict()
+    for event in events:
+        latest_events.pop(event.usage_key, None)
+        latest_events[event.usage_key] = event
+
+    _fulfill_content_milestones(latest_events.values())
+
+    for event in latest_events.itervalues():
+        responses = SCORE_CHANGED.send_robust(
+            sender=None,
+            points_possible=event.points_possible,
+            points_earned=event.points_earned,
+            user_id=event.user_id,
+            course_id=unicode(event.course_id),
+            usage_id=unicode(event.usage_key)
+        )
+        for receiver, response in responses:
+            if isinstance(response, Exception):
+                log.error('Score changed receiver %s failed: %s', receiver, response)
+
+    PendingScoreEvent.objects.filter(id__in=[event.id for event in events]).delete()
+    return True
+
+
+def _fulfill_content_milestones(events):
+    """
+    Handle the milestone fulfillments made possible by the scores of `events`.
+
+    Fulfillment Use Case: Entrance Exam
+    If a problem is part of an entrance exam, we'll need to see if the student
+    has reached the point at which they can collect the associated milestone.
+    This is only checked once per user and course, with all of the new scores.
+    """
+    if not settings.FEATURES.get('ENTRANCE_EXAMS', False):
+        return
+
+    store = modulestore()
+    courses = {}
+    checked = set()
+    for event in events:
+        if (event.user_id, event.course_id) in checked:
+            continue
+        if event.course_id not in courses:
+            courses[event.course_id] = store.get_course(event.course_id)
+        course = courses[event.course_id]
+        if not getattr(course, 'entrance_exam_enabled', False):
+            continue
+
+        try:
+            content = store.get_item(event.usage_key)
+            if getattr(content, 'in_entrance_exam', False):
+                checked.add((event.user_id, event.course_id))
+                _fulfill_entrance_exam_milestones(User.objects.get(id=event.user_id), course)
+        except Exception:  # pylint: disable=broad-except
+            log.exception(
+                u'Failed to fulfill the content milestones of user %s for %s', event.user_id, event.usage_key
+            )
+
+
+def _fulfill_entrance_exam_milestones(user, course):
+    """
+    Add the milestones fulfilled by the entrance exam of `course` to the user's
+    set, if the user's score in the exam is high enough.
+    """
+    # We don't have access to the true request object in this context, but we can use a mock
+    request = RequestFactory().request()
+    request.user = user
+    exam_pct = get_entrance_exam_score(request, course)
+    if exam_pct >= course.entrance_exam_minimum_score_pct:
+        exam_key = UsageKey.from_string(course.entrance_exam_id)
+        relationship_types = milestones_helpers.get_milestone_relationship_types()
+        content_milestones = milestones_helpers.get_course_content_milestones(
+            course.id,
+            exam_key,
+            relationship=relationship_types['FULFILLS']
+        )
+        # Add each milestone to the user's set...
+        for milestone in content_milestones:
+            milestones_helpers.add_user_milestone({'id': user.id}, milestone)
@@ -19,7 +19,7 @@ from xmodule.course_module import (
     CATALOG_VISIBILITY_CATALOG_AND_ABOUT, CATALOG_VISIBILITY_ABOUT,
     CATALOG_VISIBILITY_NONE
 )
-from xmodule.modulestore.tests.factories import CourseFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from util.milestones_helpers import fulfill_course_milestone
 
@@ -516,3 +516,58 @@ class CourseOverviewAccessTestCase(ModuleStoreTestCase):
         overview = CourseOverview.get_from_id(self.course_default.id)
         with self.assertRaises(ValueError):
             access.has_access(self.user, '_non_existent_action', overview)
+
+
+@ddt.ddt
+@patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+class CourseAccessEvaluatorTestCase(ModuleStoreTestCase):
+    """
+    Tests confirming that the CourseAccessEvaluator gives the same results as
+    has_access.
+    """
+
+    def setUp(self):
+        super(CourseAccessEvaluatorTestCase, self).setUp()
+
+        today = datetime.datetime.now(pytz.UTC)
+        last_week = today - datetime.timedelta(days=7)
+        next_week = today + datetime.timedelta(days=7)
+
+        self.course = CourseFactory.create(start=last_week)
+        self.blocks = [self.course] + [
+            ItemFactory.create(parent=self.course, category='chapter', **fields)
+            for fields in (
+                {'start': last_week},
+                {'start': next_week},
+                {'start': next_week, 'days_early_for_beta': 10},
+                {'start': last_week, 'visible_to_staff_only': True},
+            )
+        ]
+
+        self.user_normal = UserFactory.create()
+        self.user_beta_tester = BetaTesterFactory.create(course_key=self.course.id)
+        self.user_course_staff = StaffFactory.create(course_key=self.course.id)
+        self.user_staff = UserFactory.create(is_staff=True)
+        self.user_anonymous = AnonymousUserFactory.create()
+
+    @ddt.data('user_normal', 'user_beta_tester', 'user_course_staff', 'user_staff', 'user_anonymous')
+    def test_same_access(self, user_attr_name):
+        user = getattr(self, user_attr_name)
+        evaluator = access.CourseAccessEvaluator(user, self.course.id)
+
+        self.assertEqual(
+            evaluator.filter_loadable(self.blocks),
+            [block for block in self.blocks if access.has_access(user, 'load', block, self.course.id)]
+        )
+
+    def test_filter_loadable(self):
+        evaluator = access.CourseAccessEvaluator(self.user_beta_tester, self.course.id)
+        self.assertEqual(evaluator.filter_loadable(self.blocks), self.blocks[:2] + self.blocks[3:4])
+
+    def test_masquerading_staff(self):
+        self.user_course_staff.masquerade_settings = {
+            self.course.id: CourseMasquerade(self.course.id, role='student')
+        }
+        evaluator = access.CourseAccessEvaluator(self.user_course_staff, self.course.id)
+        self.assertFalse(evaluator.has_staff_access)
+        self.assertEqual(evaluator.filter_loadable(self.blocks), self.blocks[:2])
@@ -8,6 +8,7 @@ from mock import patch
 from nose.plugins.attrib import attr
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
+from courseware import grades
 from courseware.grades import field_data_cache_for_grading, grade, iterate_grades_for, MaxScoresCache
 from student.tests.factories import UserFactory
 from student.models import CourseEnrollment
@@ -167,6 +168,78 @@ class TestMaxScoresCache(ModuleStoreTestCase):
         self.assertEqual(max_scores_cache.num_cached_from_remote(), 1)
 
 
+class TestSharedGradingPass(ModuleStoreTestCase):
+    """
+    Test that the progress summary and the grade of a student share a single
+    grading pass.
+    """
+    def setUp(self):
+        super(TestSharedGradingPass, self).setUp()
+        self.student = UserFactory.create()
+        self.course = CourseFactory.create()
+        chapter = ItemFactory.create(category='chapter', parent=self.course)
+        sequential = ItemFactory.create(category='sequential', parent=chapter, graded=True, format='Homework')
+        for _ in xrange(3):
+            ItemFactory.create(category='problem', parent=sequential)
+
+        CourseEnrollment.enroll(self.student, self.course.id)
+        self.request = RequestFactory().get('/')
+        self.request.user = self.student
+
+    def test_problems_are_scored_once(self):
+        field_data_cache = field_data_cache_for_grading(self.course, self.student)
+        with patch('courseware.grades.get_score', wraps=grades.get_score) as mock_get_score:
+            chapters = grades.progress_summary(self.student, self.request, self.course, field_data_cache)
+            grade_summary = grade(self.student, self.request, self.course, field_data_cache=field_data_cache)
+
+        self.assertEqual(mock_get_score.call_count, 3)
+        self.assertEqual(len(chapters[0]['sections'][0]['scores']), 3)
+        self.assertEqual(grade_summary['percent'], 0.0)
+
+    def test_pass_not_shared_across_field_data_caches(self):
+        with patch('courseware.grades.get_score', wraps=grades.get_score) as mock_get_score:
+            grade(self.student, self.request, self.course)
+            grade(self.student, self.request, self.course)
+
+        self.assertEqual(mock_get_score.call_count, 6)
+
+
+class TestGradesUpdatedDispatch(ModuleStoreTestCase):
+    """
+    Test when grade() hands GRADES_UPDATED events to the dispatch task.
+    """
+    def setUp(self):
+        super(TestGradesUpdatedDispatch, self).setUp()
+        self.student = UserFactory.create()
+        self.course = CourseFactory.create()
+        CourseEnrollment.enroll(self.student, self.course.id)
+        self.request = RequestFactory().get('/')
+        self.request.user = self.student
+
+    @patch('courseware.grades.dispatch_grades_updated')
+    def test_unchanged_grade_dispatched_once(self, mock_dispatch):
+        grade(self.student, self.request, self.course)
+        grade(self.student, self.request, self.course)
+
+        self.assertEqual(mock_dispatch.delay.call_count, 1)
+
+    @patch('courseware.grades.dispatch_grades_updated')
+    def test_changed_grade_dispatched_again(self, mock_dispatch):
+        grade(self.student, self.request, self.course)
+        with patch('courseware.grades._grade', return_value={'percent': 0.5, 'grade': 'Pass'}):
+            grade(self.student, self.request, self.course)
+
+        self.assertEqual(mock_dispatch.delay.call_count, 2)
+
+    @patch('courseware.grades.dispatch_grades_updated')
+    def test_batch_dispatches_every_grade(self, mock_dispatch):
+        grade(self.student, self.request, self.course)
+        with grades.deferred_grades_updated():
+            grade(self.student, self.request, self.course)
+
+        self.assertEqual(mock_dispatch.delay.call_count, 2)
+
+
 class TestFieldDataCacheScorableLocations(ModuleStoreTestCase):
     """
     Make sure we can filter the locations we pull back student state for via
@@ -194,3 +267,4 @@ class TestFieldDataCacheScorableLocations(ModuleStoreTestCase):
         self.assertNotIn('html', block_types)
         self.assertNotIn('discussion', block_types)
         self.assertIn('problem', block_types)
+
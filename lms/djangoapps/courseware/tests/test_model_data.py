@@ -6,8 +6,14 @@ from mock import Mock, patch
 from nose.plugins.attrib import attr
 from functools import partial
 
-from courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError
-from courseware.models import StudentModule
+from courseware.model_data import (
+    DjangoKeyValueStore,
+    FieldDataCache,
+    InvalidScopeError,
+    deferred_user_state_writes,
+    flush_deferred_user_state_writes,
+)
+from courseware.models import StudentModule, StudentModuleHistory
 from courseware.models import XModuleStudentInfoField, XModuleStudentPrefsField
 
 from student.tests.factories import UserFactory
@@ -220,6 +226,62 @@ class TestStudentModuleStorage(OtherUserFailureTestMixin, TestCase):
                 self.kvs.set_many(kv_dict)
         self.assertEquals(exception_context.exception.saved_field_names, [])
 
+    def test_deferred_writes_are_coalesced(self):
+        "Test that deferred writes to the same StudentModule are stored with a single update"
+        history_count = StudentModuleHistory.objects.count()
+        with deferred_user_state_writes():
+            with self.assertNumQueries(0):
+                self.kvs.set(user_state_key('a_field'), 'new_value')
+                self.kvs.set(user_state_key('not_a_field'), 'first_value')
+                self.kvs.set(user_state_key('not_a_field'), 'second_value')
+                self.assertEquals('second_value', self.kvs.get(user_state_key('not_a_field')))
+            self.assertEquals(
+                {'b_field': 'b_value', 'a_field': 'a_value'},
+                json.loads(StudentModule.objects.all()[0].state)
+            )
+
+        self.assertEquals(
+            {'b_field': 'b_value', 'a_field': 'new_value', 'not_a_field': 'second_value'},
+            json.loads(StudentModule.objects.all()[0].state)
+        )
+        self.assertEquals(history_count + 1, StudentModuleHistory.objects.count())
+
+    def test_flush_deferred_writes(self):
+        "Test that the deferred writes can be stored before the end of the block"
+        with deferred_user_state_writes():
+            self.kvs.set(user_state_key('a_field'), 'new_value')
+            flush_deferred_user_state_writes()
+            self.assertEquals(
+                {'b_field': 'b_value', 'a_field': 'new_value'},
+                json.loads(StudentModule.objects.all()[0].state)
+            )
+
+            # Later writes are deferred again
+            with self.assertNumQueries(0):
+                self.kvs.set(user_state_key('b_field'), 'new_value')
+
+        self.assertEquals(
+            {'b_field': 'new_value', 'a_field': 'new_value'},
+            json.loads(StudentModule.objects.all()[0].state)
+        )
+
+    def test_deferred_write_then_delete(self):
+        "Test that deleting a field with a deferred write doesn't store the field"
+        with deferred_user_state_writes():
+            self.kvs.set(user_state_key('not_a_field'), 'new_value')
+            self.kvs.delete(user_state_key('not_a_field'))
+
+        self.assertEquals(
+            {'b_field': 'b_value', 'a_field': 'a_value'},
+            json.loads(StudentModule.objects.all()[0].state)
+        )
+
+    def test_set_unchanged_field(self):
+        "Test that setting a field to its stored value doesn't update the StudentModule"
+        # Only the read of the current state is needed
+        with self.assertNumQueries(1):
+            self.kvs.set(user_state_key('a_field'), 'a_value')
+
 
 @attr('shard_1')
 class TestMissingStudentModule(TestCase):
@@ -272,6 +334,53 @@ class TestMissingStudentModule(TestCase):
             self.assertFalse(self.kvs.has(user_state_key('a_field')))
 
 
+@attr('shard_1')
+class TestLazyFieldDataCache(TestCase):
+    """Tests for a FieldDataCache that loads its data on demand"""
+    def setUp(self):
+        super(TestLazyFieldDataCache, self).setUp()
+        student_module = StudentModuleFactory(state=json.dumps({'a_field': 'a_value'}))
+        self.user = student_module.student
+        self.assertEqual(self.user.id, 1)   # check our assumption hard-coded in the key functions above.
+
+        self.descriptor = mock_descriptor([mock_field(Scope.user_state, 'a_field')])
+        self.descriptor.location = location('usage_id')
+        self.descriptor.has_children = False
+
+    def test_load_on_first_access(self):
+        "Test that a lazy cache doesn't query the database until a field is read"
+        with self.assertNumQueries(0):
+            field_data_cache = FieldDataCache([self.descriptor], course_id, self.user, lazy=True)
+        kvs = DjangoKeyValueStore(field_data_cache)
+
+        with self.assertNumQueries(1):
+            self.assertEquals('a_value', kvs.get(user_state_key('a_field')))
+        with self.assertNumQueries(0):
+            self.assertEquals('a_value', kvs.get(user_state_key('a_field')))
+
+    def test_bound_descriptors_are_loaded_once(self):
+        "Test that descriptors are only loaded again if they weren't loaded already"
+        field_data_cache = FieldDataCache([], course_id, self.user, lazy=True)
+        field_data_cache.add_bound_descriptor(self.descriptor)
+        field_data_cache.add_descriptors_to_cache([self.descriptor])
+        kvs = DjangoKeyValueStore(field_data_cache)
+
+        with self.assertNumQueries(1):
+            self.assertEquals('a_value', kvs.get(user_state_key('a_field')))
+
+        field_data_cache.add_bound_descriptor(self.descriptor)
+        field_data_cache.add_descriptors_to_cache([self.descriptor])
+        with self.assertNumQueries(0):
+            self.assertEquals('a_value', kvs.get(user_state_key('a_field')))
+
+    def test_eager_cache_ignores_bound_descriptors(self):
+        "Test that a cache that isn't lazy only loads the descriptors it is given"
+        field_data_cache = FieldDataCache([], course_id, self.user)
+        with self.assertNumQueries(0):
+            field_data_cache.add_bound_descriptor(self.descriptor)
+            self.assertEquals(0, len(field_data_cache))
+
+
 @attr('shard_1')
 class StorageTestBase(object):
     """
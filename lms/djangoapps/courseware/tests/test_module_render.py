@@ -12,6 +12,7 @@ from bson import ObjectId
 from django.http import Http404, HttpResponse
 from django.core.urlresolvers import reverse
 from django.conf import settings
+from django.core.cache import cache
 from django.test.client import RequestFactory
 from django.test.utils import override_settings
 from django.contrib.auth.models import AnonymousUser
@@ -38,6 +39,7 @@ from courseware.tests.tests import LoginEnrollmentTestCase
 from courseware.tests.test_submitting_problems import TestSubmittingProblems
 from lms.djangoapps.lms_xblock.runtime import quote_slashes
 from lms.djangoapps.lms_xblock.field_data import LmsFieldData
+from request_cache.middleware import RequestCache
 from student.models import anonymous_id_for_user
 from xmodule.modulestore.tests.django_utils import (
     TEST_DATA_MIXED_TOY_MODULESTORE,
@@ -735,6 +737,29 @@ class TestHtmlModifiers(ModuleStoreTestCase):
 
         self.assertNotIn('div class="xblock xblock-student_view xmodule_display xmodule_HtmlModule"', result_fragment.content)
 
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_XBLOCK_FRAGMENT_CACHE': True})
+    def test_fragment_cache(self):
+        cache.clear()
+        self.addCleanup(RequestCache.clear_request_cache)
+
+        def render_html():
+            """ Renders the html module for a new request of the user. """
+            request = RequestFactory().get('/')
+            request.user = self.user
+            request.session = {}
+            module = render.get_module(self.user, request, self.location, self.field_data_cache)
+            return module.render(STUDENT_VIEW).content
+
+        content = render_html()
+        with patch('xmodule.html_module.HtmlModule.get_html') as mock_get_html:
+            cached_content = render_html()
+        self.assertFalse(mock_get_html.called)
+        # Only the request token of the wrapper changes
+        request_token = PyQuery(content)('.xblock').attr('data-request-token')
+        cached_request_token = PyQuery(cached_content)('.xblock').attr('data-request-token')
+        self.assertNotEqual(request_token, cached_request_token)
+        self.assertEqual(cached_content, content.replace(request_token, cached_request_token))
+
     def test_static_link_rewrite(self):
         module = render.get_module(
             self.user,
@@ -1335,7 +1360,7 @@ class TestXmoduleRuntimeEvent(TestSubmittingProblems):
         self.assertIsNone(student_module.grade)
         self.assertIsNone(student_module.max_grade)
 
-    @patch('courseware.module_render.SCORE_CHANGED.send')
+    @patch('courseware.tasks.SCORE_CHANGED.send_robust', return_value=[])
     def test_score_change_signal(self, send_mock):
         """Test that a Django signal is generated when a score changes"""
         self.set_module_grade_using_publish(self.grade_dict)
@@ -1713,3 +1738,66 @@ class TestDisabledXBlockTypes(ModuleStoreTestCase):
                 item = ItemFactory(category=block_type, parent=course)
                 item = self.store.get_item(item.scope_ids.usage_id)
                 self.assertEqual(item.__class__.__name__, 'RawDescriptorWithMixins')
+
+
+@attr('shard_1')
+class TestLazySequence(ModuleStoreTestCase):
+    """
+    Tests that lazy sequences only render their active unit.
+    """
+    def setUp(self):
+        super(TestLazySequence, self).setUp()
+        self.user = UserFactory.create()
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+        self.request.session = {}
+        self.course = CourseFactory.create()
+        chapter = ItemFactory.create(parent=self.course, category='chapter')
+        self.sequential = ItemFactory.create(parent=chapter, category='sequential')
+        self.units = []
+        for index in range(3):
+            unit = ItemFactory.create(parent=self.sequential, category='vertical')
+            ItemFactory.create(
+                parent=unit, category='html', display_name='Text {}'.format(index),
+                data='<p>Content of unit {}</p>'.format(index)
+            )
+            self.units.append(unit)
+        self.field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+            self.course.id, self.user, self.sequential, depth=None
+        )
+
+    def render_sequence(self):
+        """
+        Renders the sequence at its second unit, and returns its tabs and contents.
+        """
+        module = render.get_module(
+            self.user, self.request, self.sequential.location, self.field_data_cache, position=2
+        )
+        doc = PyQuery(module.render(STUDENT_VIEW).content)
+        return doc('#sequence-list a'), doc('.seq_contents')
+
+    def test_eager_sequence(self):
+        tabs, contents = self.render_sequence()
+        self.assertEqual(len(tabs), 3)
+        for index, content in enumerate(contents.items()):
+            self.assertIn('Content of unit {}'.format(index), content.text())
+            self.assertIsNone(content.attr('data-content-url'))
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_XBLOCK_VIEW_ENDPOINT': True, 'ENABLE_LAZY_SEQUENCES': True})
+    def test_lazy_sequence(self):
+        tabs, contents = self.render_sequence()
+        self.assertEqual([tab.attr('title') for tab in tabs.items()], ['Text 0', 'Text 1', 'Text 2'])
+        for index, content in enumerate(contents.items()):
+            if index == 1:
+                self.assertIn('Content of unit 1', content.text())
+                self.assertIsNone(content.attr('data-content-url'))
+            else:
+                self.assertNotIn('Content of unit', content.text())
+                self.assertEqual(
+                    content.attr('data-content-url'),
+                    reverse('xblock_view', kwargs={
+                        'course_id': unicode(self.course.id),
+                        'usage_id': quote_slashes(unicode(self.units[index].location)),
+                        'view_name': STUDENT_VIEW,
+                    })
+                )
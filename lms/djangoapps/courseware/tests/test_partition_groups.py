@@ -0,0 +1,65 @@
+"""
+Tests for the request-scoped user partition group resolver.
+"""
+from django.test import TestCase
+from mock import Mock
+
+from courseware.partition_groups import UserPartitionGroupResolver
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from openedx.core.djangoapps.user_api.course_tag import api as course_tag_api
+from openedx.core.djangoapps.user_api.partition_schemes import RandomUserPartitionScheme
+from request_cache.middleware import RequestCache
+from student.tests.factories import UserFactory
+from xmodule.partitions.partitions import Group, UserPartition
+
+
+class UserPartitionGroupResolverTestCase(TestCase):
+    """
+    Test that group assignments are resolved with a bounded number of queries.
+    """
+    def setUp(self):
+        super(UserPartitionGroupResolverTestCase, self).setUp()
+        self.user = UserFactory.create()
+        self.course_key = SlashSeparatedCourseKey('test_org', 'test_course', 'test_run')
+        self.partitions = [
+            UserPartition(
+                partition_id, 'partition {}'.format(partition_id), 'description',
+                [Group(0, 'alpha'), Group(1, 'beta')],
+                scheme=RandomUserPartitionScheme,
+            )
+            for partition_id in range(3)
+        ]
+        for partition in self.partitions:
+            course_tag_api.set_course_tag(
+                self.user, self.course_key, RandomUserPartitionScheme.key_for_partition(partition), 1
+            )
+
+        RequestCache.clear_request_cache()
+        RequestCache.get_request_cache().request = Mock()
+        self.addCleanup(RequestCache.clear_request_cache)
+
+    def test_groups_are_resolved_with_one_query(self):
+        with self.assertNumQueries(1):
+            groups = UserPartitionGroupResolver.for_user(self.user, self.course_key).get_groups(self.partitions)
+        self.assertEqual({partition.id: 1 for partition in self.partitions}, {
+            partition_id: group.id for partition_id, group in groups.items()
+        })
+
+        # later lookups in the same request are memoized
+        with self.assertNumQueries(0):
+            resolver = UserPartitionGroupResolver.for_user(self.user, self.course_key)
+            self.assertEqual(1, resolver.get_group(self.partitions[0]).id)
+
+    def test_no_request(self):
+        RequestCache.clear_request_cache()
+        resolver = UserPartitionGroupResolver.for_user(self.user, self.course_key)
+        self.assertIsNot(resolver, UserPartitionGroupResolver.for_user(self.user, self.course_key))
+        self.assertEqual(1, resolver.get_group(self.partitions[0]).id)
+
+    def test_missing_assignment_without_assign(self):
+        new_partition = UserPartition(
+            10, 'new partition', 'description', [Group(0, 'alpha')], scheme=RandomUserPartitionScheme
+        )
+        resolver = UserPartitionGroupResolver.for_user(self.user, self.course_key)
+        self.assertIsNone(resolver.get_group(new_partition, assign=False))
+        self.assertEqual(0, resolver.get_group(new_partition).id)
@@ -1089,6 +1089,29 @@ class TestAnswerDistributions(TestSubmittingProblems):
             }
         )
 
+    def test_small_chunks(self):
+        # Counters for a problem whose rows span several chunks are merged
+        self.submit_question_answer('p1', {'2_1': u'Correct'})
+        self.submit_question_answer('p2', {'2_1': u'Incorrect'})
+        for problem in StudentModule.objects.filter(course_id=self.course.id, student=self.student_user):
+            problem.student_id = UserFactory.create().id
+            problem.save()
+        self.submit_question_answer('p1', {'2_1': u'Incorrect'})
+        self.submit_question_answer('p2', {'2_1': u'Incorrect'})
+
+        self.assertEqual(
+            dict(grades.iter_answer_distributions(self.course.id, chunk_size=1)),
+            {
+                ('p1', 'p1', '{}_2_1'.format(self.p1_html_id)): {
+                    'Correct': 1,
+                    'Incorrect': 1
+                },
+                ('p2', 'p2', '{}_2_1'.format(self.p2_html_id)): {
+                    'Incorrect': 2
+                }
+            }
+        )
+
     def test_other_data_types(self):
         # We'll submit one problem, and then muck with the student_answers
         # dict inside its state to try different data types (str, int, float,
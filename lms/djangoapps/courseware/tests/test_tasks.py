@@ -0,0 +1,179 @@
+"""
+Tests for the courseware celery tasks.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+from mock import Mock, patch
+
+from courseware.models import DispatchedGrade, PendingScoreEvent, SCORE_CHANGED
+from courseware.tasks import (
+    SCORE_EVENTS_LOCK_CACHE_KEY,
+    SCORE_EVENTS_SWEEP_AGE,
+    dispatch_grades_updated,
+    process_score_events,
+    record_score_event,
+    sweep_score_events,
+)
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from openedx.core.djangoapps.signals.signals import GRADES_UPDATED
+from student.tests.factories import UserFactory
+
+
+class DispatchGradesUpdatedTest(TestCase):
+    """
+    Tests that GRADES_UPDATED is only sent for grades that changed.
+    """
+    def setUp(self):
+        super(DispatchGradesUpdatedTest, self).setUp()
+        self.user = UserFactory.create()
+        self.course_key = SlashSeparatedCourseKey('test_org', 'test_course', 'test_run')
+        self.receiver = Mock()
+        GRADES_UPDATED.connect(self.receiver)
+        self.addCleanup(GRADES_UPDATED.disconnect, self.receiver)
+
+    def _event(self, percent, deadline=None):
+        """
+        Return a GRADES_UPDATED event for the test user.
+        """
+        return {
+            'username': self.user.username,
+            'course_key': unicode(self.course_key),
+            'percent': percent,
+            'grade': 'Pass' if percent >= 0.5 else None,
+            'deadline': deadline.isoformat() if deadline else None,
+        }
+
+    def test_unchanged_grade_is_not_dispatched_again(self):
+        dispatch_grades_updated([self._event(0.6)])
+        dispatch_grades_updated([self._event(0.6)])
+        self.assertEqual(self.receiver.call_count, 1)
+        _, kwargs = self.receiver.call_args
+        self.assertEqual(kwargs['grade_summary'], {'percent': 0.6, 'grade': 'Pass'})
+        self.assertEqual(kwargs['course_key'], self.course_key)
+
+    def test_changed_grade_is_dispatched(self):
+        dispatch_grades_updated([self._event(0.6)])
+        dispatch_grades_updated([self._event(0.8)])
+        self.assertEqual(self.receiver.call_count, 2)
+        self.assertEqual(DispatchedGrade.objects.get(user=self.user, course_id=self.course_key).percent, 0.8)
+
+    def test_passed_deadline_is_dispatched(self):
+        dispatch_grades_updated([self._event(0.2)])
+        DispatchedGrade.objects.filter(user=self.user).update(modified=timezone.now() - timedelta(days=2))
+        dispatch_grades_updated([self._event(0.2, deadline=timezone.now() - timedelta(days=1))])
+        self.assertEqual(self.receiver.call_count, 2)
+
+
+class ProcessScoreEventsTest(TestCase):
+    """
+    Tests the processing of the score changes in the background.
+    """
+    def setUp(self):
+        super(ProcessScoreEventsTest, self).setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = UserFactory.create()
+        self.course_key = SlashSeparatedCourseKey('test_org', 'test_course', 'test_run')
+        self.problems = [self.course_key.make_usage_key('problem', name) for name in ('p1', 'p2')]
+        self.receiver = Mock()
+        SCORE_CHANGED.connect(self.receiver)
+        self.addCleanup(SCORE_CHANGED.disconnect, self.receiver)
+
+    def _create_event(self, usage_key, points_earned, points_possible, user=None):
+        """
+        Create a pending score event for the test user, or `user`.
+        """
+        return PendingScoreEvent.objects.create(
+            user=user or self.user,
+            course_id=self.course_key,
+            usage_key=usage_key,
+            points_earned=points_earned,
+            points_possible=points_possible,
+        )
+
+    def _process(self, user=None):
+        """
+        Process the pending score events of the test user, or `user`.
+        """
+        process_score_events((user or self.user).id, unicode(self.course_key))
+
+    def _lock_key(self, user=None):
+        """
+        The key of the lock on the score events of the test user, or `user`.
+        """
+        return SCORE_EVENTS_LOCK_CACHE_KEY.format(user_id=(user or self.user).id, course_id=self.course_key)
+
+    def test_record_score_event(self):
+        with patch.object(process_score_events, 'apply_async') as mock_apply_async:
+            record_score_event(self.user.id, self.course_key, self.problems[0], 1, 2)
+            record_score_event(self.user.id, self.course_key, self.problems[1], 1, 1)
+        # The events are processed together
+        mock_apply_async.assert_called_once_with(args=(self.user.id, unicode(self.course_key)), countdown=5)
+        self.assertEqual(PendingScoreEvent.objects.count(), 2)
+
+    def test_events_are_processed_in_order(self):
+        self._create_event(self.problems[0], 1, 2)
+        self._create_event(self.problems[1], 1, 1)
+        self._create_event(self.problems[0], 2, 2)
+        self._process()
+
+        # Only the latest score of the first problem is sent
+        self.assertEqual(
+            [(kwargs['usage_id'], kwargs['points_earned']) for __, kwargs in self.receiver.call_args_list],
+            [(unicode(self.problems[1]), 1), (unicode(self.problems[0]), 2)]
+        )
+        _, kwargs = self.receiver.call_args
+        self.assertEqual(kwargs['user_id'], self.user.id)
+        self.assertEqual(kwargs['course_id'], unicode(self.course_key))
+        self.assertEqual(kwargs['points_possible'], 2)
+        self.assertFalse(PendingScoreEvent.objects.exists())
+
+    def test_events_are_left_to_the_lock_holder(self):
+        self._create_event(self.problems[0], 1, 2)
+        cache.add(self._lock_key(), True)
+        self._process()
+        self.assertFalse(self.receiver.called)
+        self.assertEqual(PendingScoreEvent.objects.count(), 1)
+
+    def test_users_are_processed_separately(self):
+        other_user = UserFactory.create()
+        self._create_event(self.problems[0], 1, 2)
+        self._create_event(self.problems[0], 2, 2, user=other_user)
+
+        # The lock on the events of a user doesn't hold back those of others
+        cache.add(self._lock_key(), True)
+        self._process(other_user)
+        self.assertEqual(self.receiver.call_count, 1)
+        self.assertEqual(self.receiver.call_args[1]['user_id'], other_user.id)
+        self.assertEqual(PendingScoreEvent.objects.get().user_id, self.user.id)
+
+    @override_settings(SCORE_EVENTS_BATCH_SIZE=1)
+    @patch('courseware.tasks.SCORE_EVENTS_TASK_DURATION', 0)
+    def test_long_processing_is_continued_by_new_task(self):
+        self._create_event(self.problems[0], 1, 2)
+        self._create_event(self.problems[1], 1, 1)
+        with patch.object(process_score_events, 'apply_async') as mock_apply_async:
+            self._process()
+
+        # The task stops after its first batch, and schedules a new one for the rest
+        self.assertEqual(self.receiver.call_count, 1)
+        self.assertEqual(PendingScoreEvent.objects.count(), 1)
+        self.assertEqual(mock_apply_async.call_count, 1)
+        self.assertIsNone(cache.get(self._lock_key()))
+
+    def test_sweep_schedules_left_behind_events(self):
+        left_behind = self._create_event(self.problems[0], 1, 2)
+        PendingScoreEvent.objects.filter(id=left_behind.id).update(
+            created=timezone.now() - timedelta(seconds=SCORE_EVENTS_SWEEP_AGE + 1)
+        )
+        other_user = UserFactory.create()
+        self._create_event(self.problems[0], 1, 2, user=other_user)
+
+        # Only the events whose task was lost are scheduled again
+        with patch.object(process_score_events, 'apply_async') as mock_apply_async:
+            sweep_score_events()
+        mock_apply_async.assert_called_once_with(args=(self.user.id, unicode(self.course_key)), countdown=5)
@@ -12,6 +12,7 @@ except ImportError:
     import json
 
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 from xblock.fields import Scope, ScopeBase
 from edx_user_state_client.interface import XBlockUserStateClient
 from courseware.models import StudentModule, StudentModuleHistory
@@ -213,36 +214,67 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
 
-        # We do a find_or_create for every block (rather than re-using field objects
-        # that were queried in get_many) so that if the score has
-        # been changed by some other piece of the code, we don't overwrite
-        # that score.
         if self.user.username == username:
             user = self.user
         else:
             user = User.objects.get(username=username)
 
-        for usage_key, state in block_keys_to_state.items():
-            student_module, created = StudentModule.objects.get_or_create(
-                student=user,
-                course_id=usage_key.course_key,
-                module_state_key=usage_key,
-                defaults={
-                    'state': json.dumps(state),
-                    'module_type': usage_key.block_type,
-                },
-            )
+        # We re-read the rows for all of the blocks in one query (rather than
+        # re-using field objects that were queried in get_many) so that if the
+        # score has been changed by some other piece of the code, we don't
+        # overwrite that score.
+        student_modules = {
+            usage_key: student_module
+            for student_module, usage_key in self._get_student_modules(username, block_keys_to_state.keys())
+        }
+
+        with StudentModuleHistory.batched_writes():
+            for usage_key, state in block_keys_to_state.items():
+                student_module = student_modules.get(usage_key)
+                if student_module is None:
+                    student_module = self._create_student_module(user, usage_key, state)
+                    if student_module is None:
+                        continue
 
-            if not created:
                 if student_module.state is None:
                     current_state = {}
                 else:
                     current_state = json.loads(student_module.state)
-                current_state.update(state)
-                student_module.state = json.dumps(current_state)
+                updated_state = dict(current_state)
+                updated_state.update(state)
+                if updated_state == current_state:
+                    continue
+
+                student_module.state = json.dumps(updated_state)
                 # We just read this object, so we know that we can do an update
                 student_module.save(force_update=True)
 
+    def _create_student_module(self, user, usage_key, state):
+        """
+        Create the :class:`~StudentModule` for ``usage_key`` with the initial ``state``.
+
+        Returns None if the row was created, or the existing row if another
+        process created it first.
+        """
+        sid = transaction.savepoint()
+        try:
+            StudentModule.objects.create(
+                student=user,
+                course_id=usage_key.course_key,
+                module_state_key=usage_key,
+                state=json.dumps(state),
+                module_type=usage_key.block_type,
+            )
+        except IntegrityError:
+            transaction.savepoint_rollback(sid)
+            return StudentModule.objects.get(
+                student=user,
+                course_id=usage_key.course_key,
+                module_state_key=usage_key,
+            )
+        transaction.savepoint_commit(sid)
+        return None
+
     @contract(
         username="basestring",
         block_keys="seq(UsageKey)|set(UsageKey)",
@@ -414,8 +414,7 @@ def _index_bulk_op(request, course_key, chapter, section, position):
         return redirect(reverse('course_survey', args=[unicode(course.id)]))
 
     try:
-        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
-            course_key, user, course, depth=2)
+        field_data_cache = FieldDataCache([course], course_key, user, lazy=True)
 
         course_module = get_module_for_descriptor(
             user, request, course, field_data_cache, course_key, course=course
@@ -523,16 +522,6 @@ def _index_bulk_op(request, course_key, chapter, section, position):
             if section_descriptor.default_tab:
                 context['default_tab'] = section_descriptor.default_tab
 
-            # cdodge: this looks silly, but let's refetch the section_descriptor with depth=None
-            # which will prefetch the children more efficiently than doing a recursive load
-            section_descriptor = modulestore().get_item(section_descriptor.location, depth=None)
-
-            # Load all descendants of the section, because we're going to display its
-            # html, which in general will need all of its children
-            field_data_cache.add_descriptor_descendents(
-                section_descriptor, depth=None
-            )
-
             section_module = get_module_for_descriptor(
                 user,
                 request,
@@ -19,7 +19,7 @@ from django_comment_client.permissions import check_permissions_by_view, has_per
 from django_comment_client.settings import MAX_COMMENT_DEPTH
 from edxmako import lookup_template
 
-from courseware.access import has_access
+from courseware.access import has_access, get_course_access_evaluator
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
 from openedx.core.djangoapps.course_groups.cohorts import (
     get_course_cohort_settings, get_cohort_by_id, get_cohort_id, is_commentable_cohorted, is_course_cohorted
@@ -78,11 +78,10 @@ def get_accessible_discussion_modules(course, user, include_all=False):  # pylin
     are accessible to the given user.
     """
     all_modules = modulestore().get_items(course.id, qualifiers={'category': 'discussion'})
-
-    return [
-        module for module in all_modules
-        if has_required_keys(module) and (include_all or has_access(user, 'load', module, course.id))
-    ]
+    modules = [module for module in all_modules if has_required_keys(module)]
+    if include_all:
+        return modules
+    return get_course_access_evaluator(user, course.id).filter_loadable(modules)
 
 
 def get_discussion_id_map_entry(module):
@@ -18,10 +18,11 @@ def edxnotes(cls):
     Decorator that makes components annotatable.
     """
     original_get_html = cls.get_html
+    original_user_independent_views = getattr(cls, 'user_independent_views', ())
 
-    def get_html(self, *args, **kwargs):
+    def get_notes_course(self):
         """
-        Returns raw html for the component.
+        Returns the course of the component if notes are enabled for it, None otherwise.
         """
         is_studio = getattr(self.system, "is_author_mode", False)
         course = self.descriptor.runtime.modulestore.get_course(self.runtime.course_id)
@@ -31,6 +32,15 @@ def edxnotes(cls):
         # - when Harvard Annotation Tool is enabled for the course;
         # - when the feature flag or `edxnotes` setting of the course is set to False.
         if is_studio or not is_feature_enabled(course):
+            return None
+        return course
+
+    def get_html(self, *args, **kwargs):
+        """
+        Returns raw html for the component.
+        """
+        course = get_notes_course(self)
+        if course is None:
             return original_get_html(self, *args, **kwargs)
         else:
             return render_to_string("edxnotes_wrapper.html", {
@@ -51,5 +61,14 @@ def edxnotes(cls):
                 },
             })
 
+    def user_independent_views(self):
+        """
+        The views of the component are specific to the user when it is annotatable.
+        """
+        if get_notes_course(self) is None:
+            return original_user_independent_views
+        return ()
+
     cls.get_html = get_html
+    cls.user_independent_views = property(user_independent_views)
     return cls
@@ -54,6 +54,8 @@ class TestProblem(object):
         self.descriptor = MagicMock()
         self.descriptor.runtime.modulestore.get_course.return_value = course
 
+    user_independent_views = ("student_view",)
+
     def get_html(self):
         """
         Imitate get_html in module.
@@ -142,6 +144,15 @@ class EdxNotesDecoratorTest(ModuleStoreTestCase):
         enable_edxnotes_for_the_course(self.course, self.user.id)
         self.assertEqual("original_get_html", self.problem.get_html())
 
+    @patch.dict("django.conf.settings.FEATURES", {"ENABLE_EDXNOTES": True})
+    def test_user_independent_views(self):
+        """
+        Tests that the views of the problem are only user independent when edxnotes are disabled.
+        """
+        self.assertEqual(("student_view",), self.problem.user_independent_views)
+        enable_edxnotes_for_the_course(self.course, self.user.id)
+        self.assertEqual((), self.problem.user_independent_views)
+
 
 @skipUnless(settings.FEATURES["ENABLE_EDXNOTES"], "EdxNotes feature needs to be enabled.")
 @ddt.ddt
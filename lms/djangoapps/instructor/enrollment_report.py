@@ -36,6 +36,15 @@ class AbstractEnrollmentReportProvider(object):
         """
         raise NotImplementedError()
 
+    def prefetch(self, users, course_id):
+        """
+        Load, in bulk, the data needed to report on `users` in `course_id`.
+
+        Providers may use this to answer the get_* methods for these users
+        without querying the database for each one of them.
+        """
+        pass
+
 
 class BaseAbstractEnrollmentReportProvider(AbstractEnrollmentReportProvider):
     """
@@ -44,11 +53,34 @@ class BaseAbstractEnrollmentReportProvider(AbstractEnrollmentReportProvider):
 
     # don't allow instantiation of this class, it must be subclassed
     """
+    def __init__(self):
+        self._prefetched_data = {}
+
+    def prefetch(self, users, course_id):
+        """
+        Remember `users` (which should have their profile selected) so that
+        their profiles are reported without further queries. Subclasses add
+        the other data they need to `_prefetched_data`.
+        """
+        self._prefetched_data = {'users': {user.id: user for user in users}}
+
+    def _get_prefetched(self, kind, key, fetch):
+        """
+        Return the `kind` of data stored for `key` by `prefetch`, or `fetch()`
+        it if it wasn't prefetched.
+        """
+        prefetched = self._prefetched_data.get(kind, {})
+        if key in prefetched:
+            return prefetched[key]
+        return fetch()
+
     def get_user_profile(self, user_id):
         """
         Returns the UserProfile information.
         """
-        user_info = User.objects.select_related('profile').get(id=user_id)
+        user_info = self._get_prefetched(
+            'users', user_id, lambda: User.objects.select_related('profile').get(id=user_id)
+        )
         # extended user profile fields are stored in the user_profile meta column
         meta = {}
         if user_info.profile.meta:
@@ -5,6 +5,7 @@ Defines concrete class for cybersource  Enrollment Report.
 from courseware.access import has_access
 import collections
 from django.conf import settings
+from django.db.models import Q
 from django.utils.translation import ugettext as _
 from courseware.courses import get_course_by_id
 from instructor.enrollment_report import BaseAbstractEnrollmentReportProvider
@@ -12,18 +13,162 @@ from microsite_configuration import microsite
 from shoppingcart.models import RegistrationCodeRedemption, PaidCourseRegistration, CouponRedemption, OrderItem, \
     InvoiceTransaction
 from student.models import CourseEnrollment, ManualEnrollmentAudit
+from student.roles import RoleCache
 
 
 class PaidCourseEnrollmentReportProvider(BaseAbstractEnrollmentReportProvider):
     """
     The concrete class for all CyberSource Enrollment Reports.
     """
+    def __init__(self):
+        super(PaidCourseEnrollmentReportProvider, self).__init__()
+        self._courses = {}
+
+    def prefetch(self, users, course_id):
+        """
+        Load the enrollments, roles, purchases, registration code redemptions,
+        manual enrollments and invoices of `users` in `course_id` with one
+        query each.
+        """
+        super(PaidCourseEnrollmentReportProvider, self).prefetch(users, course_id)
+        RoleCache.prefetch(users)
+
+        enrollments = {
+            (course_id, user.id): None for user in users
+        }
+        enrollments.update({
+            (course_id, enrollment.user_id): enrollment
+            for enrollment in CourseEnrollment.objects.filter(course_id=course_id, user__in=users)
+        })
+        enrollment_ids = [enrollment.id for enrollment in enrollments.values() if enrollment is not None]
+
+        # Keep the most recent redemption, purchase and manual enrollment of each enrollment
+        redemptions = dict.fromkeys(enrollment_ids)
+        for redemption in RegistrationCodeRedemption.objects.filter(
+                course_enrollment__in=enrollment_ids
+        ).select_related(
+            'registration_code', 'registration_code__invoice', 'registration_code__invoice_item'
+        ).order_by('redeemed_at'):
+            redemptions[redemption.course_enrollment_id] = redemption
+
+        paid_course_registrations = dict.fromkeys(enrollment_ids)
+        for paid_course_registration in PaidCourseRegistration.objects.filter(
+                course_id=course_id, course_enrollment__in=enrollment_ids, status='purchased'
+        ).order_by('id'):
+            paid_course_registrations[paid_course_registration.course_enrollment_id] = paid_course_registration
+
+        manual_enrollments = dict.fromkeys(enrollment_ids)
+        for manual_enrollment in ManualEnrollmentAudit.objects.filter(
+                enrollment__in=enrollment_ids
+        ).order_by('time_stamp'):
+            manual_enrollments[manual_enrollment.enrollment_id] = manual_enrollment
+
+        registration_codes = [redemption.registration_code for redemption in redemptions.values() if redemption]
+        code_order_ids = [code.order_id for code in registration_codes if code.order_id]
+        order_ids = code_order_ids + [item.order_id for item in paid_course_registrations.values() if item]
+        invoice_ids = [code.invoice_id for code in registration_codes if code.invoice_id]
+
+        coupon_codes = {order_id: [] for order_id in order_ids}
+        for coupon_redemption in CouponRedemption.objects.select_related('coupon').filter(order__in=order_ids):
+            coupon_codes[coupon_redemption.order_id].append(coupon_redemption.coupon.code)
+
+        order_items = {(order_id, course_id): None for order_id in code_order_ids}
+        order_items.update({
+            (order_item.order_id, course_id): order_item
+            for order_item in OrderItem.objects.filter(
+                order__in=code_order_ids, courseregcodeitem__course_id=course_id
+            )
+        })
+
+        invoice_transactions = dict.fromkeys(invoice_ids)
+        invoice_transactions.update({
+            invoice_transaction.invoice_id: invoice_transaction
+            for invoice_transaction in InvoiceTransaction.objects.filter(
+                Q(invoice__in=invoice_ids), Q(status='completed') | Q(status='refunded')
+            )
+        })
+
+        self._prefetched_data.update({
+            'enrollments': enrollments,
+            'registration_code_redemptions': redemptions,
+            'paid_course_registrations': paid_course_registrations,
+            'manual_enrollments': manual_enrollments,
+            'coupon_codes': coupon_codes,
+            'order_items': order_items,
+            'invoice_transactions': invoice_transactions,
+        })
+
+    def _get_course(self, course_id):
+        """
+        Returns the course of `course_id`, loading it only once.
+        """
+        if course_id not in self._courses:
+            self._courses[course_id] = get_course_by_id(course_id, depth=0)
+        return self._courses[course_id]
+
+    def _get_enrollment(self, user, course_id):
+        """
+        Returns the CourseEnrollment of `user` in `course_id`.
+        """
+        return self._get_prefetched(
+            'enrollments',
+            (course_id, user.id),
+            lambda: CourseEnrollment.get_enrollment(user=user, course_key=course_id)
+        )
+
+    def _get_registration_code_redemption(self, course_enrollment):
+        """
+        Returns the RegistrationCodeRedemption used for `course_enrollment`, if any.
+        """
+        return self._get_prefetched(
+            'registration_code_redemptions',
+            getattr(course_enrollment, 'id', None),
+            lambda: RegistrationCodeRedemption.registration_code_used_for_enrollment(course_enrollment)
+        )
+
+    def _get_paid_course_registration(self, user, course_id, course_enrollment):
+        """
+        Returns the PaidCourseRegistration the user purchased `course_enrollment` with, if any.
+        """
+        return self._get_prefetched(
+            'paid_course_registrations',
+            getattr(course_enrollment, 'id', None),
+            lambda: PaidCourseRegistration.get_course_item_for_user_enrollment(
+                user=user,
+                course_id=course_id,
+                course_enrollment=course_enrollment
+            )
+        )
+
+    def _get_manual_enrollment(self, course_enrollment):
+        """
+        Returns the latest ManualEnrollmentAudit of `course_enrollment`, if any.
+        """
+        return self._get_prefetched(
+            'manual_enrollments',
+            getattr(course_enrollment, 'id', None),
+            lambda: ManualEnrollmentAudit.get_manual_enrollment(course_enrollment)
+        )
+
+    def _get_coupon_codes(self, order_id):
+        """
+        Returns the codes of the coupons redeemed in the order `order_id`, as a string.
+        """
+        coupon_codes = self._get_prefetched(
+            'coupon_codes',
+            order_id,
+            lambda: [
+                redemption.coupon.code
+                for redemption in CouponRedemption.objects.select_related('coupon').filter(order_id=order_id)
+            ]
+        )
+        return ", ".join(coupon_codes)
 
     def get_enrollment_info(self, user, course_id):
         """
         Returns the User Enrollment information.
         """
-        course = get_course_by_id(course_id, depth=0)
+        course = self._get_course(course_id)
         is_course_staff = has_access(user, 'staff', course)
 
         # check the user enrollment role
@@ -35,20 +180,15 @@ class PaidCourseEnrollmentReportProvider(BaseAbstractEnrollmentReportProvider):
         else:
             enrollment_role = _('Student')
 
-        course_enrollment = CourseEnrollment.get_enrollment(user=user, course_key=course_id)
+        course_enrollment = self._get_enrollment(user, course_id)
 
         if is_course_staff:
             enrollment_source = _('Staff')
         else:
             # get the registration_code_redemption object if exists
-            registration_code_redemption = RegistrationCodeRedemption.registration_code_used_for_enrollment(
-                course_enrollment)
+            registration_code_redemption = self._get_registration_code_redemption(course_enrollment)
             # get the paid_course registration item if exists
-            paid_course_reg_item = PaidCourseRegistration.get_course_item_for_user_enrollment(
-                user=user,
-                course_id=course_id,
-                course_enrollment=course_enrollment
-            )
+            paid_course_reg_item = self._get_paid_course_registration(user, course_id, course_enrollment)
 
             # from where the user get here
             if registration_code_redemption is not None:
@@ -56,7 +196,7 @@ class PaidCourseEnrollmentReportProvider(BaseAbstractEnrollmentReportProvider):
             elif paid_course_reg_item is not None:
                 enrollment_source = _('Credit Card - Individual')
             else:
-                manual_enrollment = ManualEnrollmentAudit.get_manual_enrollment(course_enrollment)
+                manual_enrollment = self._get_manual_enrollment(course_enrollment)
                 if manual_enrollment is not None:
                     enrollment_source = _(
                         'manually enrolled by user_id {user_id}, enrollment state transition: {transition}'
@@ -78,20 +218,13 @@ class PaidCourseEnrollmentReportProvider(BaseAbstractEnrollmentReportProvider):
         """
         Returns the User Payment information.
         """
-        course_enrollment = CourseEnrollment.get_enrollment(user=user, course_key=course_id)
-        paid_course_reg_item = PaidCourseRegistration.get_course_item_for_user_enrollment(
-            user=user,
-            course_id=course_id,
-            course_enrollment=course_enrollment
-        )
+        course_enrollment = self._get_enrollment(user, course_id)
+        paid_course_reg_item = self._get_paid_course_registration(user, course_id, course_enrollment)
         payment_data = collections.OrderedDict()
         # check if the user made a single self purchase scenario
         # for enrollment in the course.
         if paid_course_reg_item is not None:
-            coupon_redemption = CouponRedemption.objects.select_related('coupon').filter(
-                order_id=paid_course_reg_item.order_id)
-            coupon_codes = [redemption.coupon.code for redemption in coupon_redemption]
-            coupon_codes = ", ".join(coupon_codes)
+            coupon_codes = self._get_coupon_codes(paid_course_reg_item.order_id)
             registration_code_used = 'N/A'
 
             list_price = paid_course_reg_item.get_list_price()
@@ -102,8 +235,7 @@ class PaidCourseEnrollmentReportProvider(BaseAbstractEnrollmentReportProvider):
 
         else:
             # check if the user used a registration code for the enrollment.
-            registration_code_redemption = RegistrationCodeRedemption.registration_code_used_for_enrollment(
-                course_enrollment)
+            registration_code_redemption = self._get_registration_code_redemption(course_enrollment)
             if registration_code_redemption is not None:
                 registration_code = registration_code_redemption.registration_code
                 registration_code_used = registration_code.code
@@ -145,12 +277,15 @@ class PaidCourseEnrollmentReportProvider(BaseAbstractEnrollmentReportProvider):
         """
         Returns the order data
         """
-        order_item = OrderItem.objects.get(order=registration_code_redemption.registration_code.order,
-                                           courseregcodeitem__course_id=course_id)
-        coupon_redemption = CouponRedemption.objects.select_related('coupon').filter(
-            order_id=registration_code_redemption.registration_code.order)
-        coupon_codes = [redemption.coupon.code for redemption in coupon_redemption]
-        coupon_codes = ", ".join(coupon_codes)
+        order_id = registration_code_redemption.registration_code.order_id
+        order_item = self._get_prefetched(
+            'order_items',
+            (order_id, course_id),
+            lambda: OrderItem.objects.get(order_id=order_id, courseregcodeitem__course_id=course_id)
+        )
+        if order_item is None:
+            raise OrderItem.DoesNotExist()
+        coupon_codes = self._get_coupon_codes(order_id)
 
         list_price = order_item.get_list_price()
         payment_amount = order_item.unit_cost
@@ -168,8 +303,12 @@ class PaidCourseEnrollmentReportProvider(BaseAbstractEnrollmentReportProvider):
         total_amount = registration_code_redemption.registration_code.invoice.total_amount
         qty = registration_code_redemption.registration_code.invoice_item.qty
         payment_amount = total_amount / qty
-        invoice_transaction = InvoiceTransaction.get_invoice_transaction(
-            invoice_id=registration_code_redemption.registration_code.invoice.id)
+        invoice_id = registration_code_redemption.registration_code.invoice_id
+        invoice_transaction = self._get_prefetched(
+            'invoice_transactions',
+            invoice_id,
+            lambda: InvoiceTransaction.get_invoice_transaction(invoice_id=invoice_id)
+        )
         if invoice_transaction is not None:
             # amount greater than 0 is invoice has bee paid
             if invoice_transaction.amount > 0:
@@ -2,9 +2,14 @@
 Exercises tests on the base_store_provider file
 """
 
+from django.contrib.auth.models import User
 from django.test import TestCase
 from instructor.enrollment_report import AbstractEnrollmentReportProvider
 from instructor.paidcourse_enrollment_report import PaidCourseEnrollmentReportProvider
+from student.models import CourseEnrollment
+from student.tests.factories import UserFactory
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
 
 
 class BadImplementationAbstractEnrollmentReportProvider(AbstractEnrollmentReportProvider):
@@ -73,3 +78,43 @@ class TestBaseNotificationDataProvider(TestCase):
 
         with self.assertRaises(NotImplementedError):
             bad_provider.get_user_profile(None)
+
+
+class TestPrefetchedEnrollmentReportProvider(ModuleStoreTestCase):
+    """
+    Test that prefetched report data is used by the PaidCourseEnrollmentReportProvider
+    """
+    def setUp(self):
+        super(TestPrefetchedEnrollmentReportProvider, self).setUp()
+        self.course = CourseFactory.create()
+        self.users = [UserFactory.create() for _ in range(3)]
+        for user in self.users:
+            CourseEnrollment.enroll(user, self.course.id)
+
+    def test_prefetched_data_is_used(self):
+        provider = PaidCourseEnrollmentReportProvider()
+        expected = [
+            (
+                provider.get_user_profile(user.id),
+                provider.get_enrollment_info(user, self.course.id),
+                provider.get_payment_info(user, self.course.id),
+            )
+            for user in self.users
+        ]
+
+        provider = PaidCourseEnrollmentReportProvider()
+        users = list(User.objects.filter(id__in=[user.id for user in self.users]).select_related('profile'))
+        users.sort(key=lambda user: user.id)
+        provider.prefetch(users, self.course.id)
+        provider.get_enrollment_info(users[0], self.course.id)
+
+        with self.assertNumQueries(0):
+            actual = [
+                (
+                    provider.get_user_profile(user.id),
+                    provider.get_enrollment_info(user, self.course.id),
+                    provider.get_payment_info(user, self.course.id),
+                )
+                for user in users
+            ]
+        self.assertEqual(expected, actual)
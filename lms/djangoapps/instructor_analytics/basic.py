@@ -168,6 +168,17 @@ def enrolled_students_features(course_key, features):
         {'username': 'username3', 'first_name': 'firstname3'}
     ]
     """
+    return list(iter_enrolled_students_features(course_key, features))
+
+
+def iter_enrolled_students_features(course_key, features):
+    """
+    Generator version of `enrolled_students_features`.
+
+    Unless the cohort of the students is requested (which needs all students
+    to be loaded at once to prefetch their cohorts), students are read from
+    the database without caching them all in the queryset.
+    """
     include_cohort_column = 'cohort' in features
 
     students = User.objects.filter(
@@ -177,21 +188,23 @@ def enrolled_students_features(course_key, features):
 
     if include_cohort_column:
         students = students.prefetch_related('course_groups')
-
-    def extract_student(student, features):
+    else:
+        students = students.iterator()
+
+    student_features = [x for x in STUDENT_FEATURES if x in features]
+    profile_features = [x for x in PROFILE_FEATURES if x in features]
+
+    # For data extractions on the 'meta' field
+    # the feature name should be in the format of 'meta.foo' where
+    # 'foo' is the keyname in the meta dictionary
+    meta_features = []
+    for feature in features:
+        if 'meta.' in feature:
+            meta_key = feature.split('.')[1]
+            meta_features.append((feature, meta_key))
+
+    def extract_student(student):
         """ convert student to dictionary """
-        student_features = [x for x in STUDENT_FEATURES if x in features]
-        profile_features = [x for x in PROFILE_FEATURES if x in features]
-
-        # For data extractions on the 'meta' field
-        # the feature name should be in the format of 'meta.foo' where
-        # 'foo' is the keyname in the meta dictionary
-        meta_features = []
-        for feature in features:
-            if 'meta.' in feature:
-                meta_key = feature.split('.')[1]
-                meta_features.append((feature, meta_key))
-
         student_dict = dict((feature, getattr(student, feature))
                             for feature in student_features)
         profile = student.profile
@@ -200,10 +213,12 @@ def enrolled_students_features(course_key, features):
                                 for feature in profile_features)
             student_dict.update(profile_dict)
 
-            # now featch the requested meta fields
-            meta_dict = json.loads(profile.meta) if profile.meta else {}
-            for meta_feature, meta_key in meta_features:
-                student_dict[meta_feature] = meta_dict.get(meta_key)
+            # now featch the requested meta fields, only parsing the meta
+            # JSON if any of them were requested
+            if meta_features:
+                meta_dict = json.loads(profile.meta) if profile.meta else {}
+                for meta_feature, meta_key in meta_features:
+                    student_dict[meta_feature] = meta_dict.get(meta_key)
 
         if include_cohort_column:
             # Note that we use student.course_groups.all() here instead of
@@ -215,7 +230,8 @@ def enrolled_students_features(course_key, features):
             )
         return student_dict
 
-    return [extract_student(student, features) for student in students]
+    for student in students:
+        yield extract_student(student)
 
 
 def list_may_enroll(course_key, features):
@@ -24,6 +24,7 @@ from instructor_task.tasks import (
     cohort_students,
     enrollment_report_features_csv,
     calculate_may_enroll_csv,
+    calculate_answer_distribution_csv,
     exec_summary_report_csv,
     generate_certificates,
 )
@@ -394,6 +395,21 @@ def submit_calculate_may_enroll_csv(request, course_key, features):
     return submit_task(request, task_type, task_class, course_key, task_input, task_key)
 
 
+def submit_answer_distribution_report(request, course_key):  # pylint: disable=invalid-name
+    """
+    Submits a task to generate a CSV file containing the answer distribution
+    of every submitted problem in a course.
+
+    Raises AlreadyRunningError if said file is already being updated.
+    """
+    task_type = 'answer_distribution'
+    task_class = calculate_answer_distribution_csv
+    task_input = {}
+    task_key = ""
+
+    return submit_task(request, task_type, task_class, course_key, task_input, task_key)
+
+
 def submit_executive_summary_report(request, course_key):  # pylint: disable=invalid-name
     """
     Submits a task to generate a HTML File containing the executive summary report.
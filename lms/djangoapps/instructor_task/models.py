@@ -12,12 +12,15 @@ file and check it in at the same time as your model changes. To do that,
 ASSUMPTIONS: modules have unique IDs, even across different module_types
 
 """
+from contextlib import contextmanager
 from cStringIO import StringIO
 from gzip import GzipFile
+from tempfile import NamedTemporaryFile, SpooledTemporaryFile
 from uuid import uuid4
 import csv
 import json
 import hashlib
+import os
 import os.path
 import urllib
 
@@ -193,9 +196,8 @@ class InstructorTask(models.Model):
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
-    download. Should probably refactor later to create a ReportFile object that
-    can simply be appended to for the sake of memory efficiency, rather than
-    passing in the whole dataset. Doing that for now just because it's simpler.
+    download. CSV files are written through `rows_writer`, which accepts rows
+    incrementally so that reports never have to be held in memory as a whole.
     """
     @classmethod
     def from_config(cls, config_name):
@@ -218,6 +220,54 @@ class ReportStore(object):
         for row in rows:
             yield [unicode(item).encode('utf-8') for item in row]
 
+    @contextmanager
+    def rows_writer(self, course_id, filename):
+        """
+        Context manager yielding a `ReportRowsWriter` for the CSV file
+        `filename` of `course_id`. The file is only stored once the block
+        exits without an error, so incomplete files are never visible.
+
+        By default the file is collected in memory and handed to `store()`
+        once the block exits. Subclasses should override this to write the
+        rows out as they come.
+        """
+        output_buffer = StringIO()
+        yield ReportRowsWriter(self, output_buffer)
+        self.store(course_id, filename, output_buffer)
+
+    def store_rows(self, course_id, filename, rows):
+        """
+        Given a `course_id`, `filename`, and `rows` (an iterable of rows, each
+        row being an iterable of strings), write this data out. `rows` is
+        consumed lazily, so it can be a generator.
+        """
+        with self.rows_writer(course_id, filename) as writer:
+            writer.writerows(rows)
+
+
+class ReportRowsWriter(object):
+    """
+    Writes rows of unicode strings to a CSV file as utf-8, one row at a time.
+    """
+    def __init__(self, report_store, fileobj):
+        self.report_store = report_store
+        self.csvwriter = csv.writer(fileobj)
+        self.num_rows = 0
+
+    def writerow(self, row):
+        """
+        Write a single row to the CSV file.
+        """
+        self.writerows([row])
+
+    def writerows(self, rows):
+        """
+        Write every row of the iterable `rows` to the CSV file.
+        """
+        for row in self.report_store._get_utf8_encoded_rows(rows):  # pylint: disable=protected-access
+            self.csvwriter.writerow(row)
+            self.num_rows += 1
+
 
 class S3ReportStore(ReportStore):
     """
@@ -286,6 +336,22 @@ class S3ReportStore(ReportStore):
         transparent via the browser). Filenames should end in whatever
         suffix makes sense for the original file, so `.txt` instead of `.gz`
         """
+        key, headers = self._key_and_headers(course_id, filename, config)
+
+        data = buff.getvalue()
+        key.size = len(data)
+        headers["Content-Length"] = len(data)
+
+        # Just setting the content encoding and type should work according to
+        # the docs, but when experimenting, this was necessary for it to
+        # actually take.
+        key.set_contents_from_string(data, headers=headers)
+
+    def _key_and_headers(self, course_id, filename, config):
+        """
+        Return the key to store `filename` under, with its content headers set
+        from `config`, along with those headers.
+        """
         key = self.key_for(course_id, filename)
 
         _config = config if config else {}
@@ -293,39 +359,35 @@ class S3ReportStore(ReportStore):
         content_type = _config.get('content_type', 'text/csv')
         content_encoding = _config.get('content_encoding', 'gzip')
 
-        data = buff.getvalue()
-        key.size = len(data)
         key.content_encoding = content_encoding
         key.content_type = content_type
 
-        # Just setting the content encoding and type above should work
-        # according to the docs, but when experimenting, this was necessary for
-        # it to actually take.
-        key.set_contents_from_string(
-            data,
-            headers={
-                "Content-Encoding": content_encoding,
-                "Content-Length": len(data),
-                "Content-Type": content_type,
-            }
-        )
+        return key, {
+            "Content-Encoding": content_encoding,
+            "Content-Type": content_type,
+        }
 
-    def store_rows(self, course_id, filename, rows):
+    @contextmanager
+    def rows_writer(self, course_id, filename):
         """
-        Given a `course_id`, `filename`, and `rows` (each row is an iterable of
-        strings), create a buffer that is a gzip'd csv file, and then `store()`
-        that buffer.
+        Yield a `ReportRowsWriter` writing a gzip'd csv file, which is uploaded
+        once the block exits.
 
-        Even though we store it in gzip format, browsers will transparently
-        download and decompress it. Filenames should end in `.csv`, not `.gz`.
+        The compressed data is spooled to a temporary file that only stays in
+        memory while it is small, and is uploaded from that file. Even though
+        we store it in gzip format, browsers will transparently download and
+        decompress it. Filenames should end in `.csv`, not `.gz`.
         """
-        output_buffer = StringIO()
-        gzip_file = GzipFile(fileobj=output_buffer, mode="wb")
-        csvwriter = csv.writer(gzip_file)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        gzip_file.close()
+        with SpooledTemporaryFile(max_size=settings.REPORT_STORE_SPOOL_MAX_SIZE) as spool_file:
+            gzip_file = GzipFile(fileobj=spool_file, mode="wb")
+            yield ReportRowsWriter(self, gzip_file)
+            gzip_file.close()
 
-        self.store(course_id, filename, output_buffer)
+            key, headers = self._key_and_headers(course_id, filename, None)
+            key.size = spool_file.tell()
+            headers["Content-Length"] = key.size
+            spool_file.seek(0)
+            key.set_contents_from_file(spool_file, headers=headers)
 
     def links_for(self, course_id):
         """
@@ -383,24 +445,37 @@ class LocalFSReportStore(ReportStore):
         assumed to be a StringIO objecd (or anything that can flush its contents
         to string using `.getvalue()`).
         """
+        full_path = self._make_course_dir(course_id, filename)
+        with open(full_path, "wb") as f:
+            f.write(buff.getvalue())
+
+    def _make_course_dir(self, course_id, filename):
+        """
+        Create the directory of `course_id` if needed, and return the full path
+        to `filename` in it.
+        """
         full_path = self.path_to(course_id, filename)
         directory = os.path.dirname(full_path)
         if not os.path.exists(directory):
             os.mkdir(directory)
+        return full_path
 
-        with open(full_path, "wb") as f:
-            f.write(buff.getvalue())
-
-    def store_rows(self, course_id, filename, rows):
+    @contextmanager
+    def rows_writer(self, course_id, filename):
         """
-        Given a course_id, filename, and rows (each row is an iterable of strings),
-        write this data out.
+        Yield a `ReportRowsWriter` writing straight to disk. The rows are
+        written to a temporary file next to the final one, which is renamed
+        to `filename` once the block exits.
         """
-        output_buffer = StringIO()
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-
-        self.store(course_id, filename, output_buffer)
+        full_path = self._make_course_dir(course_id, filename)
+        temp_file = NamedTemporaryFile(dir=os.path.dirname(full_path), prefix='.', suffix='.tmp', delete=False)
+        try:
+            with temp_file:
+                yield ReportRowsWriter(self, temp_file)
+            os.rename(temp_file.name, full_path)
+        finally:
+            if os.path.exists(temp_file.name):
+                os.remove(temp_file.name)
 
     def links_for(self, course_id):
         """
@@ -413,7 +488,12 @@ class LocalFSReportStore(ReportStore):
         course_dir = self.path_to(course_id, '')
         if not os.path.exists(course_dir):
             return []
-        files = [(filename, os.path.join(course_dir, filename)) for filename in os.listdir(course_dir)]
+        # Files starting with a dot are reports still being written by `rows_writer`
+        files = [
+            (filename, os.path.join(course_dir, filename))
+            for filename in os.listdir(course_dir)
+            if not filename.startswith('.')
+        ]
         files.sort(key=lambda (filename, full_path): os.path.getmtime(full_path), reverse=True)
 
         return [
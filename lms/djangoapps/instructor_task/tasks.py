@@ -4,7 +4,8 @@ running state of a course.
 
 At present, these tasks all operate on StudentModule objects in one way or another,
 so they share a visitor architecture.  Each task defines an "update function" that
-takes a module_descriptor, a particular StudentModule object, and xmodule_instance_args.
+takes xmodule_instance_args and a chunk of (module_descriptor, StudentModule object) pairs,
+so that the StudentModules can be updated together.
 
 A task may optionally specify a "filter function" that takes a query for StudentModule
 objects, and adds additional filter clauses.
@@ -40,6 +41,7 @@ from instructor_task.tasks_helper import (
     cohort_students_and_upload,
     upload_enrollment_report,
     upload_may_enroll_csv,
+    upload_answer_distribution_report,
     upload_exec_summary_report,
     generate_students_certificates,
 )
@@ -226,6 +228,18 @@ def calculate_may_enroll_csv(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def calculate_answer_distribution_csv(entry_id, xmodule_instance_args):
+    """
+    Compute the answer distribution of every submitted problem in a course
+    and upload the CSV to an S3 bucket for download.
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    action_name = ugettext_noop('generated')
+    task_fn = partial(upload_answer_distribution_report, xmodule_instance_args)
+    return run_main_task(entry_id, task_fn, action_name)
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
 def generate_certificates(entry_id, xmodule_instance_args):
     """
@@ -3,12 +3,13 @@ Tests for instructor_task/models.py.
 """
 
 from cStringIO import StringIO
+from gzip import GzipFile
 import mock
 import time
 from datetime import datetime
 from unittest import TestCase
 
-from instructor_task.models import LocalFSReportStore, S3ReportStore
+from instructor_task.models import LocalFSReportStore, ReportStore, S3ReportStore
 from instructor_task.tests.test_base import TestReportMixin
 from opaque_keys.edx.locator import CourseLocator
 
@@ -25,6 +26,11 @@ class MockKey(object):
         """ Expected method on a Key object. """
         self.bucket.store_key(self)
 
+    def set_contents_from_file(self, fp, headers):  # pylint: disable=unused-argument
+        """ Expected method on a Key object. """
+        self.contents = fp.read()
+        self.bucket.store_key(self)
+
     def generate_url(self, expires_in):  # pylint: disable=unused-argument
         """ Expected method on a Key object. """
         return "http://fake-edx-s3.edx.org/"
@@ -84,6 +90,18 @@ class ReportStoreTestMixin(object):
             ['new_file', 'middle_file', 'old_file']
         )
 
+    def test_rows_writer_error(self):
+        """
+        Test that nothing is stored if writing the rows fails.
+        """
+        report_store = self.create_report_store()
+        with self.assertRaises(ValueError):
+            with report_store.rows_writer(self.course_id, 'report.csv') as writer:
+                writer.writerow([u'first'])
+                raise ValueError()
+
+        self.assertEqual(report_store.links_for(self.course_id), [])
+
 
 class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase):
     """
@@ -93,6 +111,50 @@ class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase
         """ Create and return a LocalFSReportStore. """
         return LocalFSReportStore.from_config(config_name='GRADES_DOWNLOAD')
 
+    def test_store_rows_from_generator(self):
+        report_store = self.create_report_store()
+        report_store.store_rows(self.course_id, 'report.csv', ([u'row', unicode(index)] for index in xrange(3)))
+
+        with open(report_store.path_to(self.course_id, 'report.csv')) as report_file:
+            self.assertEqual(report_file.read(), 'row,0\r\nrow,1\r\nrow,2\r\n')
+        self.assertEqual([link[0] for link in report_store.links_for(self.course_id)], ['report.csv'])
+
+
+class BufferReportStore(ReportStore):
+    """
+    A ReportStore that only implements `store()`, keeping the stored buffers
+    in memory.
+    """
+    def __init__(self):
+        self.files = {}
+
+    def store(self, course_id, filename, buff, config=None):  # pylint: disable=unused-argument
+        """ Keep the contents of `buff`. """
+        self.files[(course_id, filename)] = buff.getvalue()
+
+
+class ReportStoreTestCase(TestCase):
+    """
+    Test the default rows_writer of ReportStore.
+    """
+    def setUp(self):
+        self.course_id = CourseLocator(org="testx", course="coursex", run="runx")
+
+    def test_store_rows_default(self):
+        report_store = BufferReportStore()
+        report_store.store_rows(self.course_id, 'report.csv', ([u'row', unicode(index)] for index in xrange(3)))
+
+        self.assertEqual(report_store.files, {(self.course_id, 'report.csv'): 'row,0\r\nrow,1\r\nrow,2\r\n'})
+
+    def test_rows_writer_default_error(self):
+        report_store = BufferReportStore()
+        with self.assertRaises(ValueError):
+            with report_store.rows_writer(self.course_id, 'report.csv') as writer:
+                writer.writerow([u'first'])
+                raise ValueError()
+
+        self.assertEqual(report_store.files, {})
+
 
 @mock.patch('instructor_task.models.S3Connection', new=MockS3Connection)
 @mock.patch('instructor_task.models.Key', new=MockKey)
@@ -105,3 +167,11 @@ class S3ReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, TestCase):
     def create_report_store(self):
         """ Create and return a S3ReportStore. """
         return S3ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+
+    def test_store_rows_from_generator(self):
+        report_store = self.create_report_store()
+        report_store.store_rows(self.course_id, 'report.csv', ([u'row', unicode(index)] for index in xrange(3)))
+
+        key = report_store.bucket.keys[0]
+        self.assertEqual(key.size, len(key.contents))
+        self.assertEqual(GzipFile(fileobj=StringIO(key.contents)).read(), 'row,0\r\nrow,1\r\nrow,2\r\n')
@@ -15,6 +15,7 @@ from celery.states import SUCCESS, FAILURE
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from opaque_keys.edx.locations import i4xEncoder
 
+from courseware.courses import get_course_by_id
 from courseware.models import StudentModule
 from courseware.tests.factories import StudentModuleFactory
 from student.tests.factories import UserFactory, CourseEnrollmentFactory
@@ -268,6 +269,26 @@ class TestRescoreInstructorTask(TestInstructorTasks):
         self.assertEquals(output.get('action_name'), 'rescored')
         self.assertGreater(output.get('duration_ms'), 0)
 
+    @patch('instructor_task.tasks_helper.MODULE_STATE_UPDATE_CHUNK_SIZE', 4)
+    def test_rescoring_in_chunks(self):
+        input_state = json.dumps({'done': True})
+        num_students = 10
+        self._create_students_with_state(num_students, input_state)
+        task_entry = self._create_input_entry()
+        mock_instance = Mock()
+        mock_instance.rescore_problem = Mock(return_value={'success': 'correct'})
+        with patch('instructor_task.tasks_helper.get_module_for_descriptor_internal') as mock_get_module:
+            mock_get_module.return_value = mock_instance
+            with patch('instructor_task.tasks_helper.get_course_by_id', wraps=get_course_by_id) as mock_get_course:
+                self._run_task_with_mock_celery(rescore_problem, task_entry.id, task_entry.task_id)
+        # the course is loaded once per chunk of modules
+        self.assertEquals(mock_get_course.call_count, 3)
+        self.assertEquals(mock_instance.rescore_problem.call_count, num_students)
+        entry = InstructorTask.objects.get(id=task_entry.id)
+        output = json.loads(entry.task_output)
+        self.assertEquals(output.get('attempted'), num_students)
+        self.assertEquals(output.get('succeeded'), num_students)
+
     def test_rescoring_bad_result(self):
         # Confirm that rescoring does not succeed if "success" key is not an expected value.
         input_state = json.dumps({'done': True})
@@ -345,6 +366,16 @@ class TestResetAttemptsInstructorTask(TestInstructorTasks):
         # check that entries were reset
         self._assert_num_attempts(students, 0)
 
+    @patch('instructor_task.tasks_helper.MODULE_STATE_UPDATE_CHUNK_SIZE', 3)
+    def test_reset_in_chunks(self):
+        input_state = json.dumps({'attempts': 3})
+        num_students = 10
+        students = self._create_students_with_state(num_students, input_state)
+        # a student with no attempts to reset
+        StudentModule.objects.filter(student=students[0]).update(state=json.dumps({'attempts': 0}))
+        self._test_run_with_task(reset_problem_attempts, 'reset', num_students - 1, expected_num_skipped=1)
+        self._assert_num_attempts(students, 0)
+
     def test_reset_with_zero_attempts(self):
         initial_attempts = 0
         input_state = json.dumps({'attempts': initial_attempts})
@@ -449,6 +480,15 @@ class TestDeleteStateInstructorTask(TestInstructorTasks):
                                           student=student,
                                           module_state_key=self.location)
 
+    @patch('instructor_task.tasks_helper.MODULE_STATE_UPDATE_CHUNK_SIZE', 3)
+    def test_delete_in_chunks(self):
+        num_students = 10
+        self._create_students_with_state(num_students)
+        self._test_run_with_task(delete_problem_state, 'deleted', num_students)
+        self.assertFalse(
+            StudentModule.objects.filter(course_id=self.course.id, module_state_key=self.location).exists()
+        )
+
 
 class TestCertificateGenerationnstructorTask(TestInstructorTasks):
     """Tests instructor task that generates student certificates."""
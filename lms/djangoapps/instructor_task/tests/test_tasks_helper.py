@@ -37,6 +37,7 @@ from instructor_task.tasks_helper import (
     upload_problem_grade_report,
     upload_students_csv,
     upload_may_enroll_csv,
+    upload_answer_distribution_report,
     upload_enrollment_report,
     upload_exec_summary_report,
     generate_students_certificates,
@@ -885,6 +886,40 @@ class TestStudentReport(TestReportMixin, InstructorTaskCourseTestCase):
         self.assertDictContainsSubset({'attempted': num_students, 'succeeded': num_students, 'failed': 0}, result)
 
 
+class TestAnswerDistributionReport(TestReportMixin, InstructorTaskModuleTestCase):
+    """
+    Test that the answer distribution CSV generation works.
+    """
+    def setUp(self):
+        super(TestAnswerDistributionReport, self).setUp()
+        self.initialize_course()
+        self.student_1 = self.create_student(u'student_1')
+        self.student_2 = self.create_student(u'student_2')
+
+    @patch('instructor_task.tasks_helper._get_current_task')
+    def test_no_submissions(self, _get_current_task):
+        result = upload_answer_distribution_report(None, None, self.course.id, None, 'generated')
+        self.assertDictContainsSubset({'attempted': 1, 'succeeded': 1, 'failed': 0}, result)
+        self.verify_rows_in_csv([])
+
+    @patch('instructor_task.tasks_helper._get_current_task')
+    def test_answer_counts(self, _get_current_task):
+        self.define_option_problem(u'Pröblem1')
+        self.submit_student_answer(self.student_1.username, u'Pröblem1', ['Option 1', 'Option 1'])
+        self.submit_student_answer(self.student_2.username, u'Pröblem1', ['Option 1', 'Option 2'])
+
+        result = upload_answer_distribution_report(None, None, self.course.id, None, 'generated')
+        self.assertDictContainsSubset({'attempted': 1, 'succeeded': 1, 'failed': 0}, result)
+        self.verify_rows_in_csv(
+            [
+                {'url_name': u'Pröblem1', 'answer': u'Option 1', 'count': u'2'},
+                {'url_name': u'Pröblem1', 'answer': u'Option 1', 'count': u'1'},
+                {'url_name': u'Pröblem1', 'answer': u'Option 2', 'count': u'1'},
+            ],
+            ignore_other_columns=True
+        )
+
+
 @ddt.ddt
 class TestListMayEnroll(TestReportMixin, InstructorTaskCourseTestCase):
     """
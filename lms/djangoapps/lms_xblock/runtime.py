@@ -8,6 +8,10 @@ import xblock.reference.plugins
 from django.core.urlresolvers import reverse
 from django.conf import settings
 from request_cache.middleware import RequestCache
+from courseware.partition_groups import UserPartitionGroupResolver
+from xblock_django.fragment_cache import (
+    get_cached_fragment, is_user_independent, REQUEST_TOKEN_PLACEHOLDER, USER_ID_PLACEHOLDER
+)
 from lms.djangoapps.lms_xblock.models import XBlockAsidesConfig
 from openedx.core.djangoapps.user_api.course_tag import api as user_course_tag_api
 from xmodule.modulestore.django import modulestore
@@ -69,7 +73,8 @@ def unquote_slashes(text):
 class LmsHandlerUrls(object):
     """
     A runtime mixin that provides a handler_url function that routes
-    to the LMS' xblock handler view.
+    to the LMS' xblock handler view, and an xblock_view_url function
+    that routes to its xblock view endpoint.
 
     This must be mixed in to a runtime that already accepts and stores
     a course_id
@@ -116,6 +121,17 @@ class LmsHandlerUrls(object):
 
         return url
 
+    def xblock_view_url(self, block, view_name):
+        """
+        Returns the url of the LMS' xblock view endpoint, which renders the `view_name`
+        view of `block` as json.
+        """
+        return reverse('xblock_view', kwargs={
+            'course_id': unicode(self.course_id),
+            'usage_id': quote_slashes(unicode(block.scope_ids.usage_id).encode('utf-8')),
+            'view_name': view_name,
+        })
+
     def local_resource_url(self, block, uri):
         """
         local_resource_url for Studio
@@ -142,6 +158,15 @@ class LmsPartitionService(PartitionService):
         course = modulestore().get_course(self._course_id)
         return course.user_partitions
 
+    def get_group(self, user_partition, assign=True):
+        """
+        Returns the group from the specified user partition to which the user is assigned,
+        resolved through the request-scoped `UserPartitionGroupResolver`.
+        """
+        return UserPartitionGroupResolver.for_user(self._user, self._course_id).get_group(
+            user_partition, assign=assign, track_function=self._track_function
+        )
+
 
 class UserTagsService(object):
     """
@@ -211,6 +236,28 @@ class LmsModuleSystem(LmsHandlerUrls, ModuleSystem):  # pylint: disable=abstract
         self.request_token = kwargs.pop('request_token', None)
         super(LmsModuleSystem, self).__init__(**kwargs)
 
+    def render(self, block, view_name, context=None):
+        """
+        Renders the view of the block, from the fragment cache if the view is the same
+        for every user and the system wraps it in the same way for every user.
+        """
+        if (
+                getattr(self, 'cache_fragments', False) and
+                is_user_independent(block, view_name) and
+                not self.applicable_aside_types(block)
+        ):
+            return get_cached_fragment(
+                self.course_id,
+                block,
+                view_name,
+                {
+                    USER_ID_PLACEHOLDER: self.anonymous_student_id,
+                    REQUEST_TOKEN_PLACEHOLDER: self.request_token,
+                },
+                lambda: super(LmsModuleSystem, self).render(block, view_name, context),
+            )
+        return super(LmsModuleSystem, self).render(block, view_name, context)
+
     def wrap_aside(self, block, aside, view, frag, context):
         """
         Creates a div which identifies the aside, points to the original block,
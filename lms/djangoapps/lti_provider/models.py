@@ -9,13 +9,20 @@ changes. To do that,
 2. ./manage.py lms schemamigration lti_provider --auto "description" --settings=devstack
 """
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 import logging
 
 from xmodule_django.models import CourseKeyField, UsageKeyField
 
 log = logging.getLogger("edx.lti_provider")
 
+# Cache of the ids of the content each user has graded LTI launches of
+GRADED_USAGES_CACHE_KEY = u'lti_provider.graded_usages.{user_id}'
+GRADED_USAGES_CACHE_TIMEOUT = 24 * 60 * 60
+
 
 class LtiConsumer(models.Model):
     """
@@ -119,6 +126,35 @@ class GradedAssignment(models.Model):
         """
         unique_together = ('outcome_service', 'lis_result_sourcedid')
 
+    @staticmethod
+    def graded_usage_ids(user_id):
+        """
+        Return the set of usage ids (as strings) of the content for which the
+        user has a GradedAssignment. Scores for any other content don't need
+        to be sent to an LTI consumer.
+
+        The set is cached, as it is checked every time a score changes, and
+        most users have no graded LTI launches at all.
+        """
+        cache_key = GRADED_USAGES_CACHE_KEY.format(user_id=user_id)
+        usage_ids = cache.get(cache_key)
+        if usage_ids is None:
+            usage_ids = frozenset(
+                unicode(usage_key)
+                for usage_key in GradedAssignment.objects.filter(user=user_id).values_list('usage_key', flat=True)
+            )
+            cache.set(cache_key, usage_ids, GRADED_USAGES_CACHE_TIMEOUT)
+        return usage_ids
+
+
+@receiver(post_save, sender=GradedAssignment)
+@receiver(post_delete, sender=GradedAssignment)
+def invalidate_graded_usage_ids(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Clear the cached graded usage ids of the user of a changed GradedAssignment.
+    """
+    cache.delete(GRADED_USAGES_CACHE_KEY.format(user_id=instance.user_id))
+
 
 class LtiUser(models.Model):
     """
@@ -95,11 +95,12 @@ def generate_replace_result_xml(result_sourcedid, score):
     return etree.tostring(xml, xml_declaration=True, encoding='UTF-8')
 
 
-def sign_and_send_replace_result(assignment, xml):
+def sign_and_send_replace_result(assignment, xml, session=None):
     """
     Take the XML document generated in generate_replace_result_xml, and sign it
     with the consumer key and secret assigned to the consumer. Send the signed
-    message to the LTI consumer.
+    message to the LTI consumer, using `session` (a requests.Session) if given
+    so that its pooled connections are reused.
     """
     outcome_service = assignment.outcome_service
     consumer = outcome_service.lti_consumer
@@ -115,7 +116,7 @@ def sign_and_send_replace_result(assignment, xml):
     oauth = requests_oauthlib.OAuth1(consumer_key, consumer_secret)
 
     headers = {'content-type': 'application/xml'}
-    response = requests.post(
+    response = (session or requests).post(
         assignment.outcome_service.lis_outcome_service_url,
         data=xml,
         auth=oauth,
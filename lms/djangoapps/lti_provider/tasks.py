@@ -2,8 +2,12 @@
 Asynchronous tasks for the LTI provider app.
 """
 
+from django.conf import settings
+from django.core.cache import cache
 from django.dispatch import receiver
 import logging
+from opaque_keys import InvalidKeyError
+import requests
 from requests.exceptions import RequestException
 
 from courseware.models import SCORE_CHANGED
@@ -14,6 +18,37 @@ from lti_provider.views import parse_course_and_usage_keys
 
 log = logging.getLogger("edx.lti_provider")
 
+# The latest score of a (user, usage) pair whose outcome hasn't been sent yet,
+# and a marker that a task to send it is scheduled.
+PENDING_OUTCOME_CACHE_KEY = u'lti_provider.pending_outcome.{user_id}.{usage_id}'
+PENDING_OUTCOME_CACHE_TIMEOUT = 24 * 60 * 60
+SCHEDULED_OUTCOME_CACHE_KEY = u'lti_provider.scheduled_outcome.{user_id}.{usage_id}'
+
+# The session used to send outcomes, so that connections to the consumers'
+# outcome services are pooled across tasks.
+_OUTCOME_SESSION = None
+
+
+def _outcome_session():
+    """
+    Return the session used to send outcomes from this process.
+    """
+    global _OUTCOME_SESSION  # pylint: disable=global-statement
+    if _OUTCOME_SESSION is None:
+        _OUTCOME_SESSION = requests.Session()
+    return _OUTCOME_SESSION
+
+
+def _is_graded(user_id, course_id, usage_id):
+    """
+    Return whether the user has a graded LTI launch of the content.
+    """
+    try:
+        __, usage_key = parse_course_and_usage_keys(course_id, usage_id)
+    except InvalidKeyError:
+        return False
+    return unicode(usage_key) in GradedAssignment.graded_usage_ids(user_id)
+
 
 @receiver(SCORE_CHANGED)
 def score_changed_handler(sender, **kwargs):  # pylint: disable=unused-argument
@@ -27,14 +62,9 @@ def score_changed_handler(sender, **kwargs):  # pylint: disable=unused-argument
     course_id = kwargs.get('course_id', None)
     usage_id = kwargs.get('usage_id', None)
 
-    if None not in (points_earned, points_possible, user_id, course_id, user_id):
-        send_outcome.delay(
-            points_possible,
-            points_earned,
-            user_id,
-            course_id,
-            usage_id
-        )
+    if None not in (points_earned, points_possible, user_id, course_id, usage_id):
+        if _is_graded(user_id, course_id, usage_id):
+            schedule_outcome(points_possible, points_earned, user_id, course_id, usage_id)
     else:
         log.error(
             "Outcome Service: Required signal parameter is None. "
@@ -44,16 +74,52 @@ def score_changed_handler(sender, **kwargs):  # pylint: disable=unused-argument
         )
 
 
+def schedule_outcome(points_possible, points_earned, user_id, course_id, usage_id):
+    """
+    Schedule sending the score to the LTI consumers of the user's graded
+    launches of the content.
+
+    Scores that change again within LTI_OUTCOME_DEBOUNCE_SECONDS are coalesced,
+    so that only the latest one is sent: the latest score is kept in the cache,
+    and a task is only scheduled if none is already scheduled for the user and
+    content. The task clears the scheduled marker before reading the latest
+    score, so that a score set after it has been read schedules a new task.
+    """
+    cache_key_args = {'user_id': user_id, 'usage_id': usage_id}
+    cache.set(
+        PENDING_OUTCOME_CACHE_KEY.format(**cache_key_args),
+        (points_possible, points_earned),
+        PENDING_OUTCOME_CACHE_TIMEOUT
+    )
+    debounce = settings.LTI_OUTCOME_DEBOUNCE_SECONDS
+    if cache.add(SCHEDULED_OUTCOME_CACHE_KEY.format(**cache_key_args), True, debounce):
+        send_outcome.apply_async(
+            (points_possible, points_earned, user_id, course_id, usage_id),
+            countdown=debounce
+        )
+
+
 @CELERY_APP.task
 def send_outcome(points_possible, points_earned, user_id, course_id, usage_id):
     """
     Calculate the score for a given user in a problem and send it to the
     appropriate LTI consumer's outcome service.
+
+    The latest score scheduled for the user and problem (see schedule_outcome)
+    is sent, falling back on the score the task was scheduled with.
     """
+    cache_key_args = {'user_id': user_id, 'usage_id': usage_id}
+    cache.delete(SCHEDULED_OUTCOME_CACHE_KEY.format(**cache_key_args))
+    pending_score = cache.get(PENDING_OUTCOME_CACHE_KEY.format(**cache_key_args))
+    if pending_score is not None:
+        points_possible, points_earned = pending_score
+
     course_key, usage_key = parse_course_and_usage_keys(course_id, usage_id)
+    # Send the results consumer by consumer, so that the connections to each
+    # of them are reused.
     assignments = GradedAssignment.objects.filter(
         user=user_id, course_key=course_key, usage_key=usage_key
-    )
+    ).select_related('outcome_service__lti_consumer').order_by('outcome_service__lti_consumer')
 
     # Calculate the user's score, on a scale of 0.0 - 1.0.
     score = float(points_earned) / float(points_possible)
@@ -73,7 +139,9 @@ def send_outcome(points_possible, points_earned, user_id, course_id, usage_id):
             assignment.lis_result_sourcedid, score
         )
         try:
-            response = lti_provider.outcomes.sign_and_send_replace_result(assignment, xml)
+            response = lti_provider.outcomes.sign_and_send_replace_result(
+                assignment, xml, session=_outcome_session()
+            )
         except RequestException:
             # failed to send result. 'response' is None, so more detail will be
             # logged at the end of the method.
@@ -2,6 +2,7 @@
 Tests for the LTI outcome service handlers, both in outcomes.py and in tasks.py
 """
 
+from django.core.cache import cache
 from django.test import TestCase
 from lxml import etree
 from mock import patch, MagicMock, ANY
@@ -249,7 +250,95 @@ class SendOutcomeTest(TestCase):
             unicode(self.usage_key)
         )
         self.generate_xml_mock.assert_called_once_with('sourcedid', 0.3)
-        self.replace_result_mock.assert_called_once_with(self.assignment, 'replace result XML')
+        self.replace_result_mock.assert_called_once_with(self.assignment, 'replace result XML', session=ANY)
+
+    def test_send_latest_pending_score(self):
+        cache.set(
+            tasks.PENDING_OUTCOME_CACHE_KEY.format(user_id=self.user.id, usage_id=unicode(self.usage_key)), (10, 7)
+        )
+        self.addCleanup(cache.clear)
+        tasks.send_outcome(
+            self.points_possible,
+            self.points_earned,
+            self.user.id,
+            unicode(self.course_key),
+            unicode(self.usage_key)
+        )
+        self.generate_xml_mock.assert_called_once_with('sourcedid', 0.7)
+
+
+class ScoreChangedHandlerTest(TestCase):
+    """
+    Tests for the score_changed_handler and schedule_outcome methods in tasks.py
+    """
+
+    def setUp(self):
+        super(ScoreChangedHandlerTest, self).setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.course_key = CourseLocator(org='some_org', course='some_course', run='some_run')
+        self.usage_key = BlockUsageLocator(course_key=self.course_key, block_type='problem', block_id='block_id')
+        self.user = UserFactory.create()
+        self.send_outcome_patch = patch('lti_provider.tasks.send_outcome')
+        self.send_outcome_mock = self.send_outcome_patch.start()
+        self.addCleanup(self.send_outcome_patch.stop)
+
+    def change_score(self, points_earned):
+        """
+        Send a score_changed signal for the user and problem.
+        """
+        tasks.score_changed_handler(
+            None,
+            points_possible=10,
+            points_earned=points_earned,
+            user_id=self.user.id,
+            course_id=unicode(self.course_key),
+            usage_id=unicode(self.usage_key),
+        )
+
+    def create_assignment(self):
+        """
+        Create a graded LTI launch of the problem by the user.
+        """
+        consumer = LtiConsumer.objects.create(
+            consumer_name='consumer', consumer_key='consumer_key', consumer_secret='secret'
+        )
+        outcome = OutcomeService.objects.create(
+            lis_outcome_service_url='http://example.com/service_url', lti_consumer=consumer
+        )
+        GradedAssignment.objects.create(
+            user=self.user,
+            course_key=self.course_key,
+            usage_key=self.usage_key,
+            outcome_service=outcome,
+            lis_result_sourcedid='sourcedid',
+        )
+
+    def test_ungraded_content(self):
+        self.change_score(3)
+        # the graded content of the user is cached
+        with self.assertNumQueries(0):
+            self.change_score(4)
+        self.assertFalse(self.send_outcome_mock.apply_async.called)
+
+    def test_new_assignment_clears_cache(self):
+        self.change_score(3)
+        self.create_assignment()
+        self.change_score(4)
+        self.assertTrue(self.send_outcome_mock.apply_async.called)
+
+    def test_scores_are_coalesced(self):
+        self.create_assignment()
+        self.change_score(3)
+        self.change_score(4)
+        self.change_score(5)
+        self.send_outcome_mock.apply_async.assert_called_once_with(
+            (10, 3, self.user.id, unicode(self.course_key), unicode(self.usage_key)), countdown=ANY
+        )
+        self.assertEqual(
+            (10, 5),
+            cache.get(tasks.PENDING_OUTCOME_CACHE_KEY.format(user_id=self.user.id, usage_id=unicode(self.usage_key)))
+        )
 
 
 class XmlHandlingTest(TestCase):
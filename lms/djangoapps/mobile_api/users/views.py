@@ -103,8 +103,7 @@ class UserCourseStatus(views.APIView):
         the course module. If there is no such visit, the first item deep enough down the course
         tree is used.
         """
-        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
-            course.id, request.user, course, depth=2)
+        field_data_cache = FieldDataCache([course], course.id, request.user, lazy=True)
 
         course_module = get_module_for_descriptor(
             request.user, request, course, field_data_cache, course.id, course=course
@@ -136,8 +135,7 @@ class UserCourseStatus(views.APIView):
         """
         Saves the module id if the found modification_date is less recent than the passed modification date
         """
-        field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
-            course.id, request.user, course, depth=2)
+        field_data_cache = FieldDataCache([course], course.id, request.user, lazy=True)
         try:
             module_descriptor = modulestore().get_item(module_key)
         except ItemNotFoundError:
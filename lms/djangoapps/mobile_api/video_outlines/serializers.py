@@ -5,7 +5,7 @@ from rest_framework.reverse import reverse
 
 from xmodule.modulestore.mongo.base import BLOCK_TYPES_WITH_CHILDREN
 from xmodule.modulestore.django import modulestore
-from courseware.access import has_access
+from courseware.access import get_course_access_evaluator
 from courseware.courses import get_course_by_id
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module_for_descriptor
@@ -44,14 +44,17 @@ class BlockOutline(object):
                 usage_key.block_type in BLOCK_TYPES_WITH_CHILDREN
             )
 
+        # A single lazy cache is shared by all the modules created while
+        # traversing the course, so that their student state is loaded in
+        # batches instead of with separate queries for every block.
+        field_data_cache = FieldDataCache([], self.course_id, self.request.user, lazy=True)
+        course = get_course_by_id(self.course_id)
+        access_evaluator = get_course_access_evaluator(self.request.user, self.course_id)
+
         def create_module(descriptor):
             """
             Factory method for creating and binding a module for the given descriptor.
             """
-            field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
-                self.course_id, self.request.user, descriptor, depth=0,
-            )
-            course = get_course_by_id(self.course_id)
             return get_module_for_descriptor(
                 self.request.user, self.request, descriptor, field_data_cache, self.course_id, course=course
             )
@@ -72,7 +75,7 @@ class BlockOutline(object):
                     continue
 
                 if curr_block.location.block_type in self.block_types:
-                    if not has_access(self.request.user, 'load', curr_block, course_key=self.course_id):
+                    if not access_evaluator.can_load(curr_block):
                         continue
 
                     summary_fn = self.block_types[curr_block.category]
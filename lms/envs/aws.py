@@ -432,6 +432,7 @@ XQUEUE_INTERFACE = AUTH_TOKENS['XQUEUE_INTERFACE']
 MODULESTORE = convert_module_store_setting_if_needed(AUTH_TOKENS.get('MODULESTORE', MODULESTORE))
 CONTENTSTORE = AUTH_TOKENS.get('CONTENTSTORE', CONTENTSTORE)
 DOC_STORE_CONFIG = AUTH_TOKENS.get('DOC_STORE_CONFIG', DOC_STORE_CONFIG)
+SPLIT_DESCRIPTOR_POOL_MAX_SIZE = ENV_TOKENS.get('SPLIT_DESCRIPTOR_POOL_MAX_SIZE', SPLIT_DESCRIPTOR_POOL_MAX_SIZE)
 MONGODB_LOG = AUTH_TOKENS.get('MONGODB_LOG', {})
 
 OPEN_ENDED_GRADING_INTERFACE = AUTH_TOKENS.get('OPEN_ENDED_GRADING_INTERFACE',
@@ -483,6 +484,11 @@ BROKER_URL = "{0}://{1}:{2}@{3}/{4}".format(CELERY_BROKER_TRANSPORT,
 # upload limits
 STUDENT_FILEUPLOAD_MAX_SIZE = ENV_TOKENS.get("STUDENT_FILEUPLOAD_MAX_SIZE", STUDENT_FILEUPLOAD_MAX_SIZE)
 
+REQUEST_PROFILE_SAMPLE_RATE = ENV_TOKENS.get('REQUEST_PROFILE_SAMPLE_RATE', REQUEST_PROFILE_SAMPLE_RATE)
+CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT', CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT
+)
+
 # Event tracking
 TRACKING_BACKENDS.update(AUTH_TOKENS.get("TRACKING_BACKENDS", {}))
 EVENT_TRACKING_BACKENDS['tracking_logs']['OPTIONS']['backends'].update(AUTH_TOKENS.get("EVENT_TRACKING_BACKENDS", {}))
@@ -507,8 +513,25 @@ GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
 GRADES_DOWNLOAD = ENV_TOKENS.get("GRADES_DOWNLOAD", GRADES_DOWNLOAD)
 
+ANSWER_DISTRIBUTION_CHUNK_SIZE = ENV_TOKENS.get("ANSWER_DISTRIBUTION_CHUNK_SIZE", ANSWER_DISTRIBUTION_CHUNK_SIZE)
+
+# Score changes
+SCORE_EVENTS_DELAY_SECONDS = ENV_TOKENS.get("SCORE_EVENTS_DELAY_SECONDS", SCORE_EVENTS_DELAY_SECONDS)
+SCORE_EVENTS_BATCH_SIZE = ENV_TOKENS.get("SCORE_EVENTS_BATCH_SIZE", SCORE_EVENTS_BATCH_SIZE)
+SCORE_EVENTS_SWEEP_PERIOD_SECONDS = ENV_TOKENS.get(
+    "SCORE_EVENTS_SWEEP_PERIOD_SECONDS", SCORE_EVENTS_SWEEP_PERIOD_SECONDS
+)
+CELERYBEAT_SCHEDULE['sweep-score-events'] = {
+    'task': 'courseware.sweep_score_events',
+    'schedule': datetime.timedelta(seconds=SCORE_EVENTS_SWEEP_PERIOD_SECONDS),
+}
+
 # financial reports
 FINANCIAL_REPORTS = ENV_TOKENS.get("FINANCIAL_REPORTS", FINANCIAL_REPORTS)
+REPORT_STORE_SPOOL_MAX_SIZE = ENV_TOKENS.get("REPORT_STORE_SPOOL_MAX_SIZE", REPORT_STORE_SPOOL_MAX_SIZE)
+
+# LTI Provider
+LTI_OUTCOME_DEBOUNCE_SECONDS = ENV_TOKENS.get("LTI_OUTCOME_DEBOUNCE_SECONDS", LTI_OUTCOME_DEBOUNCE_SECONDS)
 
 ##### ORA2 ######
 # Prefix for uploads of example-based assessment AI classifiers
@@ -152,6 +152,14 @@ FEATURES = {
     # See jquey-xblock: https://github.com/edx-solutions/jquery-xblock
     'ENABLE_XBLOCK_VIEW_ENDPOINT': False,
 
+    # Render only the active unit of a sequence with the courseware page, and load the other units
+    # when they are first shown. This uses the XBlock view endpoint, which must be enabled too.
+    'ENABLE_LAZY_SEQUENCES': False,
+
+    # Cache the rendered views of XBlocks that are the same for every user (such as HTML components)
+    # until their course is published again. The cache is shared with Studio, which invalidates it.
+    'ENABLE_XBLOCK_FRAGMENT_CACHE': False,
+
     # Allows to configure the LMS to provide CORS headers to serve requests from other domains
     'ENABLE_CORS_HEADERS': False,
 
@@ -596,6 +604,17 @@ ASSET_KEY_PATTERN = r'(?P<asset_key_string>(?:/?c4x(:/)?/[^/]+/[^/]+/[^/]+/[^@]+
 USAGE_ID_PATTERN = r'(?P<usage_id>(?:i4x://?[^/]+/[^/]+/[^/]+/[^@]+(?:@[^/]+)?)|(?:[^/]+))'
 
 
+############################## REQUEST PROFILING ##############################
+
+# Fraction of the requests whose performance profile is collected and emitted
+# (see performance.middleware.RequestProfileMiddleware).
+REQUEST_PROFILE_SAMPLE_RATE = 0.0
+
+# Number of seconds a process uses its snapshot of a configuration model
+# without checking in the cache that the configuration hasn't changed
+# (see config_models.models.ConfigurationModel.current).
+CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT = 5
+
 ############################## EVENT TRACKING #################################
 
 # FIXME: Should we be doing this truncation?
@@ -758,6 +777,10 @@ MODULESTORE = {
     }
 }
 
+# Number of published split blocks whose request-independent data is kept in
+# memory by each process.
+SPLIT_DESCRIPTOR_POOL_MAX_SIZE = 50000
+
 #################### Python sandbox ############################################
 
 CODE_JAIL = {
@@ -1123,6 +1146,7 @@ TEMPLATE_LOADERS = (
 
 MIDDLEWARE_CLASSES = (
     'request_cache.middleware.RequestCache',
+    'performance.middleware.RequestProfileMiddleware',
     'microsite_configuration.middleware.MicrositeMiddleware',
     'django_comment_client.middleware.AjaxExceptionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -1846,6 +1870,7 @@ INSTALLED_APPS = (
 
     # Monitoring
     'datadog',
+    'performance',
 
     # User API
     'rest_framework',
@@ -2127,6 +2152,27 @@ FINANCIAL_REPORTS = {
     'ROOT_PATH': '/tmp/edx-s3/financial_reports',
 }
 
+# Size in bytes up to which a compressed report is kept in memory while it is
+# being written, before being spooled to disk.
+REPORT_STORE_SPOOL_MAX_SIZE = 5 * 1024 * 1024
+
+# Number of StudentModule rows parsed at a time for the answer distribution
+# report.
+ANSWER_DISTRIBUTION_CHUNK_SIZE = 1000
+
+# Maximum number of GRADES_UPDATED events handed to a single task when
+# grading many students at once.
+GRADES_UPDATED_BATCH_SIZE = 100
+
+# Number of seconds before the score changes recorded by the courseware are
+# processed in the background (see courseware.tasks.process_score_events), and
+# maximum number of score changes of a user in a course processed at once.
+SCORE_EVENTS_DELAY_SECONDS = 5
+SCORE_EVENTS_BATCH_SIZE = 100
+# Number of seconds between the runs of the task scheduling the score changes
+# left behind by lost tasks (see courseware.tasks.sweep_score_events)
+SCORE_EVENTS_SWEEP_PERIOD_SECONDS = 5 * 60
+
 
 #### PASSWORD POLICY SETTINGS #####
 PASSWORD_MIN_LENGTH = 8
@@ -2558,6 +2604,11 @@ CREDIT_HELP_LINK_URL = "#"
 # route any messages intended for LTI users to a common domain.
 LTI_USER_EMAIL_DOMAIN = 'lti.example.com'
 
+# Number of seconds during which score changes of a user in content launched
+# via the LTI Provider feature are coalesced, so that only the latest score is
+# sent to the LTI consumer.
+LTI_OUTCOME_DEBOUNCE_SECONDS = 30
+
 # Number of seconds before JWT tokens expire
 JWT_EXPIRATION = 30
 JWT_ISSUER = None
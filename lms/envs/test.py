@@ -215,6 +215,10 @@ CACHES = {
     },
 }
 
+# Check every configuration snapshot against the cache, so that clearing the
+# cache between tests resets the configuration models.
+CONFIGURATION_MODEL_PROCESS_CACHE_TIMEOUT = 0
+
 # Dummy secret key for dev
 SECRET_KEY = '85920908f28904ed733fe576320db18cabd7b6cd'
 
@@ -9,7 +9,7 @@ from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from search.result_processor import SearchResultProcessor
 from xmodule.modulestore.django import modulestore
 
-from courseware.access import has_access
+from courseware.access import get_course_access_evaluator
 
 
 class LmsSearchResultProcessor(SearchResultProcessor):
@@ -60,10 +60,6 @@ class LmsSearchResultProcessor(SearchResultProcessor):
 
     def should_remove(self, user):
         """ Test to see if this result should be removed due to access restriction """
-        user_has_access = has_access(
-            user,
-            "load",
-            self.get_item(self.get_usage_key()),
-            self.get_course_key()
-        )
-        return not user_has_access
+        # The evaluator is shared by all the results of the course in the request
+        access_evaluator = get_course_access_evaluator(user, self.get_course_key())
+        return not access_evaluator.can_load(self.get_item(self.get_usage_key()))
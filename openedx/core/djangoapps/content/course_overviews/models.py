@@ -150,6 +150,35 @@ class CourseOverview(django.db.models.Model):
                     raise CourseOverview.DoesNotExist()
         return course_overview
 
+    @staticmethod
+    def get_from_ids(course_ids):
+        """
+        Load CourseOverview objects for a list of course IDs.
+
+        All the overviews that already exist are loaded with a single
+        database query; the missing ones are created from the module store
+        as in `get_from_id`.
+
+        Arguments:
+            course_ids (list[CourseKey]): the IDs of the course overviews to
+                be loaded.
+
+        Returns:
+            dict: maps each of `course_ids` to its CourseOverview, or to None
+            if the course could not be loaded.
+        """
+        course_overviews = {
+            course_overview.id: course_overview
+            for course_overview in CourseOverview.objects.filter(id__in=course_ids)
+        }
+        for course_id in course_ids:
+            if course_id not in course_overviews:
+                try:
+                    course_overviews[course_id] = CourseOverview.get_from_id(course_id)
+                except (CourseOverview.DoesNotExist, IOError):
+                    course_overviews[course_id] = None
+        return course_overviews
+
     def clean_id(self, padding_char='='):
         """
         Returns a unique deterministic base32-encoded ID for the course.
@@ -294,3 +294,29 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
             # which causes get_from_id to raise an IOError.
             with self.assertRaises(IOError):
                 CourseOverview.get_from_id(course.id)
+
+    @ddt.data(ModuleStoreEnum.Type.split, ModuleStoreEnum.Type.mongo)
+    def test_get_from_ids(self, modulestore_type):
+        """
+        Tests that get_from_ids loads the existing overviews in a single query,
+        creates the missing ones, and maps non-existent courses to None.
+
+        Arguments:
+            modulestore_type (ModuleStoreEnum.Type): type of store to create the
+                courses in.
+        """
+        courses = [CourseFactory.create(default_store=modulestore_type) for __ in range(3)]
+        course_ids = [course.id for course in courses]
+        CourseOverview.get_from_id(course_ids[0])
+        store = modulestore()._get_modulestore_by_type(modulestore_type)  # pylint: disable=protected-access
+        non_existent_id = store.make_course_key('Non', 'Existent', 'Course')
+
+        course_overviews = CourseOverview.get_from_ids(course_ids + [non_existent_id])
+        self.assertEqual([course_overviews[course_id].id for course_id in course_ids], course_ids)
+        self.assertIsNone(course_overviews[non_existent_id])
+
+        # All the overviews now exist, so they are loaded with a single query.
+        with self.assertNumQueries(1):
+            with check_mongo_calls(0):
+                course_overviews = CourseOverview.get_from_ids(course_ids)
+        self.assertEqual(set(course_overviews), set(course_ids))
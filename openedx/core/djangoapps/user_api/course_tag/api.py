@@ -7,6 +7,8 @@ Stores global metadata using the UserPreference model, and per-course metadata u
 UserCourseTag model.
 """
 
+from request_cache.middleware import RequestCache
+
 from ..models import UserCourseTag
 
 # Scopes
@@ -28,6 +30,10 @@ def get_course_tag(user, course_id, key):
     Returns:
         string value, or None if there is no value saved
     """
+    course_tags = RequestCache.get_request_cache().data.get(_course_tags_cache_key(user, course_id))
+    if course_tags is not None:
+        return course_tags.get(key)
+
     try:
         record = UserCourseTag.objects.get(
             user=user,
@@ -65,3 +71,36 @@ def set_course_tag(user, course_id, key, value):
 
     record.value = value
     record.save()
+
+    course_tags = RequestCache.get_request_cache().data.get(_course_tags_cache_key(user, course_id))
+    if course_tags is not None:
+        course_tags[key] = unicode(value)
+
+
+def get_course_tags(user, course_id):
+    """
+    Gets all of the user's course tags in the specified course_id with a single
+    query. The tags are kept for the rest of the request, so that subsequent
+    `get_course_tag` calls for the same user and course don't query the database.
+
+    Args:
+        user: the User object for the course tags
+        course_id: course identifier (string)
+
+    Returns:
+        dict mapping each key to its string value
+    """
+    request_cache = RequestCache.get_request_cache()
+    cache_key = _course_tags_cache_key(user, course_id)
+    if cache_key not in request_cache.data:
+        request_cache.data[cache_key] = dict(
+            UserCourseTag.objects.filter(user=user, course_id=course_id).values_list('key', 'value')
+        )
+    return request_cache.data[cache_key]
+
+
+def _course_tags_cache_key(user, course_id):
+    """
+    Returns the request cache key for the course tags of `user` in `course_id`.
+    """
+    return u"course_tag.api.get_course_tags.{}.{}".format(user.id, course_id)
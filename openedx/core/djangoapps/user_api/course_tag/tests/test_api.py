@@ -3,6 +3,7 @@ Test the user course tag API.
 """
 from django.test import TestCase
 
+from request_cache.middleware import RequestCache
 from student.tests.factories import UserFactory
 from openedx.core.djangoapps.user_api.course_tag import api as course_tag_api
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
@@ -17,6 +18,7 @@ class TestCourseTagAPI(TestCase):
         self.user = UserFactory.create()
         self.course_id = SlashSeparatedCourseKey('test_org', 'test_course_number', 'test_run')
         self.test_key = 'test_key'
+        self.addCleanup(RequestCache.clear_request_cache)
 
     def test_get_set_course_tag(self):
         # get a tag that doesn't exist
@@ -34,3 +36,20 @@ class TestCourseTagAPI(TestCase):
         course_tag_api.set_course_tag(self.user, self.course_id, self.test_key, test_value)
         tag = course_tag_api.get_course_tag(self.user, self.course_id, self.test_key)
         self.assertEqual(tag, test_value)
+
+    def test_get_course_tags(self):
+        course_tag_api.set_course_tag(self.user, self.course_id, self.test_key, 'value')
+        course_tag_api.set_course_tag(self.user, self.course_id, 'other_key', 1)
+
+        with self.assertNumQueries(1):
+            tags = course_tag_api.get_course_tags(self.user, self.course_id)
+        self.assertEqual(tags, {self.test_key: 'value', 'other_key': '1'})
+
+        # the tags are kept for the rest of the request
+        with self.assertNumQueries(0):
+            self.assertEqual(course_tag_api.get_course_tag(self.user, self.course_id, self.test_key), 'value')
+            self.assertIsNone(course_tag_api.get_course_tag(self.user, self.course_id, 'missing_key'))
+
+        course_tag_api.set_course_tag(self.user, self.course_id, self.test_key, 'value2')
+        with self.assertNumQueries(0):
+            self.assertEqual(course_tag_api.get_course_tag(self.user, self.course_id, self.test_key), 'value2')
@@ -9,7 +9,7 @@ from opaque_keys.edx.keys import CourseKey
 
 from track.contexts import COURSE_REGEX
 
-from .models import UserCourseTag
+from .user_context import get_user_context
 
 
 class UserTagsEventContextMiddleware(object):
@@ -36,12 +36,7 @@ class UserTagsEventContextMiddleware(object):
             context['course_id'] = course_id
 
             if request.user.is_authenticated():
-                context['course_user_tags'] = dict(
-                    UserCourseTag.objects.filter(
-                        user=request.user.pk,
-                        course_id=course_key,
-                    ).values_list('key', 'value')
-                )
+                context['course_user_tags'] = get_user_context(request.user).course_tags(course_key)
             else:
                 context['course_user_tags'] = {}
 
@@ -15,6 +15,7 @@ from xmodule_django.models import CourseKeyField
 # certain models.  For now we will leave the models in "student" and
 # create an alias in "user_api".
 from student.models import UserProfile, Registration, PendingEmailChange  # pylint: disable=unused-import
+from student.models import UserStanding
 
 
 class UserPreference(models.Model):
@@ -111,3 +112,32 @@ class UserOrgTag(TimeStampedModel):
     class Meta(object):
         """ Meta class for defining unique constraints. """
         unique_together = ("user", "org", "key")
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_save, sender=UserStanding)
+@receiver(post_save, sender=UserPreference)
+@receiver(post_save, sender=UserCourseTag)
+@receiver(post_delete, sender=UserProfile)
+@receiver(post_delete, sender=UserStanding)
+@receiver(post_delete, sender=UserPreference)
+@receiver(post_delete, sender=UserCourseTag)
+def clear_user_context_callback(sender, instance, **kwargs):
+    """
+    Clear the pieces of the cached user context (see user_api.user_context) held
+    by a changed model. New users are included, in case a deleted user's id is reused.
+    """
+    from .user_context import clear_user_context, course_tags_piece
+    if sender is User:
+        if kwargs.get('created'):
+            clear_user_context(instance.id)
+    elif sender is UserStanding:
+        # the account standing is not cached, only kept for the rest of the request
+        clear_user_context(instance.user_id, [])
+    elif sender is UserProfile:
+        clear_user_context(instance.user_id, ['country'])
+    elif sender is UserPreference:
+        clear_user_context(instance.user_id, ['language', 'dark_language'])
+    else:
+        clear_user_context(instance.user_id, [course_tags_piece(instance.course_id)])
@@ -0,0 +1,87 @@
+"""
+Tests for the per-request user context.
+"""
+from django.core.cache import cache
+from django.test import TestCase
+from mock import patch
+
+from dark_lang import DARK_LANGUAGE_KEY
+from lang_pref import LANGUAGE_KEY
+from request_cache.middleware import RequestCache
+from student.models import UserStanding
+from student.tests.factories import UserFactory
+
+from ..tests.factories import UserPreferenceFactory, UserCourseTagFactory
+from ..preferences.api import set_user_preference
+from ..user_context import get_user_context
+
+
+class UserContextTest(TestCase):
+    """
+    Test the loading, caching and invalidation of the user context.
+    """
+    def setUp(self):
+        super(UserContextTest, self).setUp()
+        cache.clear()
+        self.addCleanup(RequestCache.clear_request_cache)
+        self.user = UserFactory.create()
+        self.user.profile.country = 'fr'
+        self.user.profile.save()
+        UserPreferenceFactory.create(user=self.user, key=LANGUAGE_KEY, value='fr')
+        self.tag = UserCourseTagFactory.create(user=self.user, key='group', value='a')
+        self.course_key = self.tag.course_id
+
+    def assert_context(self, account_status, language, dark_language, country, course_tags):
+        """
+        Assert the values of the context of the user.
+        """
+        context = get_user_context(self.user)
+        self.assertEqual(context.account_status, account_status)
+        self.assertEqual(context.language, language)
+        self.assertEqual(context.dark_language, dark_language)
+        self.assertEqual(context.country, country)
+        self.assertEqual(context.course_tags(self.course_key), course_tags)
+
+    def test_caching(self):
+        # Each piece of the context is loaded once
+        with self.assertNumQueries(4):
+            self.assert_context(None, 'fr', None, 'FR', {'group': 'a'})
+        with self.assertNumQueries(0):
+            self.assert_context(None, 'fr', None, 'FR', {'group': 'a'})
+
+        # And cached for the next requests, apart from the account standing
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(1):
+            self.assert_context(None, 'fr', None, 'FR', {'group': 'a'})
+
+    def test_cached_pieces_read_together(self):
+        context = get_user_context(self.user)
+        self.assertEqual(context.dark_language, None)
+        self.assertEqual(context.country, 'FR')
+        RequestCache.clear_request_cache()
+
+        # The common pieces are read in one round trip, missing ones are loaded
+        context = get_user_context(self.user)
+        with patch.object(cache, 'get_many', wraps=cache.get_many) as get_many:
+            with self.assertNumQueries(1):
+                self.assertEqual(context.language, 'fr')
+                self.assertEqual(context.dark_language, None)
+                self.assertEqual(context.country, 'FR')
+        self.assertEqual(get_many.call_count, 1)
+
+    def test_invalidation(self):
+        self.assert_context(None, 'fr', None, 'FR', {'group': 'a'})
+
+        set_user_preference(self.user, LANGUAGE_KEY, 'es')
+        set_user_preference(self.user, DARK_LANGUAGE_KEY, 'eo')
+        self.assert_context(None, 'es', 'eo', 'FR', {'group': 'a'})
+
+        UserStanding.objects.create(
+            user=self.user, account_status=UserStanding.ACCOUNT_DISABLED, changed_by=self.user
+        )
+        self.user.profile.country = 'de'
+        self.user.profile.save()
+        self.assert_context(UserStanding.ACCOUNT_DISABLED, 'es', 'eo', 'DE', {'group': 'a'})
+
+        self.tag.delete()
+        self.assert_context(UserStanding.ACCOUNT_DISABLED, 'es', 'eo', 'DE', {})
@@ -0,0 +1,149 @@
+"""
+The data about a user that is read on every request, by the middleware.
+
+Each piece of the context (language preferences, profile country and course
+tags) is loaded the first time it is used, and then cached under its own key,
+with `cache.add` so that a value loaded from the database never overwrites a
+newer one. The pieces a request is likely to use are read together, so a
+typical request only makes one cache round trip for all of its middleware.
+A piece is cleared whenever the data it holds changes (see the receivers in
+`user_api.models`). As the receivers run before the change is committed, a
+request which is running at the same time may still cache the old value, so
+the pieces are only kept for a short time.
+
+The account standing is checked on every request, so it is only kept for the
+rest of the request rather than cached.
+"""
+from django.core.cache import cache
+
+from dark_lang import DARK_LANGUAGE_KEY
+from lang_pref import LANGUAGE_KEY
+from request_cache.middleware import RequestCache
+from student.models import UserStanding
+
+from .models import UserCourseTag, UserPreference
+
+# The version is part of the cache key, so that it can be increased when the
+# content of the cached pieces changes.
+USER_CONTEXT_VERSION = 2
+USER_CONTEXT_CACHE_KEY = u'user_api.user_context.v{version}.{user_id}'
+USER_CONTEXT_CACHE_TIMEOUT = 5 * 60
+
+# The pieces of the context which are read together from the cache
+COMMON_PIECES = ('language', 'dark_language', 'country')
+
+_NOT_LOADED = object()
+
+
+def _cache_key(user_id, name=None):
+    """
+    Returns the request cache key of the context of a user, or the cache key of
+    its `name` piece.
+    """
+    key = USER_CONTEXT_CACHE_KEY.format(version=USER_CONTEXT_VERSION, user_id=user_id)
+    return key if name is None else u'{}.{}'.format(key, name)
+
+
+def course_tags_piece(course_key):
+    """
+    Returns the name of the piece of the context holding the course tags of
+    a course.
+    """
+    return u'course_tags.{}'.format(course_key)
+
+
+class UserContext(object):
+    """
+    The context of an authenticated user. Use `get_user_context` to get it.
+    """
+    def __init__(self, user):
+        self.user = user
+        self._data = {}
+        self._read = set()
+        self._account_status = _NOT_LOADED
+
+    def _get(self, name, load):
+        """
+        Returns the `name` piece of the context, which is read from the cache,
+        or loaded with `load` and cached if needed.
+        """
+        if name not in self._read:
+            names = set([name]) if self._read else set(COMMON_PIECES) | set([name])
+            keys = {_cache_key(self.user.id, piece): piece for piece in names}
+            for key, value in cache.get_many(keys.keys()).iteritems():
+                self._data[keys[key]] = value[0]
+            self._read.update(names)
+        if name not in self._data:
+            self._data[name] = load()
+            # The value is wrapped, so that None can be told apart from a miss
+            cache.add(_cache_key(self.user.id, name), (self._data[name],), USER_CONTEXT_CACHE_TIMEOUT)
+        return self._data[name]
+
+    @property
+    def account_status(self):
+        """
+        The account status of the user's UserStanding, or None if there isn't one.
+        """
+        if self._account_status is _NOT_LOADED:
+            statuses = UserStanding.objects.filter(user=self.user.id).values_list('account_status', flat=True)
+            self._account_status = statuses[0] if statuses else None
+        return self._account_status
+
+    @property
+    def language(self):
+        """
+        The user's language preference, or None.
+        """
+        return self._get('language', lambda: UserPreference.get_value(self.user, LANGUAGE_KEY))
+
+    @property
+    def dark_language(self):
+        """
+        The user's dark-launched language preference, or None.
+        """
+        return self._get('dark_language', lambda: UserPreference.get_value(self.user, DARK_LANGUAGE_KEY))
+
+    @property
+    def country(self):
+        """
+        The country code of the user's profile in upper case, or "".
+        """
+        def load():
+            """ Load the profile country. """
+            profile = getattr(self.user, 'profile', None)
+            if profile is not None and profile.country.code is not None:
+                return profile.country.code.upper()
+            return ""
+        return self._get('country', load)
+
+    def course_tags(self, course_key):
+        """
+        Returns the user's course tags in the given course, as a dict.
+        """
+        return self._get(
+            course_tags_piece(course_key),
+            lambda: dict(
+                UserCourseTag.objects.filter(user=self.user.id, course_id=course_key).values_list('key', 'value')
+            )
+        )
+
+
+def get_user_context(user):
+    """
+    Returns the UserContext of an authenticated `user`, which is kept for the
+    rest of the request.
+    """
+    request_cache = RequestCache.get_request_cache().data
+    key = _cache_key(user.id)
+    if key not in request_cache:
+        request_cache[key] = UserContext(user)
+    return request_cache[key]
+
+
+def clear_user_context(user_id, names=COMMON_PIECES):
+    """
+    Clears the `names` pieces of the cached context of a user, when they
+    change, and the context kept for the rest of the request.
+    """
+    cache.delete_many([_cache_key(user_id, name) for name in names])
+    RequestCache.get_request_cache().data.pop(_cache_key(user_id), None)